@@ -9,13 +9,45 @@ parser.add_argument(
     'command',
     nargs='?',
     default='version',
-    choices=['version', 'check', 'import', 'plan', 'plan_export'],
+    choices=['version', 'check', 'import', 'plan', 'plan_export', 'plan_fleet', 'snapshot'],
     help='Action to execute (default: check)'
 )
 parser.add_argument('--env', default='.env', help='Location of environment file (default: .env)')
 parser.add_argument(
     '--config', default='mygrate.conf', help='Location of mygrate configuration file (default: mygrate.conf)'
 )
+parser.add_argument(
+    '--jobs',
+    type=int,
+    default=1,
+    help='Number of processes to use when parsing *.sql files and comparing tables (default: 1)'
+)
+parser.add_argument(
+    '--fk-checks',
+    dest='fk_checks',
+    action='store_true',
+    help='Order the plan so it can run with foreign key checks enabled'
+)
+parser.add_argument(
+    '--snapshot',
+    help='Snapshot file to write (snapshot) or to use instead of the live database (plan, plan_export)'
+)
+parser.add_argument('--targets', help='File with the DSNs of the databases to plan for, one per line (plan_fleet)')
+parser.add_argument(
+    '--format',
+    default='sql',
+    choices=['sql', 'json', 'ndjson'],
+    help='Format to write the plan in: SQL commands, or one JSON record per operation (default: sql)'
+)
+parser.add_argument(
+    '--cost', action='store_true', help='List the estimated cost of each operation in the plan (plan, plan_fleet)'
+)
+parser.add_argument(
+    '--max-cost',
+    dest='max_cost',
+    type=float,
+    help='Refuse to write a plan that is estimated to take more than this many seconds (plan, plan_fleet)'
+)
 parser.add_argument('-f', dest='force', action='store_true', help='Ignore errors/warnings and execute command anyway')
 parser.add_argument('-v', dest='version', action='store_true', help='Display version')
 args = parser.parse_args()
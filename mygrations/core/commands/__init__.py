@@ -5,6 +5,8 @@ commands = {
     'check': 'check',
     'plan': 'plan',
     'plan_export': 'plan_export',
+    'plan_fleet': 'plan_fleet',
+    'snapshot': 'snapshot',
     'version': 'version'
     #'export':       'export_files'
 }
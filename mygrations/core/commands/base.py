@@ -1,9 +1,33 @@
 from mygrations.helpers.dotenv import dotenv
 from mygrations.helpers.db_credentials import db_credentials
+from mygrations.formats.mysql.mygrations.row_batcher import row_batcher
+from mygrations.formats.mysql.mygrations.online_ddl import online_ddl
+from mygrations.formats.mysql.mygrations.alter_coalescer import alter_coalescer
+from mygrations.drivers.mysqldb.mysqldb import mysqldb
+from mygrations.drivers.mysqldb.mysqldb_pool import mysqldb_pool
 class base(object):
 
     credentials = {}
     config = {}
+    jobs = 1
+    cache_directory = None
+    schema_loader = 'show_create'
+    row_batcher = None
+    transaction_size = 1000
+    fk_checks = False
+    snapshot = None
+    plan_format = 'sql'
+    targets = None
+    fleet_workers = 8
+    pool_size = 1
+    mysql_version = None
+    split_instant_changes = False
+    coalesce_alters = False
+    cost_summary = False
+    max_cost = None
+
+    # whether the command connects to the database from the .env file
+    needs_credentials = True
 
     def __init__(self, options):
 
@@ -19,10 +43,123 @@ class base(object):
         self.config = dotenv(self.options['config'])
 
         # and load up the database credentials
-        self.credentials = db_credentials(self.options['env'], self.config)
+        if self.needs_credentials:
+            self.credentials = db_credentials(self.options['env'], self.config)
 
         if not 'files_directory' in self.config:
             raise ValueError('Missing files_directory configuration setting in configuration file')
 
+        # how many processes to parse the *.sql files with
+        if 'jobs' in self.options and self.options['jobs'] is not None:
+            self.jobs = int(self.options['jobs'])
+            if self.jobs < 1:
+                raise ValueError('jobs must be at least 1')
+
+        # whether the plan has to run with foreign key checks enabled
+        if 'fk_checks' in self.options and self.options['fk_checks']:
+            self.fk_checks = True
+
+        # a snapshot file to write (snapshot) or to use instead of the live database (plan, plan_export)
+        if 'snapshot' in self.options and self.options['snapshot']:
+            self.snapshot = self.options['snapshot']
+
+        # how to write out the plan: plain SQL, or one JSON record per operation
+        if 'format' in self.options and self.options['format']:
+            self.plan_format = self.options['format']
+            if self.plan_format not in ['sql', 'json', 'ndjson']:
+                raise ValueError('format must be one of sql, json, or ndjson')
+
+        # whether to print the estimated cost of the plan
+        if 'cost' in self.options and self.options['cost']:
+            self.cost_summary = True
+
+        # the longest (in estimated seconds) that a plan is allowed to take
+        if 'max_cost' in self.options and self.options['max_cost'] is not None:
+            self.max_cost = float(self.options['max_cost'])
+            if self.max_cost <= 0:
+                raise ValueError('max_cost must be more than 0')
+
+        # a file listing the DSNs of the databases to plan for (plan_fleet)
+        if 'targets' in self.options and self.options['targets']:
+            self.targets = self.options['targets']
+
+        # how many databases to load at once when planning for a fleet
+        if 'fleet_workers' in self.config and self.config['fleet_workers']:
+            self.fleet_workers = int(self.config['fleet_workers'])
+            if self.fleet_workers < 1:
+                raise ValueError('fleet_workers must be at least 1')
+
+        # where to cache parsed *.sql files, if anywhere
+        if 'cache_directory' in self.config and self.config['cache_directory']:
+            self.cache_directory = self.config['cache_directory']
+
+        # how to read the structure of the live database
+        if 'schema_loader' in self.config and self.config['schema_loader']:
+            self.schema_loader = self.config['schema_loader']
+            if self.schema_loader not in ['show_create', 'information_schema']:
+                raise ValueError('schema_loader must be either show_create or information_schema')
+
+        # how many connections to read the live database with
+        if 'pool_size' in self.config and self.config['pool_size']:
+            self.pool_size = int(self.config['pool_size'])
+            if self.pool_size < 1:
+                raise ValueError('pool_size must be at least 1')
+
+        # which version of MySQL the plan is for, to work out how each ALTER TABLE will run
+        if 'mysql_version' in self.config and self.config['mysql_version']:
+            self.mysql_version = str(self.config['mysql_version'])
+
+        # whether to split instant changes out of ALTER TABLE commands that rebuild the table
+        if 'split_instant_changes' in self.config and self.config['split_instant_changes']:
+            self.split_instant_changes = str(self.config['split_instant_changes']).lower() in ['1', 'true', 'yes']
+
+        # whether to merge the ALTER TABLE commands on each table, to save rebuilding it more than once
+        if 'coalesce_alters' in self.config and self.config['coalesce_alters']:
+            self.coalesce_alters = str(self.config['coalesce_alters']).lower() in ['1', 'true', 'yes']
+
+        # whether to combine row operations into multi-row commands
+        if 'batch_rows' in self.config and self.config['batch_rows']:
+            max_packet_size = self.config['max_packet_size'] if 'max_packet_size' in self.config else 1048576
+            self.row_batcher = row_batcher(int(self.config['batch_rows']), int(max_packet_size))
+
+        # how many row operations to apply per transaction
+        if 'transaction_size' in self.config and self.config['transaction_size']:
+            self.transaction_size = int(self.config['transaction_size'])
+            if self.transaction_size < 1:
+                raise ValueError('transaction_size must be at least 1')
+
+    def connect(self, credentials):
+        """ Returns a driver for the database, with a pool of connections if pool_size is more than 1
+
+        :param credentials: The database credentials to connect with
+        :type credentials: dict
+        :returns: The database driver
+        :rtype: mygrations.drivers.mysqldb.mysqldb|mygrations.drivers.mysqldb.mysqldb_pool
+        """
+        if self.pool_size > 1:
+            return mysqldb_pool(credentials, self.pool_size)
+
+        return mysqldb(credentials)
+
+    def coalesce(self, operations, db_from):
+        """ Merges the ALTER TABLE commands on each table in a plan, if coalesce_alters is set
+
+        :param operations: The structural operations in the plan
+        :param db_from: The database the plan will run on
+        :type operations: [mygrations.formats.mysql.mygrations.operations.*]
+        :type db_from: mygrations.formats.mysql.definitions.database
+        :returns: The operations and the alter_coalescer that processed them (None if it didn't run)
+        :rtype: tuple
+        """
+        if not self.coalesce_alters:
+            return (operations, None)
+
+        ddl_options = {'foreign_key_checks': self.fk_checks}
+        if self.mysql_version:
+            ddl_options['mysql_version'] = self.mysql_version
+
+        coalescer = alter_coalescer(online_ddl(**ddl_options))
+        return (coalescer.process(operations, db_from), coalescer)
+
     def execute(self):
         raise NotImplementedError()
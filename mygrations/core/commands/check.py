@@ -10,7 +10,9 @@ def execute(options):
     obj.execute()
 class check(base):
     def execute(self):
-        files_database = database_parser(self.config['files_directory'])
+        files_database = database_parser(
+            self.config['files_directory'], jobs=self.jobs, cache_directory=self.cache_directory
+        )
 
         # any errors or warnings?
         errors = False
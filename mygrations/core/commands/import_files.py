@@ -2,7 +2,9 @@ from .base import base
 from mygrations.formats.mysql.file_reader.database import database as database_parser
 from mygrations.formats.mysql.db_reader.database import database as database_reader
 from mygrations.formats.mysql.mygrations.mygration import mygration
-from mygrations.drivers.mysqldb.mysqldb import mysqldb
+from mygrations.formats.mysql.mygrations.row_mygration import row_mygration
+from mygrations.formats.mysql.mygrations.operations.disable_checks import disable_checks
+from mygrations.formats.mysql.mygrations.operations.enable_checks import enable_checks
 def execute(options):
 
     obj = import_files(options)
@@ -10,7 +12,9 @@ def execute(options):
 class import_files(base):
     def execute(self):
 
-        files_database = database_parser(self.config['files_directory'])
+        files_database = database_parser(
+            self.config['files_directory'], jobs=self.jobs, cache_directory=self.cache_directory
+        )
 
         # any errors or warnings?
         if files_database.errors:
@@ -21,7 +25,7 @@ class import_files(base):
             return False
 
         # use the credentials to load up a database connection
-        live_database = database_reader(mysqldb(self.credentials))
+        live_database = database_reader(self.connect(self.credentials), loader=self.schema_loader)
 
         # we have to tell the live database to load records
         # for any tables we are tracking records for.
@@ -29,6 +33,7 @@ class import_files(base):
         # just about any database can have records, but
         # that doesn't mean we want to track them.  We only
         # track them if the file has rows.
+        tables = []
         for table in files_database.tables.values():
             if not table.tracking_rows:
                 continue
@@ -36,14 +41,28 @@ class import_files(base):
             if not table.name in live_database.tables:
                 continue
 
-            live_database.read_rows(table)
+            tables.append(table)
 
-        mygrate = mygration(files_database, live_database)
+        live_database.read_many_rows(tables)
+
+        mygrate = mygration(files_database, live_database, False, order_by_fks=self.fk_checks, jobs=self.jobs)
         if mygrate.errors_1215:
             print('1215 Errors encountered')
             for error in mygrate.errors_1215:
                 print(error)
 
-        else:
-            for op in mygrate.operations:
-                live_database.apply_to_source(op)
+            return False
+
+        operations = list(self.coalesce(mygrate.operations, live_database)[0])
+        operations.extend(row_mygration(files_database, live_database, batcher=self.row_batcher).operations)
+
+        # the row changes need foreign key checks off just as much as the structure changes
+        # do (the same as the plan that the plan command prints)
+        if not self.fk_checks:
+            operations = [disable_checks()] + operations + [enable_checks()]
+
+        for (op, seconds) in live_database.apply_operations(operations, self.transaction_size):
+            summary = str(op).split('\n')[0]
+            if len(summary) > 100:
+                summary = summary[:97] + '...'
+            print('%8.3fs  %s' % (seconds, summary))
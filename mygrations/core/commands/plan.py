@@ -1,9 +1,15 @@
+import sys
+import itertools
+
 from .base import base
 from mygrations.formats.mysql.file_reader.database import database as database_parser
 from mygrations.formats.mysql.db_reader.database import database as database_reader
 from mygrations.formats.mysql.mygrations.mygration import mygration
 from mygrations.formats.mysql.mygrations.row_mygration import row_mygration
-from mygrations.drivers.mysqldb.mysqldb import mysqldb
+from mygrations.formats.mysql.mygrations.plan_writer import plan_writer
+from mygrations.formats.mysql.mygrations.online_ddl import online_ddl
+from mygrations.formats.mysql.mygrations.cost_estimator import cost_estimator
+from mygrations.formats.mysql.snapshot.database import database as database_snapshot
 from mygrations.formats.mysql.mygrations.operations.disable_checks import disable_checks
 from mygrations.formats.mysql.mygrations.operations.enable_checks import enable_checks
 def execute(options):
@@ -13,7 +19,199 @@ def execute(options):
 class plan(base):
     def execute(self):
 
-        files_database = database_parser(self.config['files_directory'])
+        files_database = self._read_files()
+        if files_database is None:
+            return False
+
+        # the table statistics are only read when the cost of the plan is wanted
+        # (snapshots don't have them, so the cost can't be estimated from a snapshot)
+        if self.wants_cost and self.snapshot:
+            raise ValueError('Estimating the cost of a plan needs a live database, which snapshots are not')
+
+        # use the snapshot if we have one, otherwise use the credentials to load up a database connection
+        if self.snapshot:
+            live_database = database_snapshot(self.snapshot)
+        else:
+            live_database = database_reader(self.connect(self.credentials), loader=self.schema_loader)
+            if self.wants_cost:
+                live_database.read_statistics()
+
+        self._read_rows(files_database, live_database)
+
+        mygrate = mygration(files_database, live_database, False, order_by_fks=self.fk_checks, jobs=self.jobs)
+        rows = row_mygration(files_database, live_database, batcher=self.row_batcher)
+
+        return self._finish(mygrate.operations or [], live_database, stream=rows.stream)
+
+    @property
+    def wants_cost(self):
+        """ Public getter.  Returns whether the plan has to be costed (for the cost summary or max_cost)
+
+        :rtype: bool
+        """
+        return self.cost_summary or self.max_cost is not None
+
+    def _finish(self, structure_ops, live_database, stream=None, fields=None):
+        """ Runs a plan through everything that happens after planning, and writes it
+
+        That is: merging ALTER TABLE commands (if coalesce_alters is set), adding the online
+        DDL clauses (if mysql_version is set), and estimating the cost of the plan (if that
+        is wanted, in which case the live database must have its statistics read).
+
+        :param structure_ops: The structural operations in the plan (or all of them, if there's no stream)
+        :param live_database: The database the plan will run on
+        :param stream: Returns the row operations, which are found as they are written (and twice with max_cost)
+        :param fields: Extra fields to add to every JSON record
+        :type structure_ops: [mygrations.formats.mysql.mygrations.operations.*]
+        :type live_database: mygrations.formats.mysql.definitions.database
+        :type stream: callable
+        :type fields: dict
+        :returns: False if the plan costs more than max_cost
+        :rtype: bool
+        """
+        (structure_ops, coalescer) = self.coalesce(structure_ops, live_database)
+        if coalescer and (coalescer.merged or coalescer.rebuilds_saved):
+            print(
+                '-- Merged %d ALTER TABLE command(s) into others, saving %d table rebuild(s)' %
+                (coalescer.merged, coalescer.rebuilds_saved),
+                file=sys.stdout if self.plan_format == 'sql' else sys.stderr
+            )
+
+        if self.mysql_version:
+            structure_ops = self._online_ddl(structure_ops, live_database)
+
+        # the row operations are streamed out as they are found, so a plan that syncs
+        # a lot of rows is never held in memory all at once
+        statistics = live_database.statistics if self.wants_cost else None
+        estimator = cost_estimator(statistics) if self.wants_cost else None
+        row_ops = stream() if stream else []
+        if self.max_cost is not None:
+            # the whole plan has to be costed before any of it is written, so the rows are found twice
+            estimator.add_all(structure_ops)
+            estimator.add_all(row_ops)
+            if not self._check_cost(estimator):
+                return False
+            row_ops = stream() if stream else []
+        elif estimator:
+            structure_ops = self._costed(structure_ops, estimator)
+            row_ops = self._costed(row_ops, estimator)
+
+        ops = itertools.chain(structure_ops, row_ops)
+        first = next(ops, None)
+        if first is not None:
+            # exact counts for the tables we have read the rows of, and the server's estimates for the rest
+            row_counts = {name: table['rows'] for (name, table) in (statistics or {}).items()}
+            for table in live_database.tables.values():
+                if table.tracking_rows:
+                    row_counts[table.name] = len(table.rows)
+            self._write(itertools.chain([first], ops), row_counts, fields=fields, db_from=live_database)
+
+        if self.cost_summary:
+            self._print_cost(estimator, sys.stdout if self.plan_format == 'sql' else sys.stderr)
+
+        return True
+
+    def _online_ddl(self, operations, live_database):
+        """ Adds ALGORITHM and LOCK clauses to the ALTER TABLE commands, and reports which tables get rebuilt
+
+        :param operations: The structural operations in the plan
+        :param live_database: The live database
+        :type operations: [mygrations.formats.mysql.mygrations.operations.*]
+        :type live_database: mygrations.formats.mysql.definitions.database
+        :returns: The operations, with any instant changes split out if split_instant_changes is set
+        :rtype: [mygrations.formats.mysql.mygrations.operations.*]
+        """
+        ddl = online_ddl(self.mysql_version, foreign_key_checks=self.fk_checks, split=self.split_instant_changes)
+        operations = ddl.process(operations, live_database)
+
+        # as SQL comments, so the plan can still be piped straight into MySQL
+        if self.plan_format == 'sql':
+            if ddl.rebuilt_tables:
+                print('-- Tables rebuilt by this plan: %s' % ', '.join(ddl.rebuilt_tables))
+            elif operations:
+                print('-- No tables are rebuilt by this plan')
+
+        return operations
+
+    def _costed(self, ops, estimator):
+        """ Adds the cost of each operation to an estimator as it goes by
+
+        :param ops: The operations
+        :param estimator: The cost estimator to add them to
+        :type ops: iterable[mygrations.formats.mysql.mygrations.operations.*]
+        :type estimator: mygrations.formats.mysql.mygrations.cost_estimator
+        :returns: The same operations
+        :rtype: generator
+        """
+        for op in ops:
+            estimator.add(op)
+            yield op
+
+    def _check_cost(self, estimator):
+        """ Checks the estimated cost of a plan against max_cost, and explains any refusal on stderr
+
+        :param estimator: The cost estimator, with the whole plan added to it
+        :type estimator: mygrations.formats.mysql.mygrations.cost_estimator
+        :returns: False if the plan costs more than max_cost
+        :rtype: bool
+        """
+        if estimator.total_seconds <= self.max_cost:
+            return True
+
+        print(
+            'Refusing to write a plan estimated to take %.1f seconds (max_cost is %.1f)' %
+            (estimator.total_seconds, self.max_cost),
+            file=sys.stderr
+        )
+        self._print_cost(estimator, sys.stderr)
+
+        return False
+
+    def _print_cost(self, estimator, fp):
+        """ Prints the estimated cost of a plan, most expensive operation first, as SQL comments
+
+        :param estimator: The cost estimator, with the whole plan added to it
+        :param fp: Where to print it
+        :type estimator: mygrations.formats.mysql.mygrations.cost_estimator
+        :type fp: file
+        """
+        if not estimator.summary:
+            return
+
+        print(
+            '-- Estimated cost: %.1f seconds, %s rewritten' %
+            (estimator.total_seconds, self._format_bytes(estimator.total_bytes)),
+            file=fp
+        )
+        for (description, size, seconds) in estimator.summary:
+            description = description.split('\n')[0]
+            description = description if len(description) <= 80 else '%s...' % description[:77]
+            print('-- %10.1fs %10s  %s' % (seconds, self._format_bytes(size), description), file=fp)
+
+    def _format_bytes(self, size):
+        """ Returns a number of bytes in the largest unit that keeps it at or above 1, i.e. 1.5 GB
+
+        :param size: The number of bytes
+        :type size: int
+        :returns: The size, with its unit
+        :rtype: string
+        """
+        for unit in ['B', 'KB', 'MB', 'GB']:
+            if size < 1024:
+                return '%d %s' % (size, unit) if unit == 'B' else '%.1f %s' % (size, unit)
+            size /= 1024
+
+        return '%.1f TB' % size
+
+    def _read_files(self):
+        """ Parses the *.sql files, and reports any errors in them
+
+        :returns: The database parsed out of the *.sql files, or None if there are errors (and no -f)
+        :rtype: mygrations.formats.mysql.definitions.database|None
+        """
+        files_database = database_parser(
+            self.config['files_directory'], jobs=self.jobs, cache_directory=self.cache_directory
+        )
 
         # any errors or warnings?
         quit_early = False
@@ -30,18 +228,23 @@ class plan(base):
             for error in files_database.errors_1215:
                 print(error)
 
-        if quit_early:
-            return False
+        return None if quit_early else files_database
 
-        # use the credentials to load up a database connection
-        live_database = database_reader(mysqldb(self.credentials))
+    def _read_rows(self, files_database, live_database):
+        """ Reads the rows of the live database for the tables that the *.sql files track rows for
 
+        :param files_database: The database parsed out of the *.sql files
+        :param live_database: The live database
+        :type files_database: mygrations.formats.mysql.definitions.database
+        :type live_database: mygrations.formats.mysql.definitions.database
+        """
         # we have to tell the live database to load records
         # for any tables we are tracking records for.
         # We use the "files" database as the "truth" because
         # just about any database can have records, but
         # that doesn't mean we want to track them.  We only
         # track them if the file has rows.
+        tables = []
         for table in files_database.tables.values():
             if not table.tracking_rows:
                 continue
@@ -49,22 +252,32 @@ class plan(base):
             if not table.name in live_database.tables:
                 continue
 
-            live_database.read_rows(table)
+            tables.append(table)
 
-        mygrate = mygration(files_database, live_database, False)
+        live_database.read_many_rows(tables)
 
-        ops = []
-        if mygrate.operations:
-            ops.extend(mygrate.operations)
+    def _write(self, ops, row_counts, fields=None, db_from=None):
+        """ Prints a plan in the requested format
 
-        rows = row_mygration(files_database, live_database)
-        if rows.operations:
-            ops.extend(rows.operations)
+        :param ops: The operations in the plan (not including the foreign key checks)
+        :param row_counts: The number of rows in each table, by table name
+        :param fields: Extra fields to add to every JSON record
+        :param db_from: The database the plan will run on, for the foreign keys between its tables
+        :type ops: iterable[mygrations.formats.mysql.mygrations.operations.*]
+        :type row_counts: dict
+        :type fields: dict
+        :type db_from: mygrations.formats.mysql.definitions.database
+        """
+        if not self.fk_checks:
+            ops = itertools.chain([disable_checks()], ops, [enable_checks()])
 
-        if not ops:
-            return True
+        if self.plan_format == 'sql':
+            for op in ops:
+                print(op)
+            return
 
-        print(disable_checks())
-        for op in ops:
-            print(op)
-        print(enable_checks())
+        writer = plan_writer(
+            sys.stdout, array=(self.plan_format == 'json'), row_counts=row_counts, fields=fields, db_from=db_from
+        )
+        writer.write_all(ops)
+        writer.close()
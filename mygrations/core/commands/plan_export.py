@@ -6,7 +6,7 @@ from mygrations.formats.mysql.db_reader.database import database as database_rea
 from mygrations.formats.mysql.mygrations.mygration import mygration
 from mygrations.formats.mysql.mygrations.row_mygration import row_mygration
 from mygrations.formats.mysql.mygrations.operations.row_insert import row_insert
-from mygrations.drivers.mysqldb.mysqldb import mysqldb
+from mygrations.formats.mysql.snapshot.database import database as database_snapshot
 def execute(options):
 
     obj = plan_export(options)
@@ -14,17 +14,22 @@ def execute(options):
 class plan_export(base):
     def execute(self):
 
-        files_database = database_parser(self.config['files_directory'])
+        files_database = database_parser(
+            self.config['files_directory'], jobs=self.jobs, cache_directory=self.cache_directory
+        )
 
-        # use the credentials to load up a database connection
-        live_database = database_reader(mysqldb(self.credentials))
+        # use the snapshot if we have one, otherwise use the credentials to load up a database connection
+        if self.snapshot:
+            live_database = database_snapshot(self.snapshot)
+        else:
+            live_database = database_reader(self.connect(self.credentials), loader=self.schema_loader)
 
         # we aren't outputting operations.  Instead we just need to know what tables
         # have changed (either structure or records).  The easiest (and slightly hack)
         # way to do that is to simply run an actual mygration and grab out the names
         # of the tables that have changed.  Cheating, I know
         self.modified_tables = {}
-        mygrate = mygration(live_database, files_database, False)
+        mygrate = mygration(live_database, files_database, False, jobs=self.jobs)
         if mygrate.operations:
             for op in mygrate.operations:
                 self.modified_tables[op.table_name] = True
@@ -32,12 +37,15 @@ class plan_export(base):
         # we have to tell the live database to load records
         # for any tables we are tracking records for, according
         # to the files database.
+        tables = []
         for table in files_database.tables.values():
             if not table.tracking_rows:
                 continue
             if not table.name in live_database.tables:
                 continue
-            live_database.read_rows(table)
+            tables.append(table)
+
+        live_database.read_many_rows(tables)
 
         rows = row_mygration(live_database, files_database)
         if rows.operations:
@@ -0,0 +1,99 @@
+import sys
+
+from collections import OrderedDict
+from .plan import plan
+from mygrations.helpers.dsn_credentials import dsn_credentials
+from mygrations.formats.mysql.db_reader.database import database as database_reader
+from mygrations.formats.mysql.mygrations.fleet_mygration import fleet_mygration
+def execute(options):
+
+    obj = plan_fleet(options)
+    obj.execute()
+class plan_fleet(plan):
+
+    # the databases come from the --targets file instead
+    needs_credentials = False
+
+    def execute(self):
+
+        if not self.targets:
+            raise ValueError('The plan_fleet command needs a file with the DSNs of the databases with --targets')
+
+        if self.plan_format == 'json':
+            raise ValueError('The plan_fleet command can only write sql or ndjson plans')
+
+        targets = self._read_targets()
+
+        files_database = self._read_files()
+        if files_database is None:
+            return False
+
+        fleet = fleet_mygration(
+            files_database,
+            targets,
+            lambda credentials: self._load(files_database, credentials),
+            workers=self.fleet_workers,
+            batcher=self.row_batcher,
+            order_by_fks=self.fk_checks,
+            jobs=self.jobs
+        )
+
+        within_budget = True
+        for (plan_number, (names, ops)) in enumerate(fleet.groups, start=1):
+            if self.plan_format == 'sql':
+                print('-- Plan %d for %d database(s): %s' % (plan_number, len(names), ', '.join(names)))
+
+            # every group is costed from the sizes of the tables in the database its plan was built from
+            live_database = fleet.database(names[0])
+            if self.wants_cost:
+                live_database.read_statistics()
+
+            # the plans are already in memory, so the row operations go in with the rest
+            if not self._finish(ops, live_database, fields={'plan': plan_number, 'targets': names}):
+                within_budget = False
+
+        for (name, error) in fleet.errors.items():
+            print('Failed to load %s: %s' % (name, error), file=sys.stderr)
+
+        return within_budget and not fleet.errors
+
+    def _read_targets(self):
+        """ Reads the DSNs out of the targets file: one per line, ignoring blank lines and # comments
+
+        :returns: The credentials for each database, by name
+        :rtype: OrderedDict
+        """
+        targets = OrderedDict()
+        with open(self.targets, 'r') as fp:
+            for line in fp:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+
+                credentials = dsn_credentials(line)
+                if credentials.name in targets:
+                    raise ValueError('Database %s is listed more than once in %s' % (credentials.name, self.targets))
+
+                targets[credentials.name] = credentials
+
+        if not targets:
+            raise ValueError('No DSNs found in %s' % self.targets)
+
+        return targets
+
+    def _load(self, files_database, credentials):
+        """ Loads the structure of one database (and the rows that the *.sql files track)
+
+        Called from the worker threads, so every database gets its own connection.
+
+        :param files_database: The database parsed out of the *.sql files
+        :param credentials: The credentials of the database to load
+        :type files_database: mygrations.formats.mysql.definitions.database
+        :type credentials: mygrations.helpers.dsn_credentials
+        :returns: The live database
+        :rtype: mygrations.formats.mysql.db_reader.database
+        """
+        live_database = database_reader(self.connect(credentials), loader=self.schema_loader)
+        self._read_rows(files_database, live_database)
+
+        return live_database
@@ -0,0 +1,37 @@
+from .base import base
+from mygrations.formats.mysql.file_reader.database import database as database_parser
+from mygrations.formats.mysql.db_reader.database import database as database_reader
+from mygrations.formats.mysql.snapshot.database import save
+def execute(options):
+
+    obj = snapshot(options)
+    obj.execute()
+class snapshot(base):
+    def execute(self):
+
+        if not self.snapshot:
+            raise ValueError('The snapshot command needs the name of the file to write with --snapshot')
+
+        files_database = database_parser(
+            self.config['files_directory'], jobs=self.jobs, cache_directory=self.cache_directory
+        )
+
+        # use the credentials to load up a database connection
+        live_database = database_reader(self.connect(self.credentials), loader=self.schema_loader)
+
+        # include the rows for any table that the *.sql files are tracking rows for,
+        # so that the snapshot can stand in for the live database when planning
+        tables = []
+        for table in files_database.tables.values():
+            if not table.tracking_rows:
+                continue
+
+            if not table.name in live_database.tables:
+                continue
+
+            tables.append(table)
+
+        live_database.read_many_rows(tables)
+
+        save(live_database, self.snapshot)
+        print('Wrote snapshot of %d tables to %s' % (len(live_database.tables), self.snapshot))
@@ -13,6 +13,9 @@ class parser(object):
         'regexp': rule_regexp
     }
 
+    # used to clean up whitespace before parsing
+    whitespace = re.compile(r'\s+')
+
     def __init__(self, rules=[]):
 
         self._values = {}
@@ -24,13 +27,92 @@ class parser(object):
         if not self.rules:
             raise NotImplementedError("Cannot extend parser without providing rules in %s" % (self.__class__))
 
+        # rule objects don't change from one parser to the next, so build them
+        # once per class and share them.  If rules were passed in directly then
+        # they are just for us, so don't touch the class cache.
+        if rules:
+            self._program = self.compile()
+        else:
+            self._program = self.__class__._get_program(self)
+
+        self.num_rules = len(self.rules)
+
+    @classmethod
+    def _get_program(cls, instance):
+        """ Returns the compiled rule program for the class, compiling it if necessary
+
+        The cache lives in the class __dict__ (rather than as an inherited attribute)
+        so that a subclass never picks up the program of its parent.  The rules list
+        is stored alongside the program so that replacing `rules` invalidates it.
+
+        :param instance: An instance of the class, used for error messages while compiling
+        :type instance: parser
+        :returns: The compiled rule program
+        :rtype: tuple
+        """
+        cached = cls.__dict__.get('_compiled_rules')
+        if cached is not None and cached[0] is instance.rules:
+            return cached[1]
+
+        program = instance.compile()
+        cls._compiled_rules = (instance.rules, program)
+        return program
+
+    def __getstate__(self):
+        """ Leaves the (shared) compiled rule program out when pickling
+
+        Parsed definitions get shipped between processes, and there is no reason
+        to drag every rule object along with them.  The program is rebuilt (or
+        pulled from the class cache) when unpickling.
+        """
+        state = self.__dict__.copy()
+        if '_program' in state:
+            state['_program'] = None
+        return state
+
+    def __setstate__(self, state):
+
+        self.__dict__.update(state)
+
+        # rules passed in directly will be in our own __dict__
+        if '_program' in state:
+            self._program = self.compile() if 'rules' in state else self.__class__._get_program(self)
+
+    def compile(self):
+        """ parser.compile()
+
+        Turns the rules list into a "program": the rule parser objects (with any regular
+        expressions already compiled), whether or not each rule is optional, and whether
+        or not any required rules come after each rule.  Rule objects returned by this
+        method are shared by every parser of the same class, so they are only ever used
+        through the stateless :meth:`mygrations.core.parse.rule_base.rule_base.match`
+
+        :returns: A tuple of (rule_parser, optional, required_after) tuples
+        :rtype: tuple
+        """
+        program = []
+        num_rules = len(self.rules)
         for (rule_index, rule) in enumerate(self.rules):
 
             # we always need a type
             if not 'type' in rule:
                 raise ValueError('Missing type for rule %s in %s' % (rule, self.__class__))
 
-        self.num_rules = len(self.rules)
+            # do we have a next rule?
+            next_rule = self.rules[rule_index + 1] if rule_index < num_rules - 1 else False
+
+            # did we check every required rule?
+            required_after = False
+            for check_index in range(rule_index + 1, num_rules):
+                check_rule = self.rules[check_index]
+                if not 'optional' in check_rule or not check_rule['optional']:
+                    required_after = True
+                    break
+
+            optional = True if 'optional' in rule and rule['optional'] else False
+            program.append((self.get_rule_parser(rule, next_rule), optional, required_after))
+
+        return tuple(program)
 
     def __getitem__(self, key):
 
@@ -70,21 +152,28 @@ class parser(object):
 
         # first thing first, some initial string cleaning.  Clean spaces
         # from start and end and replace any multi-spaces with a single space.
-        string = re.sub('\s+', ' ', string).strip()
+        return self.parse_clean(self.whitespace.sub(' ', string).strip())
 
-        for (rule_index, rule) in enumerate(self.rules):
+    def parse_clean(self, string):
+        """ parser.parse_clean( string )
 
-            # do we have a next rule?
-            next_rule = self.rules[rule_index + 1] if rule_index < self.num_rules - 1 else False
+        Parses a string which has already been cleaned up the way :meth:`parse` would.
+        Leftovers from our rules are always cleaned, so child parsers use this to avoid
+        re-cleaning the entire remaining string each time one is called.
 
-            # now we can parse
-            rule_parser = self.get_rule_parser(rule, next_rule)
+        :param string: The cleaned string to parse
+        :type string: str
+        :returns: The leftovers
+        :rtype: str
+        """
+        for (rule_parser, optional, required_after) in self._program:
 
             # does it match?  Check for a lack of match and deal with that first
-            if not rule_parser.parse(string):
+            matched = rule_parser.match(string)
+            if matched is None:
 
                 # if this rule wasn't optional then we just don't match
-                if not 'optional' in rule or not rule['optional']:
+                if not optional:
                     self.matched = False
                     return string
 
@@ -92,8 +181,7 @@ class parser(object):
                 continue
 
             # we did match!  Yeah!
-            self._values[rule_parser.name] = rule_parser.result
-            string = rule_parser.leftovers
+            (self._values[rule_parser.name], string) = matched
 
             # we are all done if we have nothing left
             if not string:
@@ -101,13 +189,9 @@ class parser(object):
 
         # if we got here then we got to the end, but we may not be done.  If we have more required
         # rules left that haven't been matched, then we don't match.
-
-        # did we check every required rule?
-        for check_index in range(rule_index + 1, self.num_rules):
-            rule = self.rules[check_index]
-            if not 'optional' in rule or not rule['optional']:
-                self.matched = False
-                return string
+        if required_after:
+            self.matched = False
+            return string
 
         # if we got here then we didn't match everything, but we fulfilled all of our
         # required rules.  As a result, we are done!
@@ -72,8 +72,31 @@ class rule_base(object):
         :type string: str
         :returns: boolean
         """
+        matched = self.match(string)
+
+        if matched is None:
+            self.result = ''
+            self.leftovers = string
+            return False
+
+        (self.result, self.leftovers) = matched
+        return True
+
+    def match(self, string):
+        """ rule.match( string )
+
+        Parse the string according to the rule class and configuration without storing any state
+        on the rule.  Returns None if the rule doesn't match, otherwise a tuple with the result
+        and the leftovers.  This is what compiled parser programs use, since one rule object is
+        shared by every parser of the same class.
+
+        :param string: The string to parse
+        :type string: str
+        :returns: None|(result, leftovers)
+        :rtype: None|tuple
+        """
 
         # why is this here?  Because python abstract classes are stange, and I don't feel like bothering with them.
         # this accomplishes the exact same thing, just at run-time instead of compile-time.  Not a big deal
         # in this case.
-        raise ValueError("You forgot to extend rule_base.parse")
+        raise ValueError("You forgot to extend rule_base.match")
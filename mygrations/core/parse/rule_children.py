@@ -11,6 +11,14 @@ class rule_children(rule_base):
     will be removed and parsing will start again.  This repeats until no more matches
     can be found.
 
+    Trying every child class against every definition gets expensive, so a rule can
+    also provide a dispatch function.  It is called with the string being parsed and
+    returns a key (or None).  Child classes list the keys they can match in their
+    `dispatch_keys` attribute, and only the children for the returned key are tried.
+    Children without `dispatch_keys` are always tried.  If none of the candidates
+    match then every child class gets a shot, so the "largest match wins" rule still
+    decides anything the dispatch function can't.
+
     keys for the rules dictionary:
 
     =========  ========
@@ -18,6 +26,7 @@ class rule_children(rule_base):
     =========  ========
     name       The name of the rule
     classes    A list with classes to be matched
+    dispatch   (optional) A function returning the dispatch key for a string
     optional   (optional) If true, denotes that this rule is optional
     =========  ========
 
@@ -33,6 +42,8 @@ class rule_children(rule_base):
     require_value = False
 
     classes = []
+    dispatch = None
+    candidates = None
 
     def __init__(self, parser, rule, next_rule):
 
@@ -45,65 +56,93 @@ class rule_children(rule_base):
             raise ValueError('Missing classes for children rule %s in %s' % (rule, self.parser_class))
 
         self.classes = self.rule['classes']
+        self.dispatch = self.rule['dispatch'] if 'dispatch' in self.rule else None
+        self.candidates = self._build_candidates() if self.dispatch else {}
+
+    def _build_candidates(self):
+        """ Builds the dispatch index: a list of candidate child classes for each dispatch key
+
+        Order from the original class list is preserved, so ties are still resolved the same way.
+
+        :returns: A dictionary with lists of child classes by dispatch key
+        :rtype: dict
+        """
+        keys = set()
+        for child in self.classes:
+            keys.update(getattr(child, 'dispatch_keys', ()))
+
+        candidates = {}
+        for key in keys:
+            candidates[key] = [
+                child for child in self.classes
+                if not getattr(child, 'dispatch_keys', ()) or key in child.dispatch_keys
+            ]
+
+        return candidates
+
+    def _best_match(self, classes, string):
+        """ Runs each class against the string and returns the best match
+
+        If more than one child matches, the one that matches the largest part of the string
+        wins.  All else being equal, first come first serve.
+
+        :param classes: The child classes to try
+        :param string: The string to parse
+        :type classes: list
+        :type string: str
+        :returns: None or a tuple with the matching child parser and its leftovers
+        :rtype: None|tuple
+        """
+        best_match = None
+        best_leftover = ''
 
-    def parse(self, string):
+        for child in classes:
+
+            # let the child parse the string.  Our string has already been cleaned
+            # up by the parser that owns this rule, so skip the cleaning step
+            child_parser = child()
+            leftover = child_parser.parse_clean(string)
+
+            # if it didn't do anything then this child didn't match
+            if not child_parser.matched:
+                continue
+
+            if best_match is None or len(leftover) < len(best_leftover):
+                best_match = child_parser
+                best_leftover = leftover
+
+        if best_match is None:
+            return None
+
+        return (best_match, best_leftover)
+
+    def match(self, string):
 
         matches = []
 
         # we need to keep looping through the children looking for matches
         # to the string until we no longer get any matches.  Then return.
-        c = 0
         while string:
 
-            c += 1
-            if c > 1000:
-                raise ValueError('Max depth reached')
-
-            shortest_leftover = False
-            best_match = False
-            best_leftover = ''
-            current_string = string
-
-            for child in self.classes:
-
-                # let the child parse the string
-                child_parser = child()
-                leftover = child_parser.parse(current_string)
-
-                # if it didn't do anything then this child didn't match
-                if not child_parser.matched:
-                    continue
-
-                # It is possible that more than one child matches.  If so,
-                # prioritize the child that matches the largest part of the
-                # string.  All else being equal, first come first serve
-                if best_match:
-                    if len(leftover) < shortest_leftover:
-                        shortest_leftover = len(leftover)
-                        best_match = child_parser
-                        best_leftover = leftover
-                else:
-                    shortest_leftover = len(leftover)
-                    best_match = child_parser
-                    best_leftover = leftover
+            found = None
+            if self.dispatch:
+                key = self.dispatch(string)
+                if key in self.candidates:
+                    found = self._best_match(self.candidates[key], string)
 
-            # we have a match!
-            if best_match:
-                string = best_leftover
-                matches.append(best_match)
+            # no dispatch or no luck with the candidates: everyone gets a shot
+            if found is None:
+                found = self._best_match(self.classes, string)
 
-            # If we didn't find anything then we are completely done
-            else:
+            # If we didn't find anything (or didn't get anywhere) then we are completely done
+            if found is None or len(found[1]) >= len(string):
                 if matches:
-                    self.leftovers = string
-                    self.result = matches
-                    return True
-                else:
-                    self.leftovers = string
-                    self.result = ''
-                return False
+                    return (matches, string)
+                return None
+
+            # we have a match!
+            (best_match, string) = found
+            matches.append(best_match)
 
         # the only way we would get here is if we matched the entire string
-        self.leftovers = ''
-        self.result = matches
-        return True
+        return (matches, '')
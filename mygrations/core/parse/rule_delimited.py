@@ -72,7 +72,7 @@ class rule_delimited(rule_base):
                 (self.rule, self.parser_class)
             )
 
-    def parse(self, string):
+    def match(self, string):
 
         end = self.next_rule['value'].lower()
         end_len = len(end)
@@ -146,12 +146,8 @@ class rule_delimited(rule_base):
 
         # did we match anything?
         if not vals:
-            self.leftovers = string
-            self.result = ''
-            return False
+            return None
 
         # almost done: one last step.  Remove everything that we parsed from string.
         # we know what index we stopped at, so it is easy.
-        self.leftovers = string[index:]
-        self.result = vals
-        return True
+        return (vals, string[index:])
@@ -28,31 +28,29 @@ class rule_regexp(rule_base):
     """
 
     regexp = ''
+    pattern = None
 
     def __init__(self, parser, rule, next_rule):
 
         super().__init__(parser, rule, next_rule)
 
         self.regexp = self.rule['value']
+        self.pattern = re.compile(self.regexp, re.IGNORECASE)
 
-    def parse(self, string):
+    def match(self, string):
 
         # apply the regular expression!
-        result = re.match(self.regexp, string, re.IGNORECASE)
+        result = self.pattern.match(string)
 
         # if it didn't match then nothing channged
         if not result:
-            self.leftovers = string
-            self.result = ''
-            return False
+            return None
 
         # otherwise we have a match and can return as such
-        self.result = result.group(0)
-        cleaned = string[len(self.result):].strip()
+        cleaned = string[result.end():].strip()
 
         # if there was a group in the regular expression then just keep that part
         if result.groups():
-            self.result = result.group(1)
+            return (result.group(1), cleaned)
 
-        self.leftovers = cleaned
-        return True
+        return (result.group(0), cleaned)
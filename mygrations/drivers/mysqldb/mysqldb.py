@@ -5,6 +5,56 @@ from collections import OrderedDict
 class mysqldb(object):
     """ High level driver for a MySQLdb connection """
 
+    # the bulk queries used by information_schema(), in the order they are executed
+    information_schema_queries = OrderedDict([
+        (
+            'tables', """
+            SELECT t.TABLE_NAME, t.ENGINE, t.TABLE_COLLATION, c.CHARACTER_SET_NAME, c.IS_DEFAULT
+            FROM information_schema.TABLES t
+            LEFT JOIN information_schema.COLLATIONS c ON c.COLLATION_NAME = t.TABLE_COLLATION
+            WHERE t.TABLE_SCHEMA = DATABASE() AND t.TABLE_TYPE = 'BASE TABLE'
+            ORDER BY t.TABLE_NAME
+        """
+        ),
+        (
+            'columns', """
+            SELECT col.TABLE_NAME, col.COLUMN_NAME, col.COLUMN_DEFAULT, col.IS_NULLABLE, col.COLUMN_TYPE,
+                col.CHARACTER_SET_NAME, col.COLLATION_NAME, c.IS_DEFAULT, col.EXTRA
+            FROM information_schema.COLUMNS col
+            LEFT JOIN information_schema.COLLATIONS c ON c.COLLATION_NAME = col.COLLATION_NAME
+            WHERE col.TABLE_SCHEMA = DATABASE()
+            ORDER BY col.TABLE_NAME, col.ORDINAL_POSITION
+        """
+        ),
+        (
+            'indexes', """
+            SELECT TABLE_NAME, INDEX_NAME, NON_UNIQUE, COLUMN_NAME
+            FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE()
+            ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX
+        """
+        ),
+        (
+            'constraints', """
+            SELECT k.TABLE_NAME, k.CONSTRAINT_NAME, k.COLUMN_NAME, k.REFERENCED_TABLE_NAME, k.REFERENCED_COLUMN_NAME,
+                r.UPDATE_RULE, r.DELETE_RULE
+            FROM information_schema.KEY_COLUMN_USAGE k
+            JOIN information_schema.REFERENTIAL_CONSTRAINTS r ON r.CONSTRAINT_SCHEMA = k.CONSTRAINT_SCHEMA
+                AND r.TABLE_NAME = k.TABLE_NAME AND r.CONSTRAINT_NAME = k.CONSTRAINT_NAME
+            WHERE k.TABLE_SCHEMA = DATABASE() AND k.REFERENCED_TABLE_NAME IS NOT NULL
+            ORDER BY k.TABLE_NAME, k.CONSTRAINT_NAME, k.ORDINAL_POSITION
+        """
+        ),
+    ])
+
+    # the size of every table, as estimated by the server
+    table_statistics_query = """
+        SELECT TABLE_NAME, TABLE_ROWS, DATA_LENGTH, INDEX_LENGTH
+        FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_TYPE = 'BASE TABLE'
+        ORDER BY TABLE_NAME
+    """
+
     def __init__(self, credentials):
         """ Initialize the MySQLdb connection
 
@@ -19,6 +69,9 @@ class mysqldb(object):
         else:
             self.conn = credentials
 
+        # the cursor used by execute(), which is reused for every query
+        self._cursor = None
+
     def tables(self):
         """ Returns the tables in the connected database
 
@@ -49,19 +102,108 @@ class mysqldb(object):
 
         return definitions
 
-    def rows(self, table_name):
-        """ Returns the rows in the table as a tuple of dicts
+    def information_schema(self):
+        """ Returns the structure of every table in the connected database from information_schema
 
-        :returns: The rows in the table
-        :rtype: (dict)
+        This is the bulk alternative to :meth:`tables`.  Instead of one SHOW CREATE TABLE
+        round-trip per table, the whole structure comes back in four queries, which makes a
+        big difference for databases with thousands of tables (especially over a slow link).
+        The results are returned raw: see :class:`mygrations.formats.mysql.db_reader.information_schema`
+        for the (positional) layout of each result set and for turning them into definitions.
+
+        :returns: An ordered dict with lists of result tuples for 'tables', 'columns', 'indexes', and 'constraints'
+        :rtype: OrderedDict
         """
+        cursor = self.conn.cursor()
+
+        results = OrderedDict()
+        for (name, query) in self.information_schema_queries.items():
+            cursor.execute(query)
+            results[name] = [row for row in cursor.fetchall()]
+
+        cursor.close()
+
+        return results
 
-        # still sticking to full caching client-side without
-        # support for memory-preserving iterators.  Given our
-        # use case, I think this will be fine.  Can always change later
-        cursor = self.conn.cursor(MySQLdb.cursors.DictCursor)
-        cursor.execute('SELECT * FROM %s' % table_name)
-        rows = cursor.fetchall()
+    def table_statistics(self):
+        """ Returns the statistics that the server keeps on the size of each table
+
+        For InnoDB these are estimates (TABLE_ROWS especially can be off by quite a bit)
+        but they are cheap to get and good enough to judge how long a change will take.
+
+        :returns: A list of (table name, rows, data length, index length) tuples
+        :rtype: list
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(self.table_statistics_query)
+        results = [row for row in cursor.fetchall()]
         cursor.close()
 
-        return rows
+        return results
+
+    def rows(self, table_name, batch_size=1000):
+        """ Returns the column names of the table and an iterator over its rows
+
+        Rows are streamed from the server with an unbuffered cursor and fetched in batches,
+        so the driver never holds more than batch_size rows at a time.  Each row is a tuple
+        of values in the same order as the column names.
+
+        MySQL only allows one unbuffered query at a time per connection, so the iterator
+        must be consumed (or closed) before running anything else.  The cursor is closed once
+        the iterator is exhausted.
+
+        :param table_name: The name of the table to read rows from
+        :param batch_size: The number of rows to fetch from the server at once
+        :type table_name: string
+        :type batch_size: int
+        :returns: A tuple with the column names and an iterator over the row tuples
+        :rtype: (tuple, iterator)
+        """
+        cursor = self.conn.cursor(MySQLdb.cursors.SSCursor)
+        cursor.execute('SELECT * FROM `%s`' % table_name)
+        column_names = tuple(description[0] for description in cursor.description)
+
+        return (column_names, self._stream_rows(cursor, batch_size))
+
+    def _stream_rows(self, cursor, batch_size):
+        """ Yields the rows from an executed cursor, fetching them in batches
+
+        :param cursor: The cursor to fetch rows from
+        :param batch_size: The number of rows to fetch at once
+        :type batch_size: int
+        :returns: A generator over the row tuples
+        :rtype: generator
+        """
+        try:
+            while True:
+                batch = cursor.fetchmany(batch_size)
+                if not batch:
+                    break
+
+                for row in batch:
+                    yield row
+        finally:
+            cursor.close()
+
+    def execute(self, query):
+        """ Executes a query that doesn't return anything
+
+        Every call goes through the same cursor on the same connection, so session settings
+        (i.e. SET FOREIGN_KEY_CHECKS=0) carry over from one query to the next.  Nothing is
+        committed: call :meth:`commit` for that.
+
+        :param query: The query to execute
+        :type query: string
+        """
+        if self._cursor is None:
+            self._cursor = self.conn.cursor()
+
+        self._cursor.execute(query)
+
+    def commit(self):
+        """ Commits the current transaction """
+        self.conn.commit()
+
+    def rollback(self):
+        """ Rolls back the current transaction """
+        self.conn.rollback()
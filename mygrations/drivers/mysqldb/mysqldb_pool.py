@@ -0,0 +1,164 @@
+import queue
+import MySQLdb
+import MySQLdb.cursors
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from .mysqldb import mysqldb
+from .pooled_rows import pooled_rows
+class mysqldb_pool(mysqldb):
+    """ driver = mysqldb_pool( credentials, size=4 )
+
+    A MySQLdb driver with a pool of connections, for reading a database concurrently
+
+    Reading the structure and rows of a remote database is mostly spent waiting on
+    round-trips: one SHOW CREATE TABLE per table, and one SELECT per tracked table.  This
+    driver spreads those queries over `size` connections so that they wait in parallel:
+
+    ==================  ==================================================================
+    method              concurrency
+    ==================  ==================================================================
+    tables              SHOW CREATE TABLE runs for up to `size` tables at once
+    information_schema  The bulk queries all run at once
+    rows                Each call borrows its own connection until its rows are consumed or closed
+    ==================  ==================================================================
+
+    Results always come back in the same order as with a single connection.  Everything
+    that changes the database (execute, commit, rollback) runs on the first connection,
+    so transactions and session settings work just like they do for
+    :class:`mygrations.drivers.mysqldb.mysqldb`.
+
+    `credentials` can be a dictionary with MySQLdb connection credentials, or any callable
+    that returns a new connection which implements the Python DB API spec v2.0.
+
+    :param credentials: The database credentials to connect with, or a connection factory
+    :param size: The number of connections in the pool
+    :type credentials: dict|mygrations.helpers.db_credentials|callable
+    :type size: int
+    """
+
+    def __init__(self, credentials, size=4):
+
+        if size < 1:
+            raise ValueError('The connection pool size must be at least 1')
+
+        if issubclass(type(credentials), dict):
+            connect = lambda: MySQLdb.connect(**credentials)
+        else:
+            connect = credentials
+
+        self.size = size
+        self.conn = connect()
+        self._cursor = None
+
+        # the first connection is shared with the pool, but only for reading:
+        # writes always go through it directly
+        self._pool = queue.Queue()
+        self._pool.put(self.conn)
+        for i in range(size - 1):
+            self._pool.put(connect())
+
+    def tables(self):
+        """ Returns the tables in the connected database
+
+        :returns: An ordered dict with table definitions by table name
+        :rtype: OrderedDict
+        """
+        conn = self._pool.get()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('SHOW TABLES')
+            table_names = [table_name for (table_name, ) in cursor]
+            cursor.close()
+        finally:
+            self._pool.put(conn)
+
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            create_tables = executor.map(self._show_create_table, table_names)
+
+            return OrderedDict(zip(table_names, create_tables))
+
+    def _show_create_table(self, table_name):
+        """ Runs SHOW CREATE TABLE for one table on a connection from the pool
+
+        :param table_name: The name of the table
+        :type table_name: string
+        :returns: The CREATE TABLE command for the table
+        :rtype: string
+        """
+        conn = self._pool.get()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('SHOW CREATE TABLE %s' % table_name)
+            if not cursor.rowcount:
+                raise ValueError("Failed to execute SHOW CREATE TABLE command on table %s" % table_name)
+
+            (tbl_name, create_table) = cursor.fetchone()
+            cursor.close()
+        finally:
+            self._pool.put(conn)
+
+        return create_table
+
+    def information_schema(self):
+        """ Returns the structure of every table in the connected database from information_schema
+
+        The same as :meth:`mygrations.drivers.mysqldb.mysqldb.information_schema`, except that
+        the queries run at the same time (as far as the pool size allows).
+
+        :returns: An ordered dict with lists of result tuples for 'tables', 'columns', 'indexes', and 'constraints'
+        :rtype: OrderedDict
+        """
+        names = list(self.information_schema_queries.keys())
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            results = executor.map(self._fetch_all, self.information_schema_queries.values())
+
+            return OrderedDict(zip(names, results))
+
+    def _fetch_all(self, query):
+        """ Runs a query on a connection from the pool and returns all of its results
+
+        :param query: The query to run
+        :type query: string
+        :returns: The result tuples
+        :rtype: list
+        """
+        conn = self._pool.get()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(query)
+            results = [row for row in cursor.fetchall()]
+            cursor.close()
+        finally:
+            self._pool.put(conn)
+
+        return results
+
+    def rows(self, table_name, batch_size=1000):
+        """ Returns the column names of the table and an iterator over its rows
+
+        The same as :meth:`mygrations.drivers.mysqldb.mysqldb.rows`, except that the query runs
+        on a connection borrowed from the pool.  The iterator is a
+        :class:`mygrations.drivers.mysqldb.pooled_rows`, which puts the connection back in the
+        pool once it is exhausted or closed, so callers must close it if they might stop early.
+        Iterators from different calls can be consumed at the same time (i.e. from different
+        threads), but at most `size` can be open at once: another call waits until a connection
+        is free.
+
+        :param table_name: The name of the table to read rows from
+        :param batch_size: The number of rows to fetch from the server at once
+        :type table_name: string
+        :type batch_size: int
+        :returns: A tuple with the column names and an iterator over the row tuples
+        :rtype: (tuple, mygrations.drivers.mysqldb.pooled_rows)
+        """
+        conn = self._pool.get()
+        try:
+            cursor = conn.cursor(MySQLdb.cursors.SSCursor)
+            cursor.execute('SELECT * FROM `%s`' % table_name)
+            column_names = tuple(description[0] for description in cursor.description)
+        except Exception:
+            self._pool.put(conn)
+            raise
+
+        return (column_names, pooled_rows(self._pool, conn, cursor, self._stream_rows(cursor, batch_size)))
@@ -0,0 +1,58 @@
+class pooled_rows(object):
+    """ rows = pooled_rows( pool, conn, cursor, rows )
+
+    An iterator over the rows of a query running on a connection borrowed from a pool
+
+    The connection goes back to the pool as soon as the rows run out, or when :meth:`close`
+    is called, whichever comes first.  Callers that might not get through all the rows (i.e.
+    because of an error part way through) must call close, or use this as a context manager.
+    Closing more than once is harmless.
+
+    :param pool: The pool to return the connection to
+    :param conn: The connection the query is running on
+    :param cursor: The cursor for the query
+    :param rows: The row tuples, as they come out of the cursor
+    :type pool: queue.Queue
+    :type cursor: MySQLdb.cursors.SSCursor
+    :type rows: iterator
+    """
+    def __init__(self, pool, conn, cursor, rows):
+
+        self._pool = pool
+        self._conn = conn
+        self._cursor = cursor
+        self._rows = rows
+
+    def __iter__(self):
+
+        return self
+
+    def __next__(self):
+
+        if self._conn is None:
+            raise StopIteration
+
+        try:
+            return next(self._rows)
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+
+        self.close()
+
+    def close(self):
+        """ Closes the cursor and puts the connection back in the pool, if that hasn't happened already """
+        if self._conn is None:
+            return
+
+        (conn, self._conn) = (self._conn, None)
+        try:
+            self._cursor.close()
+        finally:
+            self._pool.put(conn)
@@ -1,15 +1,48 @@
 import os
 import glob
+import time
 
+from concurrent.futures import ThreadPoolExecutor
 from ..file_reader.reader import reader as sql_reader
+from .information_schema import information_schema
 from mygrations.formats.mysql.definitions.database import database as database_definition
+from mygrations.formats.mysql.mygrations.operations.row_insert import row_insert
+from mygrations.formats.mysql.mygrations.operations.row_delete import row_delete
+from mygrations.formats.mysql.mygrations.operations.row_update import row_update
+from mygrations.formats.mysql.mygrations.operations.row_insert_batch import row_insert_batch
+from mygrations.formats.mysql.mygrations.operations.row_delete_batch import row_delete_batch
+from mygrations.formats.mysql.mygrations.operations.row_update_batch import row_update_batch
 class database(database_definition):
-    def __init__(self, conn):
+
+    # the different ways of loading the table structure
+    loaders = ['show_create', 'information_schema']
+
+    # operations which change rows (rather than structure), and so can be grouped into transactions
+    row_operations = (row_insert, row_delete, row_update, row_insert_batch, row_delete_batch, row_update_batch)
+
+    # table sizes, loaded by read_statistics
+    _statistics = None
+
+    def __init__(self, conn, loader='show_create'):
         """ Constructor.  Accepts a mygrations db wrapper
 
+        The table structure can be loaded in one of two ways:
+
+        ==================  ===================================================================
+        loader              method
+        ==================  ===================================================================
+        show_create         Runs SHOW CREATE TABLE for each table and parses the result
+        information_schema  Reads everything out of information_schema in a few bulk queries
+        ==================  ===================================================================
+
         :param conn: mygrations db wrapper
+        :param loader: How to load the table structure (show_create or information_schema)
         :type conn: mygrations.drivers.mysqldb.mysqldb
+        :type loader: string
         """
+        if loader not in self.loaders:
+            raise ValueError('Unknown loader %s: must be one of %s' % (loader, ', '.join(self.loaders)))
+
         self.conn = conn
         self._warnings = []
         self._errors = []
@@ -17,7 +50,10 @@ class database(database_definition):
         self._rows = []
 
         # _load_tables will get the party started
-        self._load_tables(self.conn)
+        if loader == 'information_schema':
+            self._load_tables_from_information_schema(self.conn)
+        else:
+            self._load_tables(self.conn)
 
     def _load_tables(self, conn):
         """ Reads a database from the MySQL connection.
@@ -57,7 +93,46 @@ class database(database_definition):
                 # I will sort out table records later
                 self._tables[table.name] = table
 
-    def read_rows(self, table):
+    def _load_tables_from_information_schema(self, conn):
+        """ Reads a database from the MySQL connection using bulk information_schema queries
+
+        Accepts a mygrations db wrapper
+
+        :param conn: mygrations db wrapper
+        :type conn: mygrations.drivers.mysqldb.mysqldb
+        """
+        results = conn.information_schema()
+        structure = information_schema(
+            results['tables'], results['columns'], results['indexes'], results['constraints']
+        )
+
+        self._errors.extend(structure.errors)
+        self._warnings.extend(structure.warnings)
+        self._tables.update(structure.tables)
+
+    @property
+    def statistics(self):
+        """ Public getter.  Returns the size of each table, or None if read_statistics hasn't been called
+
+        Each table has a dict with the (estimated) number of rows, the size of its data, and the
+        size of its indexes (in bytes) under 'rows', 'data_length', and 'index_length'
+
+        :returns: The statistics by table name
+        :rtype: dict|None
+        """
+        return self._statistics
+
+    def read_statistics(self):
+        """ Loads the size of every table from information_schema.TABLES (see statistics) """
+        self._statistics = {}
+        for (table_name, rows, data_length, index_length) in self.conn.table_statistics():
+            self._statistics[table_name] = {
+                'rows': int(rows or 0),
+                'data_length': int(data_length or 0),
+                'index_length': int(index_length or 0)
+            }
+
+    def read_rows(self, table, batch_size=1000):
         """ Extracts the rows for the table from the database and stores them in the table object
 
         This object connects to the actual database.  However, we only need to know
@@ -69,8 +144,13 @@ class database(database_definition):
         and when appropriate that will prompt a call to this method which will actually
         load the rows to see if anything has changed.
 
+        The rows are streamed out of the database batch_size rows at a time, and go straight
+        into the table object without any intermediate copies.
+
         :param table: The table to read rows for
+        :param batch_size: The number of rows to fetch from the database at once
         :type table: string|mygrations.formats.mysql.definitions.table
+        :type batch_size: int
         """
         if type(table) != str:
             table = table.name
@@ -78,9 +158,103 @@ class database(database_definition):
         if not table in self.tables:
             raise ValueError("Cannot read rows for table %s because that table is not found in the database object")
 
-        for row in self.conn.rows(table):
-            self.tables[table].add_raw_row(row)
+        # always closed, since a pooled driver lends out a connection until the rows are done with
+        (column_names, rows) = self.conn.rows(table, batch_size)
+        try:
+            self.tables[table].add_raw_rows(column_names, rows)
+        finally:
+            rows.close()
 
         # if the table is empty the system won't realize that we loaded rows for it
         # for bookeeping purposes, mark the table as read
         self.tables[table].mark_tracking_rows()
+
+    def read_many_rows(self, tables, batch_size=1000):
+        """ Reads the rows for several tables (see read_rows)
+
+        If the driver has a pool of connections (see :class:`mygrations.drivers.mysqldb.mysqldb_pool`)
+        then the tables are read at the same time, one per connection.  Every table only
+        gets rows from its own query, so the result is the same as reading them one by one.
+
+        :param tables: The tables to read rows for
+        :param batch_size: The number of rows to fetch from the database at once
+        :type tables: [string|mygrations.formats.mysql.definitions.table]
+        :type batch_size: int
+        """
+        table_names = [table if type(table) == str else table.name for table in tables]
+        for table_name in table_names:
+            if not table_name in self.tables:
+                raise ValueError(
+                    "Cannot read rows for table %s because that table is not found in the database object" %
+                    table_name
+                )
+
+        workers = min(getattr(self.conn, 'size', 1), len(table_names))
+        if workers < 2:
+            for table_name in table_names:
+                self.read_rows(table_name, batch_size)
+            return
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # list() so that any errors are raised here
+            list(executor.map(lambda table_name: self.read_rows(table_name, batch_size), table_names))
+
+    def apply_to_source(self, operation):
+        """ Applies an operation to the actual database
+
+        :param operation: The operation to apply
+        :type operation: mygrations.formats.mysql.mygration.operations.*
+        :returns: How long the operation took, in seconds
+        :rtype: float
+        """
+        return self.apply_operations([operation])[0][1]
+
+    def apply_operations(self, operations, transaction_size=1000):
+        """ Applies a list of operations to the actual database, in order
+
+        Operations are executed one after another over the same connection.  Operations that
+        change rows are grouped into transactions of (at most) transaction_size operations.
+        Structural operations can't be part of a transaction in MySQL (they commit implicitly),
+        so any open transaction is committed before a structural operation runs.
+
+        The operations should already be in the order they need to run in, which is the order
+        that :class:`mygrations.formats.mysql.mygrations.mygration` and
+        :class:`mygrations.formats.mysql.mygrations.row_mygration` return them in.  If an
+        operation fails then the open transaction is rolled back and the error is raised.
+
+        :param operations: The operations to apply
+        :param transaction_size: The maximum number of row operations per transaction
+        :type operations: [mygrations.formats.mysql.mygration.operations.*]
+        :type transaction_size: int
+        :returns: A list of (operation, seconds) tuples with the time each operation took
+        :rtype: [(mygrations.formats.mysql.mygration.operations.*, float)]
+        """
+        if transaction_size < 1:
+            raise ValueError('transaction_size must be at least 1')
+
+        timings = []
+        pending = 0
+        try:
+            for operation in operations:
+                is_row_operation = isinstance(operation, self.row_operations)
+                if pending and not is_row_operation:
+                    self.conn.commit()
+                    pending = 0
+
+                start = time.perf_counter()
+                self.conn.execute(str(operation))
+                if is_row_operation:
+                    pending += 1
+                    if pending >= transaction_size:
+                        self.conn.commit()
+                        pending = 0
+                timings.append((operation, time.perf_counter() - start))
+
+            if pending:
+                self.conn.commit()
+
+        except Exception:
+            self.conn.rollback()
+            raise
+
+        return timings
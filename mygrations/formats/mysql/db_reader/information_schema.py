@@ -0,0 +1,253 @@
+import re
+
+from collections import OrderedDict
+from mygrations.formats.mysql.definitions.table import table
+from mygrations.formats.mysql.definitions.column import column
+from mygrations.formats.mysql.definitions.index import index
+from mygrations.formats.mysql.definitions.constraint import constraint
+from mygrations.formats.mysql.definitions.option import option
+class information_schema(object):
+    """ structure = information_schema( tables, columns, indexes, constraints )
+
+    Builds table definitions straight out of information_schema result sets.
+
+    This is the counterpart to :meth:`mygrations.drivers.mysqldb.mysqldb.information_schema`.
+    Rather than asking MySQL for the CREATE TABLE command of every table and running it
+    back through the parser, the structure is read in bulk and the definitions are built
+    directly.  The result sets are lists of tuples with the following layout:
+
+    ===========  =====================================================================================
+    result       columns
+    ===========  =====================================================================================
+    tables       table name, engine, collation, character set, collation is default ('Yes'/'')
+    columns      table name, column name, default, is nullable ('YES'/'NO'), column type,
+                 character set, collation, collation is default ('Yes'/''), extra
+    indexes      table name, index name, non unique (0/1), column name
+    constraints  table name, constraint name, column name, foreign table, foreign column,
+                 on update, on delete
+    ===========  =====================================================================================
+
+    Columns and indexes must be in order (by ordinal position and sequence in index).
+
+    The goal is to end up with exactly the same definitions that the parser would return
+    for the output of SHOW CREATE TABLE, so that comparisons don't find differences that
+    aren't really there.  As a result, the character set and collation of a column are
+    only recorded when SHOW CREATE TABLE would show them, and the column attributes follow
+    the same conventions as the column parsers.
+
+    :param tables: The rows from information_schema.TABLES
+    :param columns: The rows from information_schema.COLUMNS
+    :param indexes: The rows from information_schema.STATISTICS
+    :param constraints: The rows from information_schema.KEY_COLUMN_USAGE
+    :type tables: [tuple]
+    :type columns: [tuple]
+    :type indexes: [tuple]
+    :type constraints: [tuple]
+    """
+
+    # i.e. int(10) unsigned, decimal(20,5), enum('a','b'), text
+    column_type_pattern = re.compile(r'^(\w+)(?:\((.*)\))?(.*)$', re.DOTALL)
+
+    # a single value inside of an enum/set definition
+    enum_value_pattern = re.compile(r"'((?:[^']|'')*)'")
+
+    def __init__(self, tables, columns, indexes, constraints):
+
+        self._tables = OrderedDict()
+        self._errors = []
+        self._warnings = []
+
+        # we need to know the table defaults to decide what SHOW CREATE TABLE would have shown
+        self._collations = {}
+        for (table_name, engine, collation, character_set, is_default) in tables:
+            self._tables[table_name] = self._build_table(table_name, engine, collation, character_set, is_default)
+            self._collations[table_name] = collation
+
+        for row in columns:
+            # views show up in information_schema.COLUMNS too
+            if row[0] not in self._tables:
+                continue
+            self._tables[row[0]].add_column(self._build_column(row))
+
+        self._add_indexes(indexes)
+        self._add_constraints(constraints)
+
+    @property
+    def tables(self):
+        """ Public getter.  Returns an ordered dictionary of table definitions by name
+
+        :returns: The tables
+        :rtype: OrderedDict
+        """
+        return self._tables
+
+    @property
+    def errors(self):
+        """ Public getter.  Returns a list of errors
+
+        :returns: A list of errors
+        :rtype: list
+        """
+        return self._errors
+
+    @property
+    def warnings(self):
+        """ Public getter.  Returns a list of warnings
+
+        :returns: A list of warnings
+        :rtype: list
+        """
+        return self._warnings
+
+    def _build_table(self, table_name, engine, collation, character_set, is_default):
+        """ Returns an (empty) table definition with the same options SHOW CREATE TABLE would show
+
+        :returns: The table definition
+        :rtype: mygrations.formats.mysql.definitions.table
+        """
+        new_table = table(table_name)
+
+        if engine:
+            new_table.options.append(option('ENGINE', engine))
+        if character_set:
+            new_table.options.append(option('DEFAULT CHARSET', character_set))
+        if collation and not self._is_default(is_default):
+            new_table.options.append(option('COLLATE', collation))
+
+        return new_table
+
+    def _build_column(self, row):
+        """ Returns a column definition for a row from information_schema.COLUMNS
+
+        :param row: The row from information_schema.COLUMNS
+        :type row: tuple
+        :returns: The column definition
+        :rtype: mygrations.formats.mysql.definitions.column
+        """
+        (table_name, name, default, is_nullable, column_type, character_set, collation, is_default, extra) = row
+
+        (data_type, length, modifiers) = self.column_type_pattern.match(column_type.strip()).groups()
+        modifiers = modifiers.lower().split()
+        unsigned = 'unsigned' in modifiers
+        auto_increment = 'auto_increment' in (extra or '').lower()
+        null = is_nullable.upper() == 'YES'
+        default = self._normalize_default(default)
+
+        # SHOW CREATE TABLE only mentions the character set when the collation differs from the
+        # table collation, and only mentions the collation if it isn't the default for its character set
+        if collation == self._collations[table_name]:
+            character_set = None
+        if self._is_default(is_default):
+            collation = None
+
+        # enum/set: the length is the list of allowed values
+        if data_type.lower() in ['enum', 'set']:
+            values = [value.replace("''", "'") for value in self.enum_value_pattern.findall(length or '')]
+            return column(name, values, null, data_type, default, None, character_set, collation, None)
+
+        # columns without a length are handled by the text parser, which keeps no default
+        if length is None:
+            return column(
+                name, '', null, data_type, None, True if unsigned else None, character_set or '', collation or '',
+                True if auto_increment else None
+            )
+
+        # decimal(20,5)
+        if ',' in length:
+            length = ','.join(part.strip() for part in length.split(','))
+            return column(name, length, null, data_type, default, unsigned, None, None, None)
+
+        # int(10) unsigned/auto_increment
+        if unsigned or auto_increment:
+            return column(name, length, null, data_type, default, unsigned, None, None, auto_increment)
+
+        # everything else with a length: varchar(255), int(10), etc...
+        return column(name, length, null, data_type, default, None, character_set, collation, None)
+
+    def _normalize_default(self, default):
+        """ Returns the default value of a column as the parser would have found it
+
+        MySQL returns the raw default, while MariaDB (10.2.7+) returns string defaults
+        quoted and a NULL default as the string NULL.
+
+        :param default: The COLUMN_DEFAULT from information_schema.COLUMNS
+        :type default: string|None
+        :returns: The default value
+        :rtype: string|None
+        """
+        if default is None:
+            return None
+
+        default = str(default)
+        if len(default) >= 2 and default[0] == "'" and default[-1] == "'":
+            return default[1:-1].replace("''", "'")
+
+        if default.upper() == 'NULL':
+            return None
+
+        return default
+
+    def _is_default(self, is_default):
+        """ Returns True/False to denote whether an IS_DEFAULT value from information_schema.COLLATIONS is set
+
+        :param is_default: The IS_DEFAULT value
+        :type is_default: string|None
+        :rtype: bool
+        """
+        return bool(is_default) and str(is_default).lower() == 'yes'
+
+    def _add_indexes(self, rows):
+        """ Groups the rows from information_schema.STATISTICS into indexes and adds them to their tables
+
+        MySQL keeps the primary key first, then unique keys, then everything else, which
+        is the order that SHOW CREATE TABLE lists them in.
+
+        :param rows: The rows from information_schema.STATISTICS
+        :type rows: [tuple]
+        """
+        grouped = OrderedDict()
+        for (table_name, index_name, non_unique, column_name) in rows:
+            if table_name not in self._tables:
+                continue
+
+            key = (table_name, index_name)
+            if key not in grouped:
+                grouped[key] = (int(non_unique), [])
+            grouped[key][1].append(column_name)
+
+        primaries = [key for key in grouped if key[1] == 'PRIMARY']
+        uniques = [key for key in grouped if key[1] != 'PRIMARY' and not grouped[key][0]]
+        others = [key for key in grouped if grouped[key][0]]
+        for (table_name, index_name) in primaries + uniques + others:
+            (non_unique, columns) = grouped[(table_name, index_name)]
+            if index_name == 'PRIMARY':
+                new_index = index('', columns, 'PRIMARY')
+            else:
+                new_index = index(index_name, columns, 'INDEX' if non_unique else 'UNIQUE')
+            self._tables[table_name].add_key(new_index)
+
+    def _add_constraints(self, rows):
+        """ Groups the rows from information_schema.KEY_COLUMN_USAGE into constraints and adds them to their tables
+
+        :param rows: The rows from information_schema.KEY_COLUMN_USAGE
+        :type rows: [tuple]
+        """
+        seen = {}
+        for (table_name, name, column_name, foreign_table, foreign_column, on_update, on_delete) in rows:
+            if table_name not in self._tables:
+                continue
+
+            # foreign keys are only supported on one column
+            if (table_name, name) in seen:
+                if not seen[(table_name, name)]:
+                    self._warnings.append(
+                        'Foreign key %s in table %s has more than one column: only the first is used' %
+                        (name, table_name)
+                    )
+                seen[(table_name, name)] = True
+                continue
+            seen[(table_name, name)] = False
+
+            self._tables[table_name].add_constraint(
+                constraint(name, column_name, foreign_table, foreign_column, on_delete.upper(), on_update.upper())
+            )
@@ -1,6 +1,8 @@
 from .constraint import constraint
 from .index import index
 from .column import column
+from .option import option
 from .table import table
+from .table_overlay import table_overlay
 
-__all__ = ['constraint', 'index', 'column', 'table']
+__all__ = ['constraint', 'index', 'column', 'option', 'table', 'table_overlay']
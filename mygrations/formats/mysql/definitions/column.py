@@ -1,12 +1,21 @@
-class column(object):
+from .definition import definition
+class column(definition):
+
+    __slots__ = (
+        '_name', '_length', '_null', '_column_type', '_default', '_unsigned', '_character_set', '_collate',
+        '_auto_increment', '_errors', '_warnings', '_sql'
+    )
 
     definition_type = 'column'
-    _unsigned = None
-    _character_set = None
-    _collate = None
-    _auto_increment = None
-    _errors = None
-    _warnings = None
+    _defaults = {
+        '_unsigned': None,
+        '_character_set': None,
+        '_collate': None,
+        '_auto_increment': None,
+        '_errors': None,
+        '_warnings': None,
+        '_sql': None
+    }
 
     def __init__(
         self,
@@ -20,15 +29,18 @@ class column(object):
         collate='',
         auto_increment=False
     ):
-        self._name = name
-        self._length = length
+        self._name = self._intern(name)
+        self._length = self._intern(length)
         self._null = null
-        self._column_type = column_type
-        self._default = default
+        self._column_type = self._intern(column_type)
+        self._default = self._intern(default)
         self._unsigned = unsigned
-        self._character_set = character_set
-        self._collate = collate
+        self._character_set = self._intern(character_set)
+        self._collate = self._intern(collate)
         self._auto_increment = auto_increment
+        self._errors = None
+        self._warnings = None
+        self._sql = None
 
     @property
     def name(self):
@@ -171,9 +183,66 @@ class column(object):
         """
         return [] if self._warnings is None else self._warnings
 
+    def as_record(self):
+        """ Returns a plain column record with the same definition
+
+        Used to swap out the parsers (which extend this class) once parsing is finished
+
+        :returns: The column record
+        :rtype: mygrations.formats.mysql.definitions.column
+        """
+        if type(self) == column:
+            return self
+
+        return column(
+            self.name, self._length, self.null, self._column_type, self.default, self.unsigned, self._character_set,
+            self._collate, self.auto_increment
+        )
+
+    @property
+    def fingerprint(self):
+        """ Public getter.  Returns a tuple that describes the column, for quick comparisons
+
+        If two columns have the same fingerprint then is_really_the_same_as will say they
+        are the same, so decimal defaults are rounded the same way.  Columns with different
+        fingerprints may still turn out to be the same (i.e. if only one of them lists its
+        character set).
+
+        :returns: The fingerprint
+        :rtype: tuple
+        """
+        default = self.default
+        if self.column_type == 'DECIMAL' and default is not None:
+            split = self.length.split(',')
+            if len(split) == 2:
+                ndecimals = int(split[1])
+                try:
+                    default = '%.*f' % (ndecimals, round(float(default), ndecimals))
+                except ValueError:
+                    pass
+
+        length = tuple(self.length) if type(self.length) == type([]) else self.length
+        return (
+            self.name, length, self.null, self.column_type, self.unsigned, default, self.character_set, self.collate,
+            self.auto_increment
+        )
+
     def __str__(self):
         """ Returns the MySQL command that would create the column
 
+        The command is built once and cached: a column record never changes (a changed
+        column is a new record), and table comparisons stringify the same columns over and over.
+
+        :returns: A partial MySQL command that could be used to generate the column
+        :rtype: string
+        """
+        if self._sql is None:
+            self._sql = self._render()
+        return self._sql
+
+    def _render(self):
+        """ Builds the MySQL command that would create the column
+
         i.e. column_name type(len) default ''
 
         :returns: A partial MySQL command that could be used to generate the column
@@ -0,0 +1,116 @@
+from collections import OrderedDict
+
+from .table import table
+from .column import column
+from .index import index
+from .constraint import constraint
+from .option import option
+def pack_table(source):
+    """ Returns the structure of a table as nested tuples of plain values
+
+    This is the compact form used to ship tables between processes (and to store them on
+    disk): it holds nothing but strings, booleans, and None, so it is much smaller and
+    faster to pickle than the table object, and it doesn't depend on the class that built
+    the table (i.e. a create_parser full of parser state).  Rows are not included.
+
+    The layout is:
+
+    (name, options, columns, indexes, constraints)
+
+    ===========  =======================================================================================
+    part         contents
+    ===========  =======================================================================================
+    options      (name, value) for each option
+    columns      (name, length, null, type, default, unsigned, character set, collate, auto increment)
+    indexes      (name, columns, index type)
+    constraints  (name, column, foreign table, foreign column, on delete, on update)
+    ===========  =======================================================================================
+
+    :param source: The table to pack
+    :type source: mygrations.formats.mysql.definitions.table
+    :returns: The packed table
+    :rtype: tuple
+    """
+    return (
+        source.name,
+        tuple((opt.name, opt.value) for opt in source.options),
+        tuple(
+            (
+                col.name, tuple(col.length) if type(col.length) == list else col.length, col.null, col._column_type,
+                col.default, col.unsigned, col._character_set, col._collate, col.auto_increment
+            ) for col in source.columns.values()
+        ),
+        tuple((key.name, tuple(key.columns), key.index_type) for key in source.indexes.values()),
+        tuple(
+            (fk.name, fk.column, fk.foreign_table, fk.foreign_column, fk.on_delete, fk.on_update)
+            for fk in source.constraints.values()
+        ),
+    )
+def unpack_table(packed):
+    """ Builds a table out of the output of pack_table
+
+    :param packed: The packed table
+    :type packed: tuple
+    :returns: The table
+    :rtype: mygrations.formats.mysql.definitions.table
+    """
+    (name, options, columns, indexes, constraints) = packed
+
+    new_table = table(name)
+    for (option_name, value) in options:
+        new_table.options.append(option(option_name, value))
+
+    for values in columns:
+        length = list(values[1]) if type(values[1]) == tuple else values[1]
+        new_table.add_column(column(values[0], length, *values[2:]))
+
+    for (key_name, key_columns, index_type) in indexes:
+        new_table.add_key(index(key_name, list(key_columns), index_type))
+
+    for values in constraints:
+        new_table.add_constraint(constraint(*values))
+
+    return new_table
+def pack_rows(source):
+    """ Returns the rows of a table in a compact form, or None if the table isn't tracking rows
+
+    Rows from *.sql files don't always have a value for every column, so every distinct
+    list of columns is stored once and each row refers to it by position.  The layout is:
+
+    (auto increment, column lists, rows)
+
+    where each row is (row id, column list position, values)
+
+    :param source: The table to pack rows for
+    :type source: mygrations.formats.mysql.definitions.table
+    :returns: The packed rows
+    :rtype: tuple|None
+    """
+    if not source.tracking_rows:
+        return None
+
+    layouts = {}
+    packed = []
+    for (row_id, row) in source.rows.items():
+        columns = tuple(row.keys())
+        if columns not in layouts:
+            layouts[columns] = len(layouts)
+        packed.append((row_id, layouts[columns], tuple(row.values())))
+
+    return (source.auto_increment, tuple(layouts), tuple(packed))
+def unpack_rows(target, packed):
+    """ Puts rows from the output of pack_rows back into a table
+
+    :param target: The table to add the rows to
+    :param packed: The packed rows (from pack_rows)
+    :type target: mygrations.formats.mysql.definitions.table
+    :type packed: tuple|None
+    """
+    if packed is None:
+        return
+
+    (auto_increment, layouts, rows) = packed
+    target.mark_tracking_rows()
+    for (row_id, layout, values) in rows:
+        target.rows[row_id] = OrderedDict(zip(layouts[layout], values))
+    target._auto_increment = auto_increment
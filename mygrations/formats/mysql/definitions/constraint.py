@@ -1,21 +1,33 @@
-class constraint(object):
-
-    _errors = None
-    _warnings = None
-    _name = ''
-    _column = ''
-    _foreign_table = ''
-    _foreign_column = ''
-    _on_delete = ''
-    _on_update = ''
+from .definition import definition
+class constraint(definition):
+
+    __slots__ = (
+        '_name', '_column', '_foreign_table', '_foreign_column', '_on_delete', '_on_update', '_errors', '_warnings',
+        '_sql'
+    )
+
+    _defaults = {
+        '_errors': None,
+        '_warnings': None,
+        '_name': '',
+        '_column': '',
+        '_foreign_table': '',
+        '_foreign_column': '',
+        '_on_delete': '',
+        '_on_update': '',
+        '_sql': None
+    }
 
     def __init__(self, name='', column='', foreign_table='', foreign_column='', on_delete='', on_update=''):
-        self._name = name
-        self._column = column
-        self._foreign_table = foreign_table
-        self._foreign_column = foreign_column
-        self._on_delete = on_delete
-        self._on_update = on_update
+        self._name = self._intern(name)
+        self._column = self._intern(column)
+        self._foreign_table = self._intern(foreign_table)
+        self._foreign_column = self._intern(foreign_column)
+        self._on_delete = self._intern(on_delete)
+        self._on_update = self._intern(on_update)
+        self._errors = None
+        self._warnings = None
+        self._sql = None
 
     @property
     def name(self):
@@ -77,6 +89,21 @@ class constraint(object):
 
         return self._on_update
 
+    def as_record(self):
+        """ Returns a plain constraint record with the same definition
+
+        Used to swap out the parsers (which extend this class) once parsing is finished
+
+        :returns: The constraint record
+        :rtype: mygrations.formats.mysql.definitions.constraint
+        """
+        if type(self) == constraint:
+            return self
+
+        return constraint(
+            self.name, self.column, self.foreign_table, self.foreign_column, self.on_delete, self.on_update
+        )
+
     @property
     def errors(self):
         """ Public getter.  Returns a list of parsing errors
@@ -98,6 +125,19 @@ class constraint(object):
     def __str__(self):
         """ Returns the MySQL command that would create the constraint
 
+        The command is built once and cached: a constraint record never changes (a changed
+        constraint is a new record).
+
+        :returns: A partial MySQL command that could be used to generate the foreign key
+        :rtype: string
+        """
+        if self._sql is None:
+            self._sql = self._render()
+        return self._sql
+
+    def _render(self):
+        """ Builds the MySQL command that would create the constraint
+
         i.e. CONSTRAINT `vendors_w9_fk` FOREIGN KEY (`w9_id`) REFERENCES `vendor_w9s` (`id`) ON UPDATE CASCADE
 
         :returns: A partial MySQL command that could be used to generate the foreign key
@@ -1,3 +1,6 @@
+import hashlib
+
+from collections import OrderedDict
 class database(object):
 
     _errors = None
@@ -6,6 +9,11 @@ class database(object):
     _rows = None
     _errors_1215 = None
 
+    # bookeeping for 1215 errors, built the first time errors_1215 is needed: see _index_1215_errors
+    _constraint_errors = None
+    _indexed_constraints = None
+    _references = None
+
     def __init__(self):
         self._warnings = []
         self._errors = []
@@ -22,6 +30,20 @@ class database(object):
         """
         return self._tables
 
+    @property
+    def fingerprint(self):
+        """ Public getter.  Returns a hash of the structure of every table in the database
+
+        Built out of the fingerprints of the tables (see
+        :attr:`mygrations.formats.mysql.definitions.table.fingerprint`), so it doesn't cover rows.
+        Two databases with the same fingerprint get the same structural migration plan.
+
+        :returns: The fingerprint
+        :rtype: string
+        """
+        structure = [(name, self._tables[name].fingerprint) for name in sorted(self._tables)]
+        return hashlib.sha1(repr(structure).encode('utf-8')).hexdigest()
+
     @property
     def errors(self):
         """ Public getter.  Returns a list of parsing errors
@@ -47,8 +69,11 @@ class database(object):
         :returns: A list of MySQL 1215 error messages
         :rtype: [string]
         """
+        if self._constraint_errors is None:
+            self._index_1215_errors()
+
         if self._errors_1215 is None:
-            self._errors_1215 = self._find_all_1215_errors()
+            self._errors_1215 = list(self._constraint_errors.values())
         return self._errors_1215
 
     def store_rows_with_tables(self):
@@ -93,23 +118,153 @@ class database(object):
 
         return unfulfilled
 
-    def _find_all_1215_errors(self):
-        """ Returns a list of any 1215 error messages for this database
-
-        :return: A list of 1215 error messages
-        :rtype: [string]
+    def _index_1215_errors(self):
+        """ Checks every constraint in the database for 1215 errors and builds the reverse foreign key index
+
+        After this, changes made through add_table, remove_table, and apply_operation
+        only re-check the constraints that the change could affect.  The bookeeping is:
+
+        ====================  ==============================================================
+        attribute             contents
+        ====================  ==============================================================
+        _constraint_errors    Ordered dict of 1215 errors by (table name, constraint name)
+        _indexed_constraints  For each table: the constraints that were indexed for it, by name,
+                              with (foreign table, foreign column) as the value
+        _references           For each table: a dict of column name to the set of
+                              (table name, constraint name) pairs that reference it
+        ====================  ==============================================================
         """
-        errors = []
+        self._constraint_errors = OrderedDict()
+        self._indexed_constraints = {}
+        self._references = {}
+        self._errors_1215 = None
+
         for table in self.tables.values():
-            if not table.constraints:
+            self._index_constraints(table)
+            self._check_constraints([(table.name, name) for name in table.constraints])
+
+    def _index_constraints(self, table):
+        """ Adds the constraints of a table to the reverse foreign key index
+
+        :param table: The table to index constraints for
+        :type table: mygrations.formats.mysql.definitions.table
+        """
+        indexed = {}
+        for constraint in table.constraints.values():
+            indexed[constraint.name] = (constraint.foreign_table, constraint.foreign_column)
+            self._references.setdefault(constraint.foreign_table, {}).setdefault(constraint.foreign_column,
+                                                                                 set()).add((table.name, constraint.name))
+
+        self._indexed_constraints[table.name] = indexed
+
+    def _unindex_constraints(self, table_name):
+        """ Removes the constraints of a table from the reverse foreign key index and forgets their errors
+
+        :param table_name: The name of the table to remove constraints for
+        :type table_name: string
+        """
+        for (constraint_name, (foreign_table, foreign_column)) in self._indexed_constraints.pop(table_name, {}).items():
+            self._references[foreign_table][foreign_column].discard((table_name, constraint_name))
+            if (table_name, constraint_name) in self._constraint_errors:
+                del self._constraint_errors[(table_name, constraint_name)]
+                self._errors_1215 = None
+
+    def _referencing_constraints(self, table_name, column_names=None):
+        """ Returns the constraints that reference a table (or some columns in the table)
+
+        :param table_name: The name of the referenced table
+        :param column_names: The referenced columns, or None for all columns
+        :type table_name: string
+        :type column_names: [string]|None
+        :returns: A list of (table name, constraint name) pairs
+        :rtype: [(string, string)]
+        """
+        references = self._references.get(table_name, {})
+        if column_names is None:
+            column_names = list(references.keys())
+
+        found = []
+        for column_name in column_names:
+            found.extend(references.get(column_name, []))
+
+        return found
+
+    def _check_constraints(self, keys):
+        """ Re-checks some constraints for 1215 errors and updates the list of errors
+
+        :param keys: The (table name, constraint name) pairs to check
+        :type keys: [(string, string)]
+        """
+        for key in keys:
+            (table_name, constraint_name) = key
+            error = None
+            if table_name in self._tables and constraint_name in self._tables[table_name].constraints:
+                table = self._tables[table_name]
+                error = self.find_1215_errors(table, table.constraints[constraint_name])
+
+            if error:
+                if self._constraint_errors.get(key) != error:
+                    self._constraint_errors[key] = error
+                    self._errors_1215 = None
+            elif key in self._constraint_errors:
+                del self._constraint_errors[key]
+                self._errors_1215 = None
+
+    def _refresh_1215_errors(self, table_name, column_names=None):
+        """ Re-checks everything that a change to a table could affect
+
+        That is all the constraints in the table itself, plus any constraints in other
+        tables that reference the changed columns.
+
+        :param table_name: The name of the table that changed
+        :param column_names: The columns that changed, or None if (potentially) all of them did
+        :type table_name: string
+        :type column_names: [string]|None
+        """
+        self._unindex_constraints(table_name)
+        keys = []
+        if table_name in self._tables:
+            table = self._tables[table_name]
+            self._index_constraints(table)
+            keys.extend([(table_name, name) for name in table.constraints])
+
+        keys.extend(self._referencing_constraints(table_name, column_names))
+        self._check_constraints(keys)
+
+    def _changed_columns(self, table, operation):
+        """ Returns the names of the columns whose definition or indexing might be changed by an operation
+
+        :param table: The table the operation is being applied to
+        :param operation: The operation
+        :type table: mygrations.formats.mysql.definitions.table
+        :type operation: mygrations.formats.mysql.mygration.operations.*
+        :returns: The column names, or None if it can't tell
+        :rtype: [string]|None
+        """
+        sub_operations = [sub_operation for sub_operation in operation] if hasattr(operation, '__iter__') else [operation]
+
+        columns = []
+        for sub_operation in sub_operations:
+            if hasattr(sub_operation, 'constraint'):
                 continue
 
-            for constraint in table.constraints.values():
-                error = self.find_1215_errors(table, constraint)
-                if error:
-                    errors.append(error)
+            if hasattr(sub_operation, 'column'):
+                column = sub_operation.column
+                columns.append(column if type(column) == str else column.name)
+
+            elif hasattr(sub_operation, 'key'):
+                # the key that is there now matters as much as the new one
+                key = sub_operation.key
+                key_name = key if type(key) == str else key.name
+                if key_name in table.indexes:
+                    columns.extend(table.indexes[key_name].columns)
+                if type(key) != str:
+                    columns.extend(key.columns)
 
-        return errors
+            else:
+                return None
+
+        return columns
 
     def find_1215_errors(self, table, constraint):
         """ Returns None or a string describing a 1215 error message found for the given table and constraint
@@ -192,8 +347,9 @@ class database(object):
         if table.name in self._tables:
             raise ValueError('Cannot add table %s to database because it already exists' % table.name)
 
-        self._errors_1215 = None
         self._tables[table.name] = table
+        if self._constraint_errors is not None:
+            self._refresh_1215_errors(table.name)
 
     def remove_table(self, table):
         """ Removes a table from the database
@@ -204,8 +360,9 @@ class database(object):
         if not table.name in self._tables:
             raise ValueError('Cannot remove table %s from database because it does not exist' % table.name)
 
-        self._errors_1215 = None
         self._tables.pop(table.name, None)
+        if self._constraint_errors is not None:
+            self._refresh_1215_errors(table.name)
 
     def apply_operation(self, table_name, operation):
         """ Updates the database object according to the operation
@@ -222,8 +379,12 @@ class database(object):
             raise ValueError('Cannot apply operation to table %s because that table does not exist' % table_name)
 
         # the table applies the operation
-        self._errors_1215 = None
-        self._tables[table_name].apply_operation(operation)
+        table = self._tables[table_name]
+        column_names = self._changed_columns(table, operation) if self._constraint_errors is not None else None
+        table.apply_operation(operation)
+
+        if self._constraint_errors is not None:
+            self._refresh_1215_errors(table_name, column_names)
 
     def apply_to_source(self, operation):
         """ Updates the actual source of the database object: usually the database or a .sql file
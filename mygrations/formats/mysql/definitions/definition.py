@@ -0,0 +1,44 @@
+import sys
+class definition(object):
+    """ Base class for the small definition records: columns, indexes, constraints, and table options
+
+    A schema can easily have hundreds of thousands of these alive at once, so they are
+    stored in __slots__ (no per-instance dict) and the strings that repeat all over a
+    schema (types, character sets, action names, common column names) are interned.
+    Records have no setters: they are changed by replacing them.
+
+    The file reader's parsers extend the definition classes, but they don't call their
+    constructors and often only fill in some of the attributes.  Any slot that was never
+    set falls back on the class level _defaults, which is how the old class attributes
+    used to behave.  Once a table is parsed, the parsers are swapped out for plain records
+    (see as_record).
+    """
+
+    __slots__ = ()
+
+    # fallback values for slots that were never set
+    _defaults = {}
+
+    def __getattr__(self, name):
+        """ Only called for attributes that can't be found, i.e. slots that were never set """
+        defaults = type(self)._defaults
+        if name in defaults:
+            return defaults[name]
+
+        raise AttributeError("'%s' object has no attribute '%s'" % (type(self).__name__, name))
+
+    def _intern(self, value):
+        """ Returns the interned version of a string (or a list of strings), or the value untouched
+
+        :param value: The value to intern
+        :type value: mixed
+        :returns: The (possibly interned) value
+        :rtype: mixed
+        """
+        if type(value) == str:
+            return sys.intern(value)
+
+        if type(value) == list:
+            return [sys.intern(item) if type(item) == str else item for item in value]
+
+        return value
@@ -1,10 +1,9 @@
-class index(object):
+from .definition import definition
+class index(definition):
 
-    _name = ''
-    _index_type = ''
-    _columns = None
-    _errors = None
-    _warnings = None
+    __slots__ = ('_name', '_index_type', '_columns', '_errors', '_warnings', '_sql')
+
+    _defaults = {'_name': '', '_index_type': '', '_columns': None, '_errors': None, '_warnings': None, '_sql': None}
 
     def __init__(self, name, columns, index_type='INDEX'):
         """ Index constructor
@@ -16,9 +15,12 @@ class index(object):
         :type columns: [string]
         :type index_type: string
         """
-        self._name = name
-        self._index_type = index_type
-        self._columns = columns
+        self._name = self._intern(name)
+        self._index_type = self._intern(index_type)
+        self._columns = self._intern(columns)
+        self._errors = None
+        self._warnings = None
+        self._sql = None
 
     @property
     def name(self):
@@ -51,6 +53,19 @@ class index(object):
 
         return self._columns
 
+    def as_record(self):
+        """ Returns a plain index record with the same definition
+
+        Used to swap out the parsers (which extend this class) once parsing is finished
+
+        :returns: The index record
+        :rtype: mygrations.formats.mysql.definitions.index
+        """
+        if type(self) == index:
+            return self
+
+        return index(self.name, self.columns, self.index_type)
+
     @property
     def errors(self):
         """ Public getter.  Returns a list of parsing errors
@@ -70,11 +85,24 @@ class index(object):
         return [] if self._warnings is None else self._warnings
 
     def __str__(self):
-        """ Returns the MySQL command that would create the column
+        """ Returns the MySQL command that would create the index
+
+        The command is built once and cached: an index record never changes (a changed
+        index is a new record).
+
+        :returns: A partial MySQL command that could be used to generate the index
+        :rtype: string
+        """
+        if self._sql is None:
+            self._sql = self._render()
+        return self._sql
+
+    def _render(self):
+        """ Builds the MySQL command that would create the index
 
-        i.e. column_name type(len) default ''
+        i.e. KEY `name` (`column1`,`column2`)
 
-        :returns: A partial MySQL command that could be used to generate the column
+        :returns: A partial MySQL command that could be used to generate the index
         :rtype: string
         """
         parts = []
@@ -0,0 +1,50 @@
+from .definition import definition
+class option(definition):
+
+    __slots__ = ('_name', '_value')
+
+    _defaults = {'_name': '', '_value': ''}
+
+    def __init__(self, name='', value=''):
+        """ Table option constructor
+
+        :param name: The name of the option (i.e. ENGINE)
+        :param value: The value of the option (i.e. InnoDB)
+        :type name: string
+        :type value: string
+        """
+        self._name = self._intern(name)
+        self._value = self._intern(value)
+
+    @property
+    def name(self):
+        """ Public getter.  Returns the name of the option.
+
+        :returns: The option name
+        :rtype: string
+        """
+
+        return self._name
+
+    @property
+    def value(self):
+        """ Public getter.  Returns the value of the option.
+
+        :returns: The option value
+        :rtype: string
+        """
+
+        return self._value
+
+    def as_record(self):
+        """ Returns a plain option record with the same name and value
+
+        Used to swap out the parsers (which extend this class) once parsing is finished
+
+        :returns: The option record
+        :rtype: mygrations.formats.mysql.definitions.option
+        """
+        if type(self) == option:
+            return self
+
+        return option(self.name, self.value)
@@ -0,0 +1,98 @@
+from collections import OrderedDict
+from collections.abc import MutableMapping
+class row_store(MutableMapping):
+    """ rows = row_store()
+
+    The rows of a table by id, kept as tuples of values.
+
+    A table read out of the database can have millions of rows, and an OrderedDict per row
+    costs several times more memory than the values in it.  Instead, every distinct list of
+    columns is stored once and each row is just a tuple of values.  Rows from the database
+    all have the same columns, so the only per-row overhead is the tuple itself.  Rows from
+    *.sql files don't always have a value for every column, so rows that don't use the first
+    list of columns remember which one they do use.
+
+    To the outside this is still a mapping of row id to row: reading a row returns an
+    OrderedDict of its values by column name, built on the fly, and setting a row takes any
+    mapping.  :meth:`add` skips the mapping entirely for rows coming out of a cursor.
+
+    :param rows: Rows to start with, as a mapping of row id to row
+    :type rows: dict
+    """
+    def __init__(self, rows=None):
+
+        # plain dicts keep their order too, and are quite a bit smaller than OrderedDicts
+        self._values = {}
+        self._layouts = []
+        self._layout_positions = {}
+        self._row_layouts = {}
+
+        if rows:
+            self.update(rows)
+
+    def add(self, row_id, columns, values):
+        """ Adds (or replaces) a row from its columns and values
+
+        :param row_id: The id of the row
+        :param columns: The names of the columns, in the same order as values
+        :param values: The values of the row
+        :type row_id: int
+        :type columns: tuple
+        :type values: tuple
+        """
+        layout = self._layout(columns)
+        self._values[row_id] = tuple(values)
+        if layout:
+            self._row_layouts[row_id] = layout
+        elif row_id in self._row_layouts:
+            del self._row_layouts[row_id]
+
+    def copy(self):
+        """ Returns a copy of the store, which shares the (immutable) rows but not the containers
+
+        :rtype: mygrations.formats.mysql.definitions.row_store
+        """
+        duplicate = row_store()
+        duplicate._values = dict(self._values)
+        duplicate._layouts = list(self._layouts)
+        duplicate._layout_positions = dict(self._layout_positions)
+        duplicate._row_layouts = dict(self._row_layouts)
+
+        return duplicate
+
+    def _layout(self, columns):
+        """ Returns the position of a list of columns in self._layouts, adding it if needed
+
+        :param columns: The column names
+        :type columns: tuple|list
+        :rtype: int
+        """
+        columns = tuple(columns)
+        if columns not in self._layout_positions:
+            self._layout_positions[columns] = len(self._layouts)
+            self._layouts.append(columns)
+
+        return self._layout_positions[columns]
+
+    def __getitem__(self, row_id):
+        values = self._values[row_id]
+        return OrderedDict(zip(self._layouts[self._row_layouts.get(row_id, 0)], values))
+
+    def __setitem__(self, row_id, row):
+        self.add(row_id, row.keys(), row.values())
+
+    def __delitem__(self, row_id):
+        del self._values[row_id]
+        self._row_layouts.pop(row_id, None)
+
+    def __contains__(self, row_id):
+        return row_id in self._values
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __repr__(self):
+        return 'row_store(%r)' % dict(self.items())
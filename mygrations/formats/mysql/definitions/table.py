@@ -1,5 +1,8 @@
+import hashlib
+
 from collections import OrderedDict
 from .rows import rows as rows_definition
+from .row_store import row_store
 
 from ..mygrations.operations.alter_table import alter_table
 from ..mygrations.operations.add_column import add_column
@@ -29,6 +32,13 @@ class table(object):
     _auto_increment = 1
     _indexed_columns = None
     _tracking_rows = False
+    _fingerprint = None
+
+    # the column position index: see _link_columns
+    _column_links = None
+    _first_column = None
+    _last_column = None
+    _columns_out_of_order = False
 
     def __init__(self, name):
         self._name = name
@@ -71,7 +81,7 @@ class table(object):
         """
         self._tracking_rows = True
         if self._rows is None:
-            self._rows = OrderedDict()
+            self._rows = row_store()
 
     @property
     def tracking_rows(self):
@@ -105,6 +115,8 @@ class table(object):
         :returns: Table columns
         :rtype: OrderedDict
         """
+        if self._columns_out_of_order:
+            self._reorder_columns()
 
         return self._columns
 
@@ -165,12 +177,39 @@ class table(object):
         """
         return self._auto_increment
 
+    @property
+    def fingerprint(self):
+        """ Public getter.  Returns a hash of the structure of the table
+
+        The fingerprint covers the columns (see :attr:`mygrations.formats.mysql.definitions.column.fingerprint`),
+        indexes, constraints, and options of the table, but not its rows.  If two tables have the same
+        fingerprint then :meth:`to` will not find any differences between them, so the comparison can be
+        skipped.  It is calculated the first time it is needed and thrown out whenever the table changes.
+
+        :returns: The fingerprint
+        :rtype: string
+        """
+        if self._fingerprint is None:
+            structure = (
+                self.name,
+                [column.fingerprint for column in self.columns.values()],
+                [str(index) for index in self.indexes.values()],
+                [str(constraint) for constraint in self.constraints.values()],
+                [(option.name, option.value) for option in self.options],
+            )
+            self._fingerprint = hashlib.sha1(repr(structure).encode('utf-8')).hexdigest()
+
+        return self._fingerprint
+
     @property
     def rows(self):
-        """ Public getter.  Returns an ordered dictionary with row data by id
+        """ Public getter.  Returns the row data by id
 
-        :returns: An ordered dictionary with row data by id
-        :rtype: OrderedDict
+        Each row comes back as an ordered dictionary, but is stored as a tuple: see
+        :class:`mygrations.formats.mysql.definitions.row_store`
+
+        :returns: A mapping of row data by id
+        :rtype: mygrations.formats.mysql.definitions.row_store
         """
         return [] if self._rows is None else self._rows
 
@@ -201,12 +240,12 @@ class table(object):
 
         self._tracking_rows = True
         if self._rows is None:
-            self._rows = OrderedDict()
+            self._rows = row_store()
 
         # the rows object may have a list of columns.  If not use our own list of columns
         # remember that self._columns is an OrderedDict so converting its keys to a list
         # actually preserves the order (which is a requirement for us)
-        columns = rows.columns if rows.num_explicit_columns else list(self._columns.keys())
+        columns = rows.columns if rows.num_explicit_columns else list(self.columns.keys())
 
         for values in rows.raw_rows:
             # rows without explicit columns must be checked for matching columns
@@ -228,7 +267,7 @@ class table(object):
             if not row_id:
                 return 'Invalid row id of %s found for table %s' % (row_id, self.name)
 
-            self._rows[row_id] = OrderedDict(zip(columns, values))
+            self._rows.add(row_id, columns, values)
 
         return True
 
@@ -246,7 +285,7 @@ class table(object):
         """
         self._tracking_rows = True
         if self._rows is None:
-            self._rows = OrderedDict()
+            self._rows = row_store()
 
         row_id = row['id'] if 'id' in row else self._auto_increment
         self._auto_increment = max(self._auto_increment, row_id + 1)
@@ -255,7 +294,7 @@ class table(object):
 
         # make sure we have a value for every column in the row, and build an OrderedDict
         converted_row = OrderedDict()
-        for column in self._columns.keys():
+        for column in self.columns.keys():
             if column in row:
                 converted_row[column] = row[column]
             else:
@@ -263,6 +302,46 @@ class table(object):
 
         self._rows[row_id] = converted_row
 
+    def add_raw_rows(self, column_names, rows):
+        """ Adds rows into the table from tuples of values
+
+        This is the bulk version of self.add_raw_row, for rows coming straight out of a
+        database cursor.  rows can be any iterable (including a generator streaming rows
+        out of the database) and is consumed one row at a time.
+
+        :param column_names: The names of the columns, in the same order as the values in each row
+        :param rows: The rows to add
+        :type column_names: [string]
+        :type rows: iterable of tuples
+        :returns: A list of error strings for any rows that could not be added
+        :rtype: [string]
+        """
+        self._tracking_rows = True
+        if self._rows is None:
+            self._rows = row_store()
+
+        # figure out where each of our columns lives in the row once, instead of once per row
+        positions = {column_name: position for (position, column_name) in enumerate(column_names)}
+        id_position = positions.get('id')
+        columns = tuple(self.columns.keys())
+        lookups = [(positions.get(column), self._columns[column].default) for column in columns]
+
+        errors = []
+        for row in rows:
+            row_id = row[id_position] if id_position is not None else self._auto_increment
+            self._auto_increment = max(self._auto_increment, row_id + 1)
+            if row_id in self._rows:
+                errors.append(
+                    'Duplicate row id found for table %s and row %s' % (self._name, dict(zip(column_names, row)))
+                )
+                continue
+
+            self._rows.add(
+                row_id, columns, [default if position is None else row[position] for (position, default) in lookups]
+            )
+
+        return errors
+
     def column_before(self, column_name):
         """ Returns the name of the column that comes before a given row.
 
@@ -273,20 +352,90 @@ class table(object):
         :returns: The name of the column before the given column, or True if at the beginning
         :rtype: string|True
         """
-        # this works because we used an OrderedDict
-        columns = [col for col in self.columns.keys()]
-
-        if not column_name in columns:
+        if not column_name in self._columns:
             raise ValueError(
                 "Cannot return column before %s because %s does not exist in table %s" %
                 (column_name, column_name, self.name)
             )
 
-        index = columns.index(column_name)
-        if index == 0:
-            return True
+        self._link_columns()
+        previous = self._column_links[column_name][0]
+        return True if previous is None else previous
+
+    def _link_columns(self):
+        """ Builds the column position index, if it hasn't been built yet
+
+        The index is a doubly linked list of column names: self._column_links has
+        [previous name, next name] for every column (None at the ends), plus the names of the
+        first and last columns.  It makes column_before and adding a column after another
+        column constant time.  Once built, it is kept up to date by add_column and
+        remove_column.  Adding a column in the middle of the table leaves self._columns out of
+        order (the new column is at the end) until the next time the columns property is read.
+        """
+        if self._column_links is not None:
+            return
+
+        links = {}
+        previous = None
+        for column_name in self.columns:
+            links[column_name] = [previous, None]
+            if previous is not None:
+                links[previous][1] = column_name
+            previous = column_name
+
+        self._column_links = links
+        self._first_column = next(iter(self._columns), None)
+        self._last_column = previous
+
+    def _link_column(self, column_name, previous):
+        """ Adds a column to the position index after the column named previous
+
+        :param column_name: The name of the column being added
+        :param previous: The name of the column before it, or None to put it first
+        :type column_name: string
+        :type previous: string|None
+        """
+        following = self._first_column if previous is None else self._column_links[previous][1]
+        self._column_links[column_name] = [previous, following]
+
+        if previous is None:
+            self._first_column = column_name
+        else:
+            self._column_links[previous][1] = column_name
+
+        if following is None:
+            self._last_column = column_name
+        else:
+            self._column_links[following][0] = column_name
+
+    def _unlink_column(self, column_name):
+        """ Removes a column from the position index
+
+        :param column_name: The name of the column being removed
+        :type column_name: string
+        """
+        (previous, following) = self._column_links.pop(column_name)
+
+        if previous is None:
+            self._first_column = following
+        else:
+            self._column_links[previous][1] = following
+
+        if following is None:
+            self._last_column = previous
+        else:
+            self._column_links[following][0] = previous
+
+    def _reorder_columns(self):
+        """ Puts self._columns back in order by walking the column position index """
+        columns = OrderedDict()
+        column_name = self._first_column
+        while column_name is not None:
+            columns[column_name] = self._columns[column_name]
+            column_name = self._column_links[column_name][1]
 
-        return columns[index - 1]
+        self._columns = columns
+        self._columns_out_of_order = False
 
     def __str__(self):
         return str(self.create())
@@ -426,34 +575,108 @@ class table(object):
         :returns: A list of operations to apply to table
         :rtype: list[mygrations.formats.mysql.mygrations.operations.*]
         """
+        return list(self.row_operations(from_table))
+
+    def row_operations(self, from_table=None):
+        """ Generates the operations which can bring the rows of this table in line with the other, one at a time
+
+        This is the same as to_rows(), except that operations are built as they are needed.
+        For a large table that means the list of operations never has to be held in memory.
+
+        :param from_table: A table to find differences with (or None)
+        :type from_table: mygrations.formats.mysql.definitions.table
+        :returns: A generator of operations to apply to table
+        :rtype: generator[mygrations.formats.mysql.mygrations.operations.*]
+        """
         if from_table and not from_table.tracking_rows:
             raise ValueError(
                 "Refusing to compare rows for table %s that is not tracking rows.  Technically I can, but this is probably a sign that you are doing something wrong"
                 % (self.name)
             )
 
-        (inserted_ids, deleted_ids, updated_ids) = self._differences(from_table.rows if from_table else {}, self.rows)
+        to_rows = self.rows
+        from_rows = from_table.rows if from_table else {}
+
+        # merge-join the two sides in id order.  Sorting is cheap compared to the comparisons,
+        # (especially since rows usually come in id order already) and every id is visited once
+        to_ids = sorted(to_rows, key=self._row_id_sort_key)
+        from_ids = sorted(from_rows, key=self._row_id_sort_key)
+        (inserted_ids, deleted_ids, updated_ids) = ([], [], [])
+        (to_index, from_index) = (0, 0)
+        while to_index < len(to_ids) and from_index < len(from_ids):
+            to_key = self._row_id_sort_key(to_ids[to_index])
+            from_key = self._row_id_sort_key(from_ids[from_index])
+
+            if to_key < from_key:
+                inserted_ids.append(to_ids[to_index])
+                to_index += 1
+            elif to_key > from_key:
+                deleted_ids.append(from_ids[from_index])
+                from_index += 1
+            else:
+                if self._rows_differ(to_rows[to_ids[to_index]], from_rows[from_ids[from_index]]):
+                    updated_ids.append(to_ids[to_index])
+                to_index += 1
+                from_index += 1
+
+        inserted_ids.extend(to_ids[to_index:])
+        deleted_ids.extend(from_ids[from_index:])
 
-        operations = []
         for row_id in inserted_ids:
-            operations.append(row_insert(self.name, self.rows[row_id]))
+            yield row_insert(self.name, to_rows[row_id])
 
         for row_id in deleted_ids:
-            operations.append(row_delete(self.name, row_id))
+            yield row_delete(self.name, row_id)
 
         for row_id in updated_ids:
-            # try to be smart and not update if we don't have to
-            (inserted_cols, deleted_cols, updated_cols) = self._differences(self.rows[row_id], from_table.rows[row_id])
-            differences = False
-            for col in updated_cols:
-                if not self._loose_equal(self.rows[row_id][col], from_table.rows[row_id][col]):
-                    differences = True
-                    break
+            yield row_update(self.name, to_rows[row_id])
 
-            if differences:
-                operations.append(row_update(self.name, self.rows[row_id]))
+    def _row_id_sort_key(self, row_id):
+        """ Returns a key for sorting row ids which won't choke if the ids have different types
 
-        return operations
+        :param row_id: The row id
+        :type row_id: int|string
+        :returns: A sort key
+        :rtype: tuple
+        """
+        return (type(row_id).__name__, row_id)
+
+    def _row_fingerprint(self, row):
+        """ Returns a fingerprint for a row which can be used to quickly check if two rows are the same
+
+        Values are converted to strings, so that rows from a file (where everything is a string)
+        can match rows from the database.  If two rows have the same fingerprint then they
+        are also the same according to self._loose_equal.
+
+        :param row: The row
+        :type row: OrderedDict
+        :returns: The fingerprint of the row
+        :rtype: tuple
+        """
+        return (tuple(row.keys()), tuple(str(value) for value in row.values()))
+
+    def _rows_differ(self, to_row, from_row):
+        """ Returns True/False to denote whether or not two versions of a row need an update
+
+        Most rows don't change, so a cheap fingerprint comparison takes care of the vast
+        majority of rows.  Otherwise the columns the rows have in common are compared
+        one at a time.
+
+        :param to_row: The row we want to end up with
+        :param from_row: The row we have now
+        :type to_row: OrderedDict
+        :type from_row: OrderedDict
+        :returns: Whether or not the rows are different
+        :rtype: bool
+        """
+        if self._row_fingerprint(to_row) == self._row_fingerprint(from_row):
+            return False
+
+        for (column, value) in to_row.items():
+            if column in from_row and not self._loose_equal(value, from_row[column]):
+                return True
+
+        return False
 
     def column_is_indexed(self, column):
         """ Returns True/False to denote whether or not the column has a useable index
@@ -507,35 +730,40 @@ class table(object):
         :type column: mygrations.formats.mysql.definitions.column
         :type position: See mygrations.formats.mysql.mygration.operations.add_column
         """
-        # putting it at the end is easy
+        self._fingerprint = None
+
         if column.name in self._columns:
             raise ValueError("Cannot add column %s because %s already exists" % (column.name, column.name))
 
+        # putting it at the end is easy
         if not position:
+            if self._column_links is not None:
+                self._link_column(column.name, self._last_column)
             self._columns[column.name] = column
             return True
 
-        # end is also easy
+        # the beginning is also easy
         if position == True:
-            self._columns[column.name] = column
-            self._columns.move_to_end(column.name, last=False)
+            if self._column_links is not None:
+                self._link_column(column.name, None)
+            if self._columns_out_of_order:
+                self._columns[column.name] = column
+            else:
+                self._columns[column.name] = column
+                self._columns.move_to_end(column.name, last=False)
             return True
 
-        # now it is tricky
-        found = False
-        new_columns = OrderedDict()
-        for key, value in self._columns.items():
-            new_columns[key] = value
-            if key == position:
-                new_columns[column.name] = column
-                found = True
-
-        if not found:
+        # after another column: the position index knows where that is, and the
+        # OrderedDict gets put back in order the next time someone asks for it
+        if not position in self._columns:
             raise ValueError(
                 "Cannot add column %s after %s because %s does not exist" % (column.name, position, position)
             )
 
-        self._columns = new_columns
+        self._link_columns()
+        self._columns[column.name] = column
+        self._columns_out_of_order = self._columns_out_of_order or position != self._last_column
+        self._link_column(column.name, position)
         return True
 
     def remove_column(self, column_name):
@@ -544,6 +772,8 @@ class table(object):
         :param column_name: The column to remove
         :type column_name: string|mygrations.formats.mysql.definitions.column
         """
+        self._fingerprint = None
+
         if type(column_name) != str:
             column_name = column_name.name
 
@@ -551,6 +781,8 @@ class table(object):
             raise ValueError("Cannot remove column %s because column %s does not exist" % (column_name, column_name))
 
         self._columns.pop(column_name, None)
+        if self._column_links is not None:
+            self._unlink_column(column_name)
 
     def change_column(self, new_column):
         """ Changes a column
@@ -560,6 +792,8 @@ class table(object):
         :param new_column: The new column definition
         :type new_column: mygrations.formats.mysql.definitions.column
         """
+        self._fingerprint = None
+
         if not new_column.name in self._columns:
             raise ValueError(
                 "Cannot modify column %s because column %s does not exist" % (new_column.name, new_column.name)
@@ -572,10 +806,15 @@ class table(object):
         :param key: The key to add
         :type key: mygrations.formats.mysql.definitions.key
         """
+        self._fingerprint = None
+
         if key.name in self._indexes:
             raise ValueError("Cannot add key %s because key %s already exists" % (key.name, key.name))
         self._indexes[key.name] = key
 
+        if key.index_type == 'PRIMARY':
+            self._primary = key
+
         if self._indexed_columns is not None:
             self._indexed_columns.add(key.columns[0])
 
@@ -585,6 +824,8 @@ class table(object):
         :param key: The key to remove
         :type key: string|mygrations.formats.mysql.definitions.key
         """
+        self._fingerprint = None
+
         if type(key) != str:
             key = key.name
 
@@ -592,6 +833,8 @@ class table(object):
             raise ValueError("Cannot remove key %s because key %s does not exist" % (key, key))
 
         indexed_column = self._indexes[key].columns[0]
+        if self._indexes[key] is self._primary:
+            self._primary = ''
         self._indexes.pop(key, None)
 
         if self._indexed_columns is not None:
@@ -605,12 +848,16 @@ class table(object):
         :param new_key: The new key definition
         :type new_key: mygrations.formats.mysql.definitions.key
         """
+        self._fingerprint = None
+
         if not new_key.name in self._indexes:
             raise ValueError("Cannot modify key %s because key %s does not exist" % (new_key.name, new_key.name))
 
         if self._indexed_columns is not None:
             self._indexed_columns.discard(self._indexes[new_key.name].columns[0])
 
+        if self._indexes[new_key.name] is self._primary or new_key.index_type == 'PRIMARY':
+            self._primary = new_key if new_key.index_type == 'PRIMARY' else ''
         self._indexes[new_key.name] = new_key
 
         if self._indexed_columns is not None:
@@ -622,6 +869,8 @@ class table(object):
         :param constraint: The constraint to add
         :type constraint: mygrations.formats.mysql.definitions.constraint
         """
+        self._fingerprint = None
+
         if constraint.name in self._constraints:
             raise ValueError(
                 "Cannot add constraint %s because constraint %s already exists" % (constraint.name, constraint.name)
@@ -634,6 +883,8 @@ class table(object):
         :param constraint: The constraint to remove
         :type constraint: string|mygrations.formats.mysql.definitions.constraint
         """
+        self._fingerprint = None
+
         if type(constraint) != str:
             constraint = constraint.name
 
@@ -651,6 +902,8 @@ class table(object):
         :param new_constraint: The new constraint definition
         :type new_constraint: mygrations.formats.mysql.definitions.constraint
         """
+        self._fingerprint = None
+
         if not new_constraint.name in self._constraints:
             raise ValueError(
                 "Cannot modify constraint %s because constraint %s does not exist" %
@@ -0,0 +1,108 @@
+from .table import table
+class table_overlay(table):
+    """ overlay = table_overlay( source )
+
+    A copy-on-write view of a table definition.
+
+    The planner often needs a copy of a table that it can change without changing the
+    original: to strip foreign keys out of a CREATE TABLE, or to simulate a migration.
+    copy.deepcopy() copies every column, index, and constraint (which are parser objects
+    with plenty of their own state), even though a migration only ever replaces them.
+    The overlay instead shares the columns, indexes, constraints, and rows of the source
+    table, and only copies a container (not the definitions in it) the first time that
+    container is changed.  The source table is never modified.
+
+    The definitions themselves are shared, so they must be replaced (i.e. with
+    change_column) rather than modified in place.  All the table methods already work
+    this way.
+
+    :param source: The table to overlay
+    :type source: mygrations.formats.mysql.definitions.table
+    """
+
+    def __init__(self, source):
+
+        self._name = source.name
+        self._options = source.options
+        self._columns = source.columns
+        self._indexes = source.indexes
+        self._constraints = source.constraints
+        self._primary = source.primary
+        self._rows = source._rows
+        self._tracking_rows = source.tracking_rows
+        self._auto_increment = source.auto_increment
+        self._errors = source.errors
+        self._warnings = source.warnings
+        self._fingerprint = source._fingerprint
+        self._owned = set()
+
+    @property
+    def owned(self):
+        """ Public getter.  Returns the names of the containers that have been copied from the source table
+
+        :returns: A subset of columns, indexes, constraints, and rows
+        :rtype: set
+        """
+        return set(name[1:] for name in self._owned)
+
+    def _writable(self, attribute):
+        """ Copies a container from the source table before it is changed for the first time
+
+        :param attribute: The attribute holding the container: _columns, _indexes, _constraints, or _rows
+        :type attribute: string
+        """
+        if attribute in self._owned:
+            return
+
+        current = getattr(self, attribute)
+        if current is not None:
+            setattr(self, attribute, current.copy())
+        self._owned.add(attribute)
+
+    def add_rows(self, rows):
+        self._writable('_rows')
+        return super().add_rows(rows)
+
+    def add_raw_row(self, row):
+        self._writable('_rows')
+        return super().add_raw_row(row)
+
+    def add_raw_rows(self, column_names, rows):
+        self._writable('_rows')
+        return super().add_raw_rows(column_names, rows)
+
+    def add_column(self, column, position=False):
+        self._writable('_columns')
+        return super().add_column(column, position)
+
+    def remove_column(self, column_name):
+        self._writable('_columns')
+        return super().remove_column(column_name)
+
+    def change_column(self, new_column):
+        self._writable('_columns')
+        return super().change_column(new_column)
+
+    def add_key(self, key):
+        self._writable('_indexes')
+        return super().add_key(key)
+
+    def remove_key(self, key):
+        self._writable('_indexes')
+        return super().remove_key(key)
+
+    def change_key(self, new_key):
+        self._writable('_indexes')
+        return super().change_key(new_key)
+
+    def add_constraint(self, constraint):
+        self._writable('_constraints')
+        return super().add_constraint(constraint)
+
+    def remove_constraint(self, constraint):
+        self._writable('_constraints')
+        return super().remove_constraint(constraint)
+
+    def change_constraint(self, new_constraint):
+        self._writable('_constraints')
+        return super().change_constraint(new_constraint)
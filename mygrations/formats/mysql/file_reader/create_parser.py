@@ -40,7 +40,9 @@ class create_parser(parser, table):
                  'classes': [
                      index_primary, index_key, index_unique, constraint_foreign, type_character, type_numeric,
                      type_decimal, type_text, type_enum, type_plain
-                 ]
+                 ],
+                 'dispatch':
+                 definition_key
              }, {
                  'type': 'literal',
                  'value': ')'
@@ -60,7 +62,6 @@ class create_parser(parser, table):
 
         self.semicolon = True if 'closing_semicolon' in self._values else False
         self._name = self._values['name'].strip('`')
-        self._definitions = self._values['definitions']
         self._options = self._values['table_options'] if 'table_options' in self._values else []
         self._columns = OrderedDict()
         self._indexes = OrderedDict()
@@ -70,9 +71,14 @@ class create_parser(parser, table):
         self._primary = ''
 
         # ignore the AUTO_INCREMENT option: there is no reason for us to ever manage that
-        self._options = [opt for opt in self._options if opt.name != 'AUTO_INCREMENT']
+        self._options = [opt.as_record() for opt in self._options if opt.name != 'AUTO_INCREMENT']
+
+        # the parsers carry all their parsing state with them, so we keep plain records instead
+        self._definitions = []
+        for parsed in self._values['definitions']:
+            definition = parsed.as_record()
+            self._definitions.append(definition)
 
-        for definition in self._definitions:
             if isinstance(definition, column):
                 self._columns[definition.name] = definition
             elif isinstance(definition, index):
@@ -86,13 +92,15 @@ class create_parser(parser, table):
             elif isinstance(definition, constraint):
                 self._constraints[definition.name] = definition
 
-            if definition.errors:
-                for error in definition.errors:
-                    self._errors.append('%s in table %s' % (error, self._name))
+            for error in parsed.errors:
+                self._errors.append('%s in table %s' % (error, self._name))
+
+            for warning in parsed.warnings:
+                self._warnings.append('%s in table %s' % (warning, self._name))
 
-            if definition.warnings:
-                for warning in definition.warnings:
-                    self._warnings.append('%s in table %s' % (warning, self._name))
+        self._values['definitions'] = self._definitions
+        if 'table_options' in self._values:
+            self._values['table_options'] = self._options
 
         if not self._name:
             self._errors.append('Table name is required')
@@ -1,10 +1,46 @@
 import os
 import glob
 
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+
 from .reader import reader as sql_reader
+from .parse_cache import parse_cache
 from mygrations.formats.mysql.definitions.database import database as database_definition
+def parse_sql(contents, cache=None):
+    """ Parses a file or string of SQL and returns the reader
+
+    Lives at the module level so that it can be handed off to worker processes.
+    If a cache is provided then files are loaded from the cache when their
+    contents haven't changed, and stored in the cache after parsing otherwise.
+
+    :param contents: A string containing a filename or SQL
+    :param cache: The parse cache to use, if any
+    :type contents: string
+    :type cache: mygrations.formats.mysql.file_reader.parse_cache
+    :returns: The reader that parsed the SQL
+    :rtype: mygrations.formats.mysql.file_reader.reader
+    """
+    content_hash = None
+    if cache is not None and os.path.isfile(contents):
+        content_hash = cache.hash_file(contents)
+        reader = cache.get(contents, content_hash)
+        if reader is not None:
+            return reader
+
+    try:
+        reader = sql_reader()
+        reader.parse(contents)
+
+        if content_hash is not None:
+            cache.store(contents, content_hash, reader)
+
+    except ValueError as e:
+        print("Error in file %s: %s" % (contents, e))
+
+    return reader
 class database(database_definition):
-    def __init__(self, strings):
+    def __init__(self, strings, jobs=1, cache_directory=None):
         """ Constructor.  Accepts a string or list of strings with different possible contents
 
         Strings can be one of the following:
@@ -18,10 +54,24 @@ class database(database_definition):
         list                A list of strings, with each element corresponding to any of the above
         ==================  ====================
 
+        Files in a directory are always processed in filename order.  If jobs is more than one
+        then the files in a directory are parsed in parallel by that many worker processes,
+        and the results are merged back together in the same (filename) order.
+
+        If a cache directory is given then parsed files are cached there, and files whose
+        contents haven't changed since the last run are loaded from the cache instead of
+        being parsed again.
+
         :param strings: A string or list of strings corresponding to one of the allowed input types
+        :param jobs: The number of processes to parse directories with
+        :param cache_directory: The directory to cache parsed files in
         :type strings: string|list
+        :type jobs: int
+        :type cache_directory: string
         """
 
+        self._jobs = jobs
+        self._cache = parse_cache(cache_directory) if cache_directory else None
         self._warnings = []
         self._errors = []
         self._tables = {}
@@ -54,9 +104,9 @@ class database(database_definition):
     def _process_directory(self, directory):
         """ Processes a directory.
 
-        Finds all SQL files in the directory and calls `_read()` on them,
-        which results in the file being parsed and its tables/rows added to the
-        record of database tables/rows.
+        Finds all SQL files in the directory and parses them (in parallel if
+        we have more than one job), which results in the tables/rows from each
+        file being added to the record of database tables/rows.
 
         :param string: A string containing one of the above
         :type string: string
@@ -65,7 +115,19 @@ class database(database_definition):
         if directory[-1] != os.sep:
             directory += os.sep
 
-        for filename in glob.glob('%s*.sql' % directory):
+        filenames = sorted(glob.glob('%s*.sql' % directory))
+
+        if self._jobs > 1 and len(filenames) > 1:
+            with ProcessPoolExecutor(max_workers=self._jobs) as executor:
+                # map() hands back results in the order of the filenames, no matter
+                # which worker finishes first, so our merge order is deterministic
+                chunksize = max(1, len(filenames) // (self._jobs * 4))
+                parse = partial(parse_sql, cache=self._cache)
+                for reader in executor.map(parse, filenames, chunksize=chunksize):
+                    self._merge(reader)
+            return
+
+        for filename in filenames:
             self._read(filename)
 
     def _read(self, contents):
@@ -79,12 +141,14 @@ class database(database_definition):
         :type contents: string
         """
 
-        try:
-            reader = sql_reader()
-            reader.parse(contents)
+        self._merge(parse_sql(contents, self._cache))
+
+    def _merge(self, reader):
+        """ Stores the tables/rows (and any errors/warnings) found by a reader
 
-        except ValueError as e:
-            print("Error in file %s: %s" % (contents, e))
+        :param reader: A reader that has parsed some SQL
+        :type reader: mygrations.formats.mysql.file_reader.reader
+        """
 
         # pull in all errors and warnings
         self._errors.extend(reader.errors)
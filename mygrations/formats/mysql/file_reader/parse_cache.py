@@ -0,0 +1,108 @@
+import os
+import pickle
+import hashlib
+import tempfile
+
+import mygrations
+class parse_cache(object):
+    """ cache = parse_cache( directory )
+
+    On-disk cache of parsed *.sql files.
+
+    Parsing is the slow part of every command, and between two runs usually only a file or
+    two has changed.  The cache stores the reader for each file (which holds the parsed
+    create_parser and insert_parser objects) in the cache directory, along with a hash of
+    the file contents.  If the contents haven't changed then the reader is loaded straight
+    from the cache instead of going through the rules engine again.
+
+    Every entry also records the mygrations version that wrote it, so upgrading mygrations
+    throws out the whole cache.  A cache entry that can't be read for any reason is simply
+    treated as a miss.
+
+    :param directory: The directory to store cache files in (created if it doesn't exist)
+    :param version: The version to key the cache on.  Defaults to the mygrations version
+    :type directory: string
+    :type version: string
+    """
+
+    # bump this if the layout of the cache entries ever changes
+    format_version = 2
+
+    def __init__(self, directory, version=None):
+
+        self.directory = directory
+        self.version = mygrations.__version__ if version is None else version
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    def hash_file(self, filename):
+        """ Returns a hash of the contents of the file
+
+        :param filename: The file to hash
+        :type filename: string
+        :returns: The hex digest of the file contents
+        :rtype: string
+        """
+        with open(filename, 'rb') as fp:
+            return hashlib.sha256(fp.read()).hexdigest()
+
+    def get(self, filename, content_hash):
+        """ Returns the cached reader for the file, or None if it isn't cached
+
+        :param filename: The name of the file that was parsed
+        :param content_hash: The hash of the current file contents (see :meth:`hash_file`)
+        :type filename: string
+        :type content_hash: string
+        :returns: The reader that parsed the file, or None
+        :rtype: mygrations.formats.mysql.file_reader.reader|None
+        """
+        try:
+            with open(self._cache_filename(filename), 'rb') as fp:
+                (format_version, version, cached_hash, reader) = pickle.load(fp)
+
+        # a cache that can't be read is just a cache miss
+        except Exception:
+            self.misses += 1
+            return None
+
+        if format_version != self.format_version or version != self.version or cached_hash != content_hash:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return reader
+
+    def store(self, filename, content_hash, reader):
+        """ Stores the reader for a file in the cache
+
+        The cache file is written to a temporary file and moved into place, so that
+        concurrent workers never see a partially written entry.
+
+        :param filename: The name of the file that was parsed
+        :param content_hash: The hash of the file contents that were parsed
+        :param reader: The reader that parsed the file
+        :type filename: string
+        :type content_hash: string
+        :type reader: mygrations.formats.mysql.file_reader.reader
+        """
+        (fd, temp_filename) = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as fp:
+                pickle.dump((self.format_version, self.version, content_hash, reader), fp, pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_filename, self._cache_filename(filename))
+        except Exception:
+            os.unlink(temp_filename)
+            raise
+
+    def _cache_filename(self, filename):
+        """ Returns the name of the cache file for a given *.sql file
+
+        :param filename: The name of the *.sql file
+        :type filename: string
+        :returns: The full path to the cache file
+        :rtype: string
+        """
+        key = hashlib.sha1(os.path.abspath(filename).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, '%s.pickle' % key)
@@ -3,6 +3,7 @@ from mygrations.formats.mysql.definitions.constraint import constraint
 class constraint_foreign(parser, constraint):
 
     has_comma = False
+    dispatch_keys = ('constraint', )
 
     # CONSTRAINT `accounts_status_id_ref_account_statuses_id` FOREIGN KEY (`status_id`) REFERENCES `account_statuses` (`id`) ON UPDATE CASCADE
     rules = [{
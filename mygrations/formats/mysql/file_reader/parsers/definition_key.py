@@ -0,0 +1,52 @@
+import re
+
+# definitions that start with one of these are indexes or constraints.  They are
+# reserved words in MySQL, so a column can't use them as an (unquoted) name
+keywords = {'primary': True, 'key': True, 'index': True, 'unique': True, 'constraint': True}
+
+leading_word = re.compile(r'[^\(\s\)]+')
+column_type = re.compile(r'[^\(\s\)]+ \w+ ?')
+length = re.compile(r'\( ?\d+ ?\)')
+decimals = re.compile(r'\( ?\d+ ?, ?\d+ ?\)')
+def definition_key(string):
+    """ Returns the dispatch key for the next definition in a CREATE TABLE command
+
+    Used by the `definitions` rule of the create parser to narrow down which child parsers
+    need to be tried for each definition.  Indexes and constraints are keyed by their
+    leading keyword.  For columns the winning parser is decided by what comes after the
+    column type, so columns are keyed by that:
+
+    ==========  ====================  ====================
+    Key         Example               Candidates
+    ==========  ====================  ====================
+    length      id INT(10) UNSIGNED   type_character, type_numeric
+    decimals    price DECIMAL(20,4)   type_decimal, type_enum
+    values      status ENUM('a','b')  type_enum
+    plain       created DATE          type_text, type_plain
+    ==========  ====================  ====================
+
+    :param string: The (cleaned) string being parsed, starting at the definition
+    :type string: str
+    :returns: The dispatch key, or None if the definition isn't recognized
+    :rtype: string|None
+    """
+    word = leading_word.match(string)
+    if not word:
+        return None
+
+    lowered = word.group(0).lower()
+    if lowered in keywords:
+        return lowered
+
+    column = column_type.match(string)
+    if not column:
+        return None
+
+    rest = string[column.end():]
+    if rest[:1] != '(':
+        return 'plain'
+    if length.match(rest):
+        return 'length'
+    if decimals.match(rest):
+        return 'decimals'
+    return 'values'
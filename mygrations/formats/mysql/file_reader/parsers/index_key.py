@@ -4,6 +4,7 @@ class index_key(parser, index):
 
     _index_type = 'index'
     has_comma = False
+    dispatch_keys = ('key', 'index')
 
     # KEY account_id (account_id,name)
     rules = [{
@@ -4,6 +4,7 @@ class index_primary(parser, index):
 
     _index_type = 'primary'
     has_comma = False
+    dispatch_keys = ('primary', )
 
     # PRIMARY KEY (`id`),
     rules = [{
@@ -4,6 +4,7 @@ class index_unique(parser, index):
 
     _index_type = 'unique'
     has_comma = False
+    dispatch_keys = ('unique', )
 
     # UNIQUE account_id (account_id)
     rules = [{
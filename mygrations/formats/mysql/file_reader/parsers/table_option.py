@@ -1,8 +1,6 @@
 from mygrations.core.parse.parser import parser
-class table_option(parser):
-
-    name = ''
-    value = ''
+from mygrations.formats.mysql.definitions.option import option
+class table_option(parser, option):
 
     # UNIQUE account_id (account_id)
     rules = [{
@@ -22,5 +20,5 @@ class table_option(parser):
 
         self._errors = []
         self._warnings = []
-        self.name = self._values['name'].strip()
-        self.value = self._values['value'].strip()
+        self._name = self._values['name'].strip()
+        self._value = self._values['value'].strip()
@@ -20,6 +20,7 @@ class type_character(parser, column):
     }
 
     has_comma = False
+    dispatch_keys = ('length', )
 
     # name varchar(255) NOT NULL DEFAULT '' CHARACTER SET uf8 COLLATE utf8
     # hackish? maybe (i.e. yes) the repeated COLLATE and CHARACTER SETS take care of uncertain
@@ -6,6 +6,7 @@ class type_decimal(parser, column):
 
     decimals = ''
     has_comma = False
+    dispatch_keys = ('decimals', )
 
     # longitude float(20,4) unsigned default null
     rules = [{
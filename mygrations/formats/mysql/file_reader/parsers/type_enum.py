@@ -6,6 +6,7 @@ class type_enum(parser, column):
 
     values = []
     has_comma = False
+    dispatch_keys = ('decimals', 'values')
 
     # types enum( `young`,`middle`,`old` )
     rules = [{
@@ -17,6 +17,7 @@ class type_numeric(parser, column):
     }
 
     has_comma = False
+    dispatch_keys = ('length', )
     is_char = False
 
     # `created` int(10) unsigned not null default 0 AUTO_INCREMENT
@@ -3,6 +3,7 @@ from mygrations.formats.mysql.definitions.column import column
 class type_plain(parser, column):
 
     has_comma = False
+    dispatch_keys = ('plain', )
 
     # created date
     rules = [{
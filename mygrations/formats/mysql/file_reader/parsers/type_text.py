@@ -15,6 +15,7 @@ class type_text(parser, column):
     }
 
     has_comma = False
+    dispatch_keys = ('plain', )
 
     # description text charset utf8 collate utf8
     # hackish? maybe (i.e. yes) the repeated COLLATE and CHARACTER SETS take care of uncertain
@@ -1,5 +1,6 @@
 import io, os
 from .comment_parser import comment_parser
+from .tokenizer import tokenizer
 from .create_parser import create_parser
 from .insert_parser import insert_parser
 class reader(object):
@@ -108,49 +109,69 @@ class reader(object):
         return contents
 
     """ Main parsing loop: attempts to find create, insert, and comments in the SQL string
+
+    The tokenizer walks the SQL once and hands back the location of each comment and
+    statement, so each parser only sees its own statement and parsing stays linear
+    in the size of the input.
     """
 
     def parse(self, filename):
 
         data = self._unpack(filename)
 
-        # okay then!  This is our main parsing loop.
-        c = 0
-        while data:
-            c += 1
-            if c > 10000:
-                raise ValueError("Exceeded max parse depth")
-
-            # never hurts
-            data = data.strip()
-
-            # now we are looking for one of three things:
-            # comment, create, insert
-            if data[:2] == '--' or data[:2] == '/*' or data[0] == '#':
-                parser = comment_parser()
-                data = parser.parse(data)
-
-            elif data[:6].lower() == 'create':
-                parser = create_parser()
-                data = parser.parse(data)
-                self._tables[parser.name] = parser
-
-            elif data[:6].lower() == 'insert':
-                parser = insert_parser()
-                data = parser.parse(data)
-                if not parser.table in self._rows:
-                    self._rows[parser.table] = []
-
-                self._rows[parser.table].append(parser)
-
-            else:
-                self._errors.append("Unrecognized MySQL command: %s%s" % (data, self._filename_notice()))
-                return data
-
-            for error in parser.errors:
-                self._errors.append('%s%s' % (error, self._filename_notice()))
-            for warning in parser.warnings:
-                self._warnings.append('%s%s' % (warning, self._filename_notice()))
+        # okay then!  This is our main parsing loop.  It only goes around more than once
+        # when a statement is missing its semi-colon, since the tokenizer then runs it into
+        # the next statement, and we have to start again from whatever the parser left.
+        resume = True
+        while resume:
+            resume = False
+            for (token_type, start, end) in tokenizer(data):
+                statement = data[start:end]
+
+                # now we are looking for one of three things:
+                # comment, create, insert
+                if token_type == 'comment':
+                    parser = comment_parser()
+                    leftover = parser.parse(statement)
+
+                elif statement[:6].lower() == 'create':
+                    parser = create_parser()
+                    leftover = parser.parse(statement)
+                    if parser.matched:
+                        self._tables[parser.name] = parser
+
+                elif statement[:6].lower() == 'insert':
+                    parser = insert_parser()
+                    leftover = parser.parse(statement)
+                    if parser.matched:
+                        if not parser.table in self._rows:
+                            self._rows[parser.table] = []
+
+                        self._rows[parser.table].append(parser)
+
+                else:
+                    self._errors.append("Unrecognized MySQL command: %s%s" % (data[start:], self._filename_notice()))
+                    return data[start:]
+
+                for error in parser.errors:
+                    self._errors.append('%s%s' % (error, self._filename_notice()))
+                for warning in parser.warnings:
+                    self._warnings.append('%s%s' % (warning, self._filename_notice()))
+
+                # the parser stopped early in a statement it did match, so carry on from there
+                # (the parser can tidy up what it leaves behind, so it isn't always a slice of data)
+                if leftover.strip() and parser.matched and token_type != 'comment':
+                    data = '%s%s' % (leftover, data[end:])
+                    resume = True
+                    break
+
+                # anything else the parser couldn't make sense of is an error, and we don't
+                # have a reliable place to resume from, so stop here
+                if leftover or not parser.matched:
+                    remaining = '%s%s' % (leftover, data[end:])
+                    if token_type != 'comment':
+                        self._errors.append("Unrecognized MySQL command: %s%s" % (remaining, self._filename_notice()))
+                    return remaining
 
         self._matched = True
-        return data
+        return ''
@@ -0,0 +1,131 @@
+import re
+class tokenizer(object):
+    """ tokens = tokenizer( sql )
+
+    Splits a string of SQL into comments and statements in a single forward pass.
+
+    The reader used to strip the input, hand the whole remaining string to a parser,
+    and then start over on whatever the parser left behind.  That copies the input
+    once per statement, which gets painful for large seed files.  The tokenizer
+    instead walks the input once and yields the offsets of each comment and statement,
+    so that each parser only ever sees the (small) statement it is responsible for.
+
+    Iterating over the tokenizer yields tuples of (token_type, start, end), where
+    token_type is one of:
+
+    ==========  ========
+    type        contents
+    ==========  ========
+    comment     A -- comment, # comment, or /* */ comment found between statements
+    statement   Everything up to (and including) the next semi-colon outside of quotes
+    ==========  ========
+
+    start and end are offsets into the original string, so that data[start:end] is
+    the text of the token.  Whitespace between tokens is skipped.
+
+    :param data: The SQL to tokenize
+    :type data: string
+    """
+
+    # whitespace in between tokens
+    whitespace = re.compile(r'\s+')
+
+    # the only characters we care about while inside of a statement
+    statement_special = re.compile(r"[;'\"`]")
+
+    # the characters we care about inside of each kind of quote
+    quote_special = {"'": re.compile(r"['\\]"), '"': re.compile(r'["\\]'), '`': re.compile(r'`')}
+
+    def __init__(self, data):
+
+        self.data = data
+
+    def __iter__(self):
+
+        data = self.data
+        length = len(data)
+        position = 0
+
+        while True:
+            match = self.whitespace.match(data, position)
+            if match:
+                position = match.end()
+
+            if position >= length:
+                return
+
+            # comments only get recognized in between statements, just like before
+            if data.startswith('--', position) or data[position] == '#':
+                end = data.find('\n', position)
+                end = length if end == -1 else end
+                yield ('comment', position, end)
+                position = end
+                continue
+
+            if data.startswith('/*', position):
+                end = data.find('*/', position + 2)
+                end = length if end == -1 else end + 2
+                yield ('comment', position, end)
+                position = end
+                continue
+
+            end = self._find_statement_end(position)
+            yield ('statement', position, end)
+            position = end
+
+    def _find_statement_end(self, position):
+        """ Returns the offset just past the end of the statement starting at position
+
+        The statement ends after the first semi-colon found outside of quotes, or at the
+        end of the data if there is no such semi-colon.
+
+        :param position: The offset of the start of the statement
+        :type position: int
+        :returns: The offset just past the end of the statement
+        :rtype: int
+        """
+        data = self.data
+        length = len(data)
+
+        while position < length:
+            match = self.statement_special.search(data, position)
+            if not match:
+                return length
+
+            char = match.group(0)
+            if char == ';':
+                return match.end()
+
+            position = self._find_quote_end(char, match.end())
+
+        return length
+
+    def _find_quote_end(self, quote, position):
+        """ Returns the offset just past the closing quote for a quote opened just before position
+
+        Backslashes escape the next character in single and double quoted strings, and
+        doubled-up quotes simply close the string and open a new one, which works out the same.
+
+        :param quote: The quote character that opened the string
+        :param position: The offset just past the opening quote
+        :type quote: string
+        :type position: int
+        :returns: The offset just past the closing quote, or the length of the data if it is never closed
+        :rtype: int
+        """
+        data = self.data
+        length = len(data)
+        special = self.quote_special[quote]
+
+        while position < length:
+            match = special.search(data, position)
+            if not match:
+                return length
+
+            if match.group(0) == '\\':
+                position = match.end() + 1
+                continue
+
+            return match.end()
+
+        return length
@@ -0,0 +1,203 @@
+from mygrations.formats.mysql.mygrations.online_ddl import online_ddl
+from mygrations.formats.mysql.mygrations.operations.alter_table import alter_table
+from mygrations.formats.mysql.mygrations.operations.create_table import create_table
+from mygrations.formats.mysql.mygrations.operations.remove_table import remove_table
+from mygrations.formats.mysql.mygrations.operations.add_constraint import add_constraint
+from mygrations.formats.mysql.mygrations.operations.remove_constraint import remove_constraint
+class alter_coalescer:
+    """ coalescer = alter_coalescer( ddl=None )
+
+    Merges the ALTER TABLE commands in a plan that change the same table
+
+    The planner can give a table more than one ALTER TABLE: foreign keys are dropped in
+    their own ALTER, and with foreign key checks on the new foreign keys get another one
+    later in the plan.  Every one of those that rebuilds the table copies it all over again,
+    so wherever possible a later ALTER TABLE is folded into the earlier one (or the earlier
+    one is pushed down into the later one).
+
+    An ALTER TABLE only moves past the operations between the two if none of them depend
+    on it: operations on tables that it adds or drops foreign keys to, operations that add
+    or drop foreign keys to its table, dropped tables, and SET FOREIGN_KEY_CHECKS all stay
+    put.
+
+    MySQL can't drop a foreign key and add one with the same name in the same ALTER TABLE.
+    Those drops stay in an ALTER TABLE of their own (dropping a foreign key never rebuilds
+    the table) and everything else is moved into the later ALTER TABLE, so the table is
+    only rebuilt once.
+
+    Rebuilds are counted with :meth:`online_ddl.rebuilds`, using the given online_ddl (or
+    one with the default MySQL version).
+
+    :param ddl: Used to work out which ALTER TABLE commands rebuild their table
+    :type ddl: mygrations.formats.mysql.mygrations.online_ddl
+    """
+    def __init__(self, ddl=None):
+
+        self.ddl = ddl if ddl is not None else online_ddl()
+        self._merged = 0
+        self._rebuilds_saved = 0
+
+    @property
+    def merged(self):
+        """ Public getter.  Returns how many ALTER TABLE commands the last processed plan lost
+
+        :returns: The number of ALTER TABLE commands merged into others
+        :rtype: int
+        """
+        return self._merged
+
+    @property
+    def rebuilds_saved(self):
+        """ Public getter.  Returns how many fewer table rebuilds the last processed plan has
+
+        :returns: The number of rebuilds saved
+        :rtype: int
+        """
+        return self._rebuilds_saved
+
+    def process(self, operations, db_from):
+        """ Merges the ALTER TABLE commands on each table where that is allowed
+
+        The operations passed in are left alone: merged ALTER TABLE commands are new ones.
+
+        :param operations: The operations in the plan, in order
+        :param db_from: The database the plan will run on
+        :type operations: [mygrations.formats.mysql.mygrations.operations.*]
+        :type db_from: mygrations.formats.mysql.definitions.database
+        :returns: The operations
+        :rtype: [mygrations.formats.mysql.mygrations.operations.*]
+        """
+        operations = list(operations)
+        self._merged = 0
+
+        # merged operations leave a None behind, so the positions in last_alter stay good
+        coalesced = []
+        last_alter = {}
+        for operation in operations:
+            if not isinstance(operation, alter_table) or operation.table_name not in last_alter:
+                if isinstance(operation, alter_table):
+                    last_alter[operation.table_name] = len(coalesced)
+                coalesced.append(operation)
+                continue
+
+            position = last_alter[operation.table_name]
+            earlier = coalesced[position]
+            between = [other for other in coalesced[position + 1:] if other is not None]
+            kept = self._conflicts(earlier, operation)
+
+            if not kept and self._can_move(operation, between):
+                coalesced[position] = self._combine(earlier.table_name, list(earlier) + list(operation))
+                self._merged += 1
+                continue
+
+            moved = [part for part in earlier if part not in kept]
+            if moved and self._can_move(earlier, between):
+                coalesced[position] = self._combine(earlier.table_name, kept) if kept else None
+                operation = self._combine(operation.table_name, moved + list(operation))
+                if not kept:
+                    self._merged += 1
+
+            last_alter[operation.table_name] = len(coalesced)
+            coalesced.append(operation)
+
+        coalesced = [operation for operation in coalesced if operation is not None]
+        self._rebuilds_saved = self._count_rebuilds(operations, db_from) - self._count_rebuilds(coalesced, db_from)
+
+        return coalesced
+
+    def _conflicts(self, earlier, later):
+        """ Returns the parts of an ALTER TABLE that can't be merged with a later one on the same table
+
+        Those are foreign keys that are dropped in one and added in the other with the same name.
+
+        :param earlier: The earlier ALTER TABLE
+        :param later: The later ALTER TABLE
+        :type earlier: mygrations.formats.mysql.mygrations.operations.alter_table
+        :type later: mygrations.formats.mysql.mygrations.operations.alter_table
+        :returns: The parts of the earlier ALTER TABLE that have to stay where they are
+        :rtype: list
+        """
+        later_names = set([
+            part.constraint.name for part in later if isinstance(part, (add_constraint, remove_constraint))
+        ])
+
+        return [
+            part for part in earlier
+            if isinstance(part, (add_constraint, remove_constraint)) and part.constraint.name in later_names
+        ]
+
+    def _can_move(self, alter, between):
+        """ Returns whether an ALTER TABLE can move past some other operations
+
+        :param alter: The ALTER TABLE
+        :param between: The operations it would move past
+        :type alter: mygrations.formats.mysql.mygrations.operations.alter_table
+        :type between: [mygrations.formats.mysql.mygrations.operations.*]
+        :rtype: bool
+        """
+        references = self._references(alter)
+        for operation in between:
+            table_name = getattr(operation, 'table_name', None)
+            if table_name is None or isinstance(operation, remove_table):
+                return False
+
+            if table_name == alter.table_name or table_name in references:
+                return False
+
+            if alter.table_name in self._references(operation):
+                return False
+
+        return True
+
+    def _references(self, operation):
+        """ Returns the names of the tables that an operation adds or drops foreign keys to
+
+        :param operation: The operation
+        :type operation: mygrations.formats.mysql.mygrations.operations.*
+        :rtype: set
+        """
+        if isinstance(operation, create_table):
+            return set([constraint.foreign_table for constraint in operation.table.constraints.values()])
+
+        if isinstance(operation, alter_table):
+            return set([
+                part.constraint.foreign_table for part in operation
+                if isinstance(part, (add_constraint, remove_constraint))
+            ])
+
+        return set()
+
+    def _combine(self, table_name, parts):
+        """ Returns a new ALTER TABLE for a table, with the given parts
+
+        :param table_name: The name of the table
+        :param parts: The parts of the ALTER TABLE, in order
+        :type table_name: string
+        :type parts: list
+        :rtype: mygrations.formats.mysql.mygrations.operations.alter_table
+        """
+        alter = alter_table(table_name)
+        for part in parts:
+            alter.add_operation(part)
+
+        return alter
+
+    def _count_rebuilds(self, operations, db_from):
+        """ Returns how many of the ALTER TABLE commands in a plan rebuild their table
+
+        :param operations: The operations in the plan
+        :param db_from: The database the plan will run on
+        :type operations: [mygrations.formats.mysql.mygrations.operations.*]
+        :type db_from: mygrations.formats.mysql.definitions.database
+        :rtype: int
+        """
+        tables = db_from.tables if db_from else {}
+        rebuilds = 0
+        for operation in operations:
+            if not isinstance(operation, alter_table):
+                continue
+
+            if self.ddl.rebuilds(operation, tables[operation.table_name] if operation.table_name in tables else None):
+                rebuilds += 1
+
+        return rebuilds
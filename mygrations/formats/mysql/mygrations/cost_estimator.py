@@ -0,0 +1,153 @@
+from collections import OrderedDict
+from mygrations.formats.mysql.mygrations.operations.alter_table import alter_table
+from mygrations.formats.mysql.mygrations.operations.add_key import add_key
+from mygrations.formats.mysql.mygrations.operations.change_key import change_key
+class cost_estimator:
+    """ estimator = cost_estimator( statistics, copy_rate=20MB, inplace_rate=50MB, row_rate=2000, statement_time=0.001 )
+
+    Estimates how many bytes each operation in a plan rewrites, and how long it will take
+
+    The estimates come from the size of each table in the live database (see
+    :meth:`mygrations.formats.mysql.db_reader.database.read_statistics`) and a few rates:
+
+    ================  ===========================================================================
+    operation         cost
+    ================  ===========================================================================
+    ALTER (INSTANT)   Nothing but the statement itself
+    ALTER (rebuild)   The whole table (data and indexes) at copy_rate, or inplace_rate if INPLACE
+    ALTER (INPLACE)   A scan of the table data at inplace_rate, if it builds a key (else nothing)
+    rows              The average row length per row, at row_rate rows per second
+    anything else     Nothing but the statement itself (CREATE TABLE, DROP TABLE, etc...)
+    ================  ===========================================================================
+
+    An ALTER TABLE that hasn't been classified by :class:`online_ddl` is assumed to copy the
+    table, since that is the worst case.  Tables missing from the statistics count as empty.
+
+    Operations are added one at a time (so a plan can be costed as it streams by) and the
+    costs are totalled up per operation, with the row operations grouped by table.
+
+    :param statistics: The size of each table, by name: a dict with rows, data_length, and index_length
+    :param copy_rate: How many bytes per second ALGORITHM=COPY gets through (default 20MB)
+    :param inplace_rate: How many bytes per second ALGORITHM=INPLACE gets through (default 50MB)
+    :param row_rate: How many rows per second the row operations change
+    :param statement_time: The overhead of running any one statement, in seconds
+    :type statistics: dict
+    :type copy_rate: int
+    :type inplace_rate: int
+    :type row_rate: int
+    :type statement_time: float
+    """
+    def __init__(self, statistics, copy_rate=20971520, inplace_rate=52428800, row_rate=2000, statement_time=0.001):
+
+        if min(copy_rate, inplace_rate, row_rate) <= 0:
+            raise ValueError('The rates for cost_estimator must be positive')
+
+        self.statistics = statistics
+        self.copy_rate = copy_rate
+        self.inplace_rate = inplace_rate
+        self.row_rate = row_rate
+        self.statement_time = statement_time
+        self._costs = OrderedDict()
+
+    @property
+    def total_bytes(self):
+        """ Public getter.  Returns the number of bytes rewritten by everything added so far
+
+        :returns: The number of bytes
+        :rtype: int
+        """
+        return sum([cost[0] for cost in self._costs.values()])
+
+    @property
+    def total_seconds(self):
+        """ Public getter.  Returns the time everything added so far should take
+
+        :returns: The number of seconds
+        :rtype: float
+        """
+        return sum([cost[1] for cost in self._costs.values()])
+
+    @property
+    def summary(self):
+        """ Public getter.  Returns the cost of everything added so far, most expensive first
+
+        :returns: A list of (description, bytes, seconds) tuples
+        :rtype: [tuple]
+        """
+        costs = [(description, cost[0], cost[1]) for (description, cost) in self._costs.items()]
+        return sorted(costs, key=lambda cost: (-cost[2], -cost[1]))
+
+    def add(self, operation):
+        """ Adds the cost of an operation to the totals
+
+        :param operation: The operation
+        :type operation: mygrations.formats.mysql.mygrations.operations.*
+        :returns: The estimated (bytes, seconds) for the operation
+        :rtype: tuple
+        """
+        (size, seconds) = self.estimate(operation)
+
+        if getattr(operation, 'rows_affected', None) is None:
+            description = str(operation)
+        else:
+            description = 'Row changes to `%s`' % operation.table_name
+
+        # the same SQL twice in a plan is possible (i.e. when a table is altered, then altered back)
+        if description in self._costs:
+            self._costs[description] = (self._costs[description][0] + size, self._costs[description][1] + seconds)
+        else:
+            self._costs[description] = (size, seconds)
+
+        return (size, seconds)
+
+    def add_all(self, operations):
+        """ Adds the costs of a list of operations
+
+        :param operations: The operations
+        :type operations: iterable[mygrations.formats.mysql.mygrations.operations.*]
+        """
+        for operation in operations:
+            self.add(operation)
+
+    def estimate(self, operation):
+        """ Returns the estimated cost of one operation
+
+        :param operation: The operation
+        :type operation: mygrations.formats.mysql.mygrations.operations.*
+        :returns: The number of bytes rewritten and the number of seconds it takes
+        :rtype: tuple
+        """
+        rows = getattr(operation, 'rows_affected', None)
+        if rows is not None:
+            statistics = self._table_statistics(operation.table_name)
+            average_row_length = statistics['data_length'] // statistics['rows'] if statistics['rows'] else 0
+            return (rows * average_row_length, self.statement_time + rows / self.row_rate)
+
+        if not isinstance(operation, alter_table) or operation.algorithm == 'INSTANT':
+            return (0, self.statement_time)
+
+        statistics = self._table_statistics(operation.table_name)
+        if operation.rebuilds is not False:
+            size = statistics['data_length'] + statistics['index_length']
+            rate = self.inplace_rate if operation.algorithm == 'INPLACE' else self.copy_rate
+            return (size, self.statement_time + size / rate)
+
+        # an in-place change that doesn't rebuild the table only has to read it to build keys
+        if [part for part in operation if isinstance(part, (add_key, change_key))]:
+            size = statistics['data_length']
+            return (size, self.statement_time + size / self.inplace_rate)
+
+        return (0, self.statement_time)
+
+    def _table_statistics(self, table_name):
+        """ Returns the size of a table, which is empty if there are no statistics for it
+
+        :param table_name: The name of the table
+        :type table_name: string
+        :returns: A dict with rows, data_length, and index_length
+        :rtype: dict
+        """
+        if table_name in self.statistics:
+            return self.statistics[table_name]
+
+        return {'rows': 0, 'data_length': 0, 'index_length': 0}
@@ -0,0 +1,179 @@
+import hashlib
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from mygrations.formats.mysql.mygrations.mygration import mygration
+from mygrations.formats.mysql.mygrations.row_mygration import row_mygration
+class fleet_mygration:
+    """ fleet = fleet_mygration( db_to, targets, load, workers=8, batcher=None, order_by_fks=False, jobs=1 )
+
+    Creates migration plans for many databases that (mostly) share the same schema, i.e. shards.
+
+    The live databases are loaded concurrently by a pool of at most `workers` threads
+    (loading is almost entirely waiting on the network).  As each one comes in it is
+    grouped with the others by the fingerprint of its structure (see
+    :attr:`mygrations.formats.mysql.definitions.database.fingerprint`) and of the rows
+    in the tables that db_to is tracking rows for.  A plan is only built for the first
+    database in each group: every other database in the group shares the same list of
+    operations, and is thrown away as soon as it has been fingerprinted.  The cost of
+    planning a fleet therefore depends on the number of distinct schemas, not on the
+    number of databases.  The database that each plan was built from is kept (see
+    :meth:`database`) for anything that still needs to look at it.
+
+    A database that fails to load doesn't stop the others: its error is kept in `errors`.
+
+    :param db_to: The database to migrate to (normally the *.sql files)
+    :param targets: The databases to migrate from, by name
+    :param load: Called with each target, and returns its database definition (with rows read for tracked tables)
+    :param workers: The maximum number of databases to load at once
+    :param batcher: An optional batcher to combine row operations with
+    :param order_by_fks: Whether the plans should run with foreign key checks enabled
+    :param jobs: The number of processes each structural comparison can use
+    :type db_to: mygrations.formats.mysql.definitions.database
+    :type targets: OrderedDict
+    :type load: callable
+    :type workers: int
+    :type batcher: mygrations.formats.mysql.mygrations.row_batcher
+    :type order_by_fks: bool
+    :type jobs: int
+    """
+
+    def __init__(self, db_to, targets, load, workers=8, batcher=None, order_by_fks=False, jobs=1):
+
+        if workers < 1:
+            raise ValueError('workers for fleet plans must be at least 1')
+
+        self.db_to = db_to
+        self.batcher = batcher
+        self.order_by_fks = order_by_fks
+        self.jobs = jobs
+        self._names = list(targets.keys())
+        self._errors = OrderedDict()
+        self._groups = OrderedDict()
+        self._group_of = {}
+
+        self._process(targets, load, workers)
+
+    @property
+    def groups(self):
+        """ Public getter.  Returns the databases that share a plan, and the plan they share
+
+        Groups come in the order of the first database in them, and the databases in each
+        group are in the same order as the targets.
+
+        :returns: A list of tuples with a list of target names and a list of operations
+        :rtype: [([string], [mygrations.formats.mysql.mygrations.operations.*])]
+        """
+        order = {name: position for (position, name) in enumerate(self._names)}
+        groups = [(sorted(names, key=order.get), operations) for (names, operations, live) in self._groups.values()]
+        return sorted(groups, key=lambda group: order[group[0][0]])
+
+    @property
+    def errors(self):
+        """ Public getter.  Returns the error for every database that couldn't be loaded, by target name
+
+        :returns: The error messages by target name
+        :rtype: OrderedDict
+        """
+        return self._errors
+
+    def plan(self, name):
+        """ Returns the operations needed to migrate one target
+
+        The list is shared with every other target in the same group, so it must not be changed.
+
+        :param name: The name of the target
+        :type name: string
+        :returns: The operations
+        :rtype: [mygrations.formats.mysql.mygrations.operations.*]
+        """
+        if name in self._errors:
+            raise ValueError('Cannot plan for %s because it failed to load: %s' % (name, self._errors[name]))
+
+        if name not in self._group_of:
+            raise ValueError('Unknown target %s' % name)
+
+        return self._groups[self._group_of[name]][1]
+
+    def database(self, name):
+        """ Returns the live database that the plan for a target was built from
+
+        That is the first database loaded in the target's group, which has the same structure
+        (and tracked rows) as the target itself, but not necessarily the same table sizes.
+
+        :param name: The name of the target
+        :type name: string
+        :returns: The live database
+        :rtype: mygrations.formats.mysql.definitions.database
+        """
+        # for the same errors as plan
+        self.plan(name)
+
+        return self._groups[self._group_of[name]][2]
+
+    def _process(self, targets, load, workers):
+        """ Loads every target, groups them, and plans each group
+
+        Plans are built on this thread while the workers keep loading the other targets.
+
+        :param targets: The databases to migrate from, by name
+        :param load: Called with each target, and returns its database definition
+        :param workers: The maximum number of databases to load at once
+        :type targets: OrderedDict
+        :type load: callable
+        :type workers: int
+        """
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(load, target): name for (name, target) in targets.items()}
+            for future in as_completed(futures):
+                name = futures.pop(future)
+                try:
+                    live_database = future.result()
+                except Exception as e:
+                    self._errors[name] = str(e)
+                    continue
+
+                key = (live_database.fingerprint, self._rows_fingerprint(live_database))
+                if key not in self._groups:
+                    self._groups[key] = ([], self._plan(live_database), live_database)
+
+                self._groups[key][0].append(name)
+                self._group_of[name] = key
+
+        self._errors = OrderedDict((name, self._errors[name]) for name in self._names if name in self._errors)
+
+    def _rows_fingerprint(self, live_database):
+        """ Returns a hash of the rows of the live database, for the tables that db_to is tracking rows for
+
+        :param live_database: The live database
+        :type live_database: mygrations.formats.mysql.definitions.database
+        :returns: The fingerprint
+        :rtype: string
+        """
+        rows = []
+        for table in self.db_to.tables.values():
+            if not table.tracking_rows or table.name not in live_database.tables:
+                continue
+
+            live_table = live_database.tables[table.name]
+            if live_table.tracking_rows:
+                rows.append((table.name, list(live_table.rows.items())))
+
+        return hashlib.sha1(repr(rows).encode('utf-8')).hexdigest()
+
+    def _plan(self, live_database):
+        """ Returns the operations needed to migrate one live database to db_to
+
+        :param live_database: The live database
+        :type live_database: mygrations.formats.mysql.definitions.database
+        :returns: The operations
+        :rtype: [mygrations.formats.mysql.mygrations.operations.*]
+        """
+        operations = []
+        mygrate = mygration(self.db_to, live_database, False, order_by_fks=self.order_by_fks, jobs=self.jobs)
+        if mygrate.operations:
+            operations.extend(mygrate.operations)
+
+        operations.extend(row_mygration(self.db_to, live_database, batcher=self.batcher).operations)
+
+        return operations
@@ -1,11 +1,28 @@
-import copy
+from concurrent.futures import ProcessPoolExecutor
 
-from mygrations.formats.mysql.definitions.database import database
+from mygrations.formats.mysql.definitions.table_overlay import table_overlay
+from mygrations.formats.mysql.definitions.compact import pack_table, unpack_table
 from mygrations.formats.mysql.mygrations.operations.alter_table import alter_table
 from mygrations.formats.mysql.mygrations.operations.add_constraint import add_constraint
+from mygrations.formats.mysql.mygrations.operations.change_column import change_column
+from mygrations.formats.mysql.mygrations.operations.remove_constraint import remove_constraint
 from mygrations.formats.mysql.mygrations.operations.remove_table import remove_table
 from mygrations.formats.mysql.mygrations.operations.disable_checks import disable_checks
 from mygrations.formats.mysql.mygrations.operations.enable_checks import enable_checks
+def diff_tables(pairs, split_operations=False):
+    """ Compares packed tables and returns the operations to bring each source table in line with its target
+
+    Lives at the module level so that it can be handed off to worker processes.
+    Tables travel in the form returned by :func:`mygrations.formats.mysql.definitions.compact.pack_table`.
+
+    :param pairs: A list of (packed source table, packed target table) pairs
+    :param split_operations: Passed along to :meth:`mygrations.formats.mysql.definitions.table.to`
+    :type pairs: [(tuple, tuple)]
+    :type split_operations: bool
+    :returns: The result of table.to() for each pair, in order
+    :rtype: list
+    """
+    return [unpack_table(source).to(unpack_table(target), split_operations) for (source, target) in pairs]
 class mygration:
     """ Creates a migration plan to update a database to a given spec.
 
@@ -17,32 +34,41 @@ class mygration:
     database constraint, and will figure out steps to execute in action
     to update that second database to match the structure of the first.
 
-    The general steps are:
+    There are two ways to order the operations.  By default everything runs with foreign
+    key checks turned off, so order doesn't matter: create new tables, alter existing
+    tables, and then drop old tables.
+
+    Alternatively (order_by_fks=True) foreign key checks stay on and the operations are
+    ordered so that every foreign key is satisfied when it is created.  See _process_ordered
+    for the details.
 
-    1. Check for foreign key errors: if the two database we are trying to migrate to doesn't support its own foreign key constraints, there is a show stopper
-    2. Loop through tables to be added, "creating" them as their foreign key constraints are filled, and ignoring any that have interlocking dependencies
-    3. Remove any FK constraints that are no longer used (done early to prevent trouble in the next step)
-    4. Modify tables as needed.  If modifying tables involves adding foreign key constraints that are not fulfilled, ignore those and add them later
-    5. See if we can add any remaining tables now that some table modifications have been applied
-    6. If there are still any outstanding tables to add, remove any foreign key constraints that are not fulfilled and add the tables without them
-    7. Apply all foreign key constraints that were previously ignored in steps 4 & 6
-    8. Remove any tables that need to be removed
+    Either way, if the database we are migrating to doesn't support its own foreign
+    key constraints (1215 errors), then there is a show stopper and there are no operations.
     """
 
-    def __init__(self, db_to, db_from=None, disable_checks=True):
+    def __init__(self, db_to, db_from=None, disable_checks=True, order_by_fks=False, jobs=1):
         """ Create a migration plan
 
+        If jobs is more than one then the tables that changed are compared by that many worker
+        processes.  The operations come back in the same order either way.
+
         :param db_to: The target database structure to migrate to
         :param db_from: The current database structure to migrate from
         :param disable_checks: Whether or not to add an operations to disable/re-enable FK checks
+        :param order_by_fks: Whether to order operations so they can run with FK checks on
+        :param jobs: The number of processes to compare tables with
         :type db_to: mygrations.formats.mysql.definitions.database
         :type db_from: mygrations.formats.mysql.definitions.database
-        :type disable_checks: True
+        :type disable_checks: bool
+        :type order_by_fks: bool
+        :type jobs: int
         """
 
         self.db_to = db_to
         self.db_from = db_from
-        self._disable_fk_checks = disable_checks
+        self._jobs = jobs
+        self._order_by_fks = order_by_fks
+        self._disable_fk_checks = disable_checks and not order_by_fks
 
         # first things first: stop if we have any FK errors in the database
         # we are migrating to
@@ -50,7 +76,7 @@ class mygration:
         self._errors_1215 = self.db_to.errors_1215
 
         if not self._errors_1215:
-            self._operations = self._process()
+            self._operations = self._process_ordered() if self._order_by_fks else self._process()
         else:
             self._operations = None
 
@@ -109,6 +135,42 @@ class mygration:
         return ([key for key in to_dict if key not in from_dict], [key for key in from_dict if key not in to_dict],
                 [key for key in from_dict if key in to_dict])
 
+    def _diff_tables(self, table_names, split_operations=False):
+        """ Compares the tables in both databases and returns the result of table.to() for each one that changed
+
+        Most tables don't change, and the fingerprints tell us that quickly, so only the
+        rest are compared.  With more than one job they are packed up and split between
+        worker processes, and map() hands back the results in the original order.
+
+        :param table_names: The names of the tables that are in both databases
+        :param split_operations: Passed along to :meth:`mygrations.formats.mysql.definitions.table.to`
+        :type table_names: [string]
+        :type split_operations: bool
+        :returns: The result of table.to() for each table that changed
+        :rtype: list
+        """
+        changed = [
+            table_name for table_name in table_names
+            if self.db_from.tables[table_name].fingerprint != self.db_to.tables[table_name].fingerprint
+        ]
+
+        if self._jobs <= 1 or len(changed) <= 1:
+            return [
+                self.db_from.tables[table_name].to(self.db_to.tables[table_name], split_operations)
+                for table_name in changed
+            ]
+
+        pairs = [(pack_table(self.db_from.tables[table_name]), pack_table(self.db_to.tables[table_name]))
+                 for table_name in changed]
+        chunk_size = max(1, len(pairs) // (self._jobs * 4))
+        chunks = [pairs[i:i + chunk_size] for i in range(0, len(pairs), chunk_size)]
+
+        results = []
+        with ProcessPoolExecutor(max_workers=self._jobs) as executor:
+            for chunk_results in executor.map(diff_tables, chunks, [split_operations] * len(chunks)):
+                results.extend(chunk_results)
+        return results
+
     def _process(self):
         """ Figures out the operations needed to get to self.db_to
 
@@ -132,10 +194,8 @@ class mygration:
         for table_name in tables_to_add:
             operations.append(self.db_to.tables[table_name].create())
 
-        for table_name in tables_to_update:
-            target_table = self.db_to.tables[table_name]
-            source_table = self.db_from.tables[table_name]
-            operations.extend(source_table.to(target_table))
+        for table_operations in self._diff_tables(tables_to_update):
+            operations.extend(table_operations)
 
         for table_name in tables_to_remove:
             operations.append(remove_table(table_name))
@@ -145,212 +205,201 @@ class mygration:
 
         return operations
 
-    def _old_process(self):
-        """ Figures out the operations (and proper order) need to get to self.db_to
+    def _process_ordered(self):
+        """ Figures out the operations needed to get to self.db_to with foreign key checks left on
 
-        This particular method is no longer used but is kept around for future
-        reference.  This was my original attempt, the goal of which was to make the
-        system smart enough to determine the proper order of operations to avoid
-        violating FK constraints.  See these:
+        Instead of turning off foreign key checks, the operations are ordered so that no
+        foreign key is ever created before the table it references:
 
-        https://codereview.stackexchange.com/q/177780/140581
-        https://softwareengineering.stackexchange.com/q/359107/243180
+        1. Remove foreign keys that are changing or going away, including every foreign key
+           on the tables being removed (so nothing being altered is still referenced by them)
+           and the foreign keys on either end of a column that is changing
+        2. Alter tables (columns and keys), so that columns and indexes needed by new foreign keys exist
+        3. Create new tables, in dependency order
+        4. Add new foreign keys to existing tables, any foreign keys deferred to break cycles,
+           and the foreign keys removed in step 1 only because their columns changed
+        5. Remove tables, dropping the referencing tables before the referenced ones
 
-        However, based primarly on concerns about performance, I've decided to
-        let it be dumb and simply perform all operations with FK
-        checking off, and then turn it back on when done.  I'm going to leave this
-        here though because I may resurrect it with a flag to enable migrations
-        with FK checks on.  When I do that though it will be time to figure out
-        proper topological sorting
+        Creation order comes from a topological sort of the foreign keys between new tables,
+        so it is linear in the number of tables and foreign keys.  Tables that reference
+        each other in a cycle are created without the foreign keys inside the cycle, and
+        those foreign keys are added at the end.  Removed tables have already lost their
+        foreign keys by the time they are dropped, so cycles don't matter for them.
 
-        Excessively commented because there are a lot of details and this is a critical
-        part of the process
+        :return: Operations needed to complete the migration
+        :rtype: [mygrations.formats.mysql.mygrations.operations]
         """
-
-        # Our primary output is a list of operations, but there is more that we need
-        # to make all of this happen.  We need a database to keep track of the
-        # state of the database we are building after each operation is "applied"
-        tracking_db = copy.deepcopy(self.db_from) if self.db_from else database()
-
-        # a little bit of extra processing will simplify our algorithm by a good chunk.
-        # The situation is much more complicated when we have a database we are migrating
-        # from, because columns might be added/removed/changed, and it might be (for instance)
-        # that the removal of a column breaks a foreign key constraint.  The general
-        # ambiguities introduced by changes happening in different times/ways makes it
-        # much more difficult to figure out when foreign key constraints can properly
-        # be added without triggering a 1215 error.  The simplest way to straighten this
-        # all out is to cheat: "mygrate" the "to" database all by itself.  Without a "from"
-        # the operations are more straight-forward, and we can figure out with less effort
-        # whether or not all FK constraints can be fulfilled.  If they aren't all fulfilled,
-        # then just quit now before we do anything.  If they are all fulfilled then we
-        # know our final table will be fine, so if we can just split off any uncertain
-        # foreign key constraints and apply them all at the end when our database is done
-        # being updated.  Simple(ish)!
-        #if self.db_from:
-        #check = mygration( self.db_to )
-        #if check.errors_1215:
-        #return [ check.errors_1215, [] ]
-
-        # First figure out the status of individual tables
         db_from_tables = self.db_from.tables if self.db_from else {}
         (tables_to_add, tables_to_remove, tables_to_update) = self._differences(db_from_tables, self.db_to.tables)
 
-        # IMPORTANT! tracking db and tables_to_add are both passed in by reference
-        # (like everything in python), but in this case I actually modify them by reference.
-        # not my preference, but it makes it easier here
-        (errors_1215, operations) = self._process_adds(tracking_db, tables_to_add)
-
-        # if we have errors we are done
-        #if errors_1215:
-        #return [ errors_1215, operations ]
-
-        # now apply table updates.  This acts differently: it returns a dictionary with
-        # two sets of operations: one to update the tables themselves, and one to update
-        # the foreign keys.  The latter are applied after everything else has happened.
-        fk_operations = []
-        split_operations = self._process_updates(tracking_db, tables_to_update)
-        # remove fks first to avoid 1215 errors caused by trying to remove a column
-        # that is being used in a FK constraint that hasn't yet been removed
-        if split_operations['removed_fks']:
-            operations.extend(split_operations['removed_fks'])
-        if split_operations['kitchen_sink']:
-            operations.extend(split_operations['kitchen_sink'])
-        if split_operations['fks']:
-            fk_operations.extend(split_operations['fks'])
-
-        # now that we got some tables modified let's try adding tables again
-        # if we have any left.  Remember that tracking_db and tables_to_add
-        # are modified in-place.  The point here is that there may be some
-        # tables to add that we were not able to add before because they
-        # relied on adding a column to a table before a foreign key could
-        # be supported.
-        if tables_to_add:
-            (errors_1215, more_operations) = self._process_adds(tracking_db, tables_to_add)
-            if more_operations:
-                operations = operations.extend(more_operations)
-            if errors_1215:
-                if fk_operations:
-                    operations.extend(fk_operations)
-                return operations
-
-        # At this point in time if we still have tables to add it is because
-        # they have mutually-dependent foreign key constraints.  The way to
-        # fix that is to be a bit smarter (but not too smart) and remove
-        # from the tables all foreign key constraints that can't be added yet.
-        # Then run the CREATE TABLE operations, and add the foreign key
-        # constraints afterward
-        for table_to_add in tables_to_add:
-            new_table = self.db_to.tables[table_to_add]
-            bad_constraints = tracking_db.unfulfilled_fks(new_table)
-            new_table_copy = copy.deepcopy(new_table)
-            create_fks = alter_table(table_to_add)
-            for constraint in bad_constraints.values():
-                create_fks.add_operation(add_constraint(constraint['foreign_key']))
-                new_table_copy.remove_constraint(constraint['foreign_key'])
-            operations.append(new_table_copy.create())
-            fk_operations.append(create_fks)
-
-        # process any remaining foreign key constraints
-        if fk_operations:
-            operations.extend(fk_operations)
-
-        # finally remove any tables
-        for table_to_remove in tables_to_remove:
-            operations.append(remove_table(table_to_remove))
-            tracking_db.remove_table(table_to_remove)
-
-        # all done!!!
-        return operations
-
-    def _process_adds(self, tracking_db, tables_to_add):
-        """ Runs through tables_to_add and resolves FK constraints to determine order to add tables in
+        removed_fks = []
+        kitchen_sink = []
+        fks = []
+        for split in self._diff_tables(tables_to_update, True):
+            if 'removed_fks' in split:
+                removed_fks.append(split['removed_fks'])
+            if 'kitchen_sink' in split:
+                kitchen_sink.append(split['kitchen_sink'])
+            if 'fks' in split:
+                fks.append(split['fks'])
 
-        tracking_db and tables_to_add are passed in by reference and modified
-
-        :returns: A list of 1215 error messages and a list of mygration operations
-        :rtype: ( [{'error': string, 'foreign_key': mygrations.formats.mysql.definitions.constraint}], [mygrations.formats.mysql.mygrations.operations.operation] )
-        """
-        errors_1215 = []
-        operations = []
-        good_tables = {}
-
-        # keep looping through tables as long as we find some to process
-        # the while loop will stop under two conditions: if all tables
-        # are processed or if we stop adding tables, which happens if we
-        # have tables with mutualy-dependent foreign key constraints
-        last_number_to_add = 0
-        while tables_to_add and len(tables_to_add) != last_number_to_add:
-            last_number_to_add = len(tables_to_add)
-            for new_table_name in tables_to_add:
-                new_table = self.db_to.tables[new_table_name]
-                bad_constraints = tracking_db.unfulfilled_fks(new_table)
-
-                # if we found no problems then we can add this table to our
-                # tracking db and add the "CREATE TABLE" operation to our list of operations
-                if not bad_constraints:
-                    tables_to_add.remove(new_table_name)
+        for table_name in tables_to_remove:
+            old_table_fks = alter_table(table_name)
+            for constraint in db_from_tables[table_name].constraints.values():
+                old_table_fks.add_operation(remove_constraint(constraint))
+            if old_table_fks:
+                removed_fks.append(old_table_fks)
+
+        self._rebuild_fks_on_changed_columns(db_from_tables, tables_to_remove, removed_fks, kitchen_sink, fks)
+
+        operations = removed_fks + kitchen_sink
+        for group in self._dependency_order(self.db_to.tables, tables_to_add):
+            for table_name in group:
+                new_table = self.db_to.tables[table_name]
+                deferred = [
+                    constraint for constraint in new_table.constraints.values()
+                    if constraint.foreign_table in group and constraint.foreign_table != table_name
+                ]
+                if not deferred:
                     operations.append(new_table.create())
-                    tracking_db.add_table(new_table)
-                    continue
-
-                # the next question is whether this is a valid constraint
-                # that simply can't be added yet (because it has dependencies
-                # that have not been added) or if there is an actual problem
-                # with the constraint.
-                if new_table_name in good_tables:
                     continue
 
-                # If we are here we have to decide if this table is fulfillable
-                # eventually, or if there is a mistake with a foreign key that
-                # we can't fix.  To tell the difference we just check if the
-                # database we are migrating to can fulfill these foreign keys.
-                broken_constraints = self.db_to.unfulfilled_fks(new_table)
-                if not broken_constraints:
-                    good_tables[new_table_name] = True
-                    continue
+                new_table_copy = table_overlay(new_table)
+                create_fks = alter_table(table_name)
+                for constraint in deferred:
+                    new_table_copy.remove_constraint(constraint)
+                    create_fks.add_operation(add_constraint(constraint))
+                operations.append(new_table_copy.create())
+                fks.append(create_fks)
 
-                # otherwise it is no good: record as such
-                tables_to_add.remove(new_table_name)
-                for error in broken_constraints.values():
-                    errors_1215.append(error['error'])
+        operations.extend(fks)
 
-        return (errors_1215, operations)
+        # tables are dropped in the opposite order: anything that references a table goes first
+        for group in reversed(self._dependency_order(db_from_tables, tables_to_remove)):
+            for table_name in group:
+                operations.append(remove_table(table_name))
 
-    def _process_updates(self, tracking_db, tables_to_update):
-        """ Runs through tables_to_update and resolves FK constraints to determine order to add them in
-
-        tracking_db is passed in by reference and modified
-
-        This doesn't return a list of 1215 errors because those would have been
-        Taken care of the first run through when the "to" database was mygrated
-        by itself.  Instead, this separates alters and addition/modification of
-        foreign key updates into different operations so the foreign key updates
-        can be processed separately.
+        return operations
 
-        :returns: a dict
-        :rtype: {'fks': list, 'kitchen_sink': list}
+    def _rebuild_fks_on_changed_columns(self, db_from_tables, tables_to_remove, removed_fks, kitchen_sink, fks):
+        """ Removes (and later adds back) the foreign keys that stay the same but use a column that changes
+
+        With foreign key checks on, MySQL won't change a column that a foreign key uses
+        (i.e. widening an id from INT to BIGINT), even if the foreign key is the same before
+        and after.  Any such foreign key (on any table that is staying) is removed along
+        with the others in removed_fks and added back with the others in fks.
+
+        :param db_from_tables: The tables in the database being migrated, by name
+        :param tables_to_remove: The names of the tables being removed
+        :param removed_fks: The ALTER TABLE commands that remove foreign keys, which are added to
+        :param kitchen_sink: The ALTER TABLE commands that change columns and keys
+        :param fks: The ALTER TABLE commands that add foreign keys, which are added to
+        :type db_from_tables: dict
+        :type tables_to_remove: [string]
+        :type removed_fks: [mygrations.formats.mysql.mygrations.operations.alter_table]
+        :type kitchen_sink: [mygrations.formats.mysql.mygrations.operations.alter_table]
+        :type fks: [mygrations.formats.mysql.mygrations.operations.alter_table]
         """
+        changed_columns = set()
+        for alter in kitchen_sink:
+            for part in alter:
+                if isinstance(part, change_column):
+                    changed_columns.add((alter.table_name, part.column.name))
+
+        if not changed_columns:
+            return
+
+        removed = {alter.table_name: alter for alter in removed_fks}
+        added = {alter.table_name: alter for alter in fks}
+        for (table_name, table) in db_from_tables.items():
+            if table_name in tables_to_remove:
+                continue
+
+            dropped = set([part.constraint.name for part in removed[table_name]]) if table_name in removed else set()
+            for constraint in table.constraints.values():
+                if constraint.name in dropped:
+                    continue
 
-        tables_to_update = tables_to_update[:]
-
-        operations = {'removed_fks': [], 'fks': [], 'kitchen_sink': []}
-
-        for update_table_name in tables_to_update:
-            target_table = self.db_to.tables[update_table_name]
-            source_table = self.db_from.tables[update_table_name]
+                if (table_name, constraint.column) not in changed_columns and (
+                    constraint.foreign_table, constraint.foreign_column
+                ) not in changed_columns:
+                    continue
 
-            more_operations = source_table.to(target_table, True)
-            if 'removed_fks' in more_operations:
-                operations['removed_fks'].append(more_operations['removed_fks'])
-                for operation in more_operations['removed_fks']:
-                    tracking_db.apply_operation(update_table_name, operation)
-            if 'fks' in more_operations:
-                operations['fks'].append(more_operations['fks'])
-                for operation in more_operations['fks']:
-                    tracking_db.apply_operation(update_table_name, operation)
-            if 'kitchen_sink' in more_operations:
-                operations['kitchen_sink'].append(more_operations['kitchen_sink'])
-                for operation in more_operations['kitchen_sink']:
-                    tracking_db.apply_operation(update_table_name, operation)
+                if table_name not in removed:
+                    removed[table_name] = alter_table(table_name)
+                    removed_fks.append(removed[table_name])
+                removed[table_name].add_operation(remove_constraint(constraint))
+
+                if table_name not in added:
+                    added[table_name] = alter_table(table_name)
+                    fks.append(added[table_name])
+                # the foreign key isn't changing, so it is the same in db_to
+                added[table_name].add_operation(add_constraint(constraint))
+
+    def _dependency_order(self, tables, table_names):
+        """ Groups tables by foreign key dependencies and sorts the groups so dependencies come first
+
+        Only foreign keys between the tables in table_names are considered.  Each group is a
+        strongly connected component of the dependency graph: a single table, or a set of tables
+        that reference each other in a cycle.  Uses an iterative version of Tarjan's algorithm,
+        which emits each group after every group it depends on.  Tables within a group keep
+        the order from table_names.
+
+        :param tables: The table definitions, by name
+        :param table_names: The names of the tables to sort
+        :type tables: dict
+        :type table_names: [string]
+        :returns: A list of groups (lists of table names), in dependency order
+        :rtype: [[string]]
+        """
+        position = {table_name: i for (i, table_name) in enumerate(table_names)}
+        edges = {}
+        for table_name in table_names:
+            edges[table_name] = [
+                constraint.foreign_table for constraint in tables[table_name].constraints.values()
+                if constraint.foreign_table in position
+            ]
+
+        index = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+        groups = []
+        for start in table_names:
+            if start in index:
+                continue
+
+            # each frame is (table name, iterator over its dependencies)
+            index[start] = lowlink[start] = len(index)
+            stack.append(start)
+            on_stack.add(start)
+            frames = [(start, iter(edges[start]))]
+            while frames:
+                (table_name, dependencies) = frames[-1]
+                dependency = next(dependencies, None)
+                if dependency is not None:
+                    if dependency not in index:
+                        index[dependency] = lowlink[dependency] = len(index)
+                        stack.append(dependency)
+                        on_stack.add(dependency)
+                        frames.append((dependency, iter(edges[dependency])))
+                    elif dependency in on_stack:
+                        lowlink[table_name] = min(lowlink[table_name], index[dependency])
+                    continue
 
-        return operations
+                frames.pop()
+                if frames:
+                    parent = frames[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[table_name])
+
+                if lowlink[table_name] == index[table_name]:
+                    group = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        group.append(member)
+                        if member == table_name:
+                            break
+                    groups.append(sorted(group, key=position.get))
+
+        return groups
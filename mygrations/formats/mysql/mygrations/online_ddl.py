@@ -0,0 +1,356 @@
+import re
+
+from mygrations.formats.mysql.mygrations.operations.alter_table import alter_table
+from mygrations.formats.mysql.mygrations.operations.add_column import add_column
+from mygrations.formats.mysql.mygrations.operations.change_column import change_column
+from mygrations.formats.mysql.mygrations.operations.remove_column import remove_column
+from mygrations.formats.mysql.mygrations.operations.add_key import add_key
+from mygrations.formats.mysql.mygrations.operations.change_key import change_key
+from mygrations.formats.mysql.mygrations.operations.remove_key import remove_key
+from mygrations.formats.mysql.mygrations.operations.add_constraint import add_constraint
+from mygrations.formats.mysql.mygrations.operations.change_constraint import change_constraint
+from mygrations.formats.mysql.mygrations.operations.remove_constraint import remove_constraint
+class online_ddl:
+    """ ddl = online_ddl( mysql_version='8.0.29', foreign_key_checks=False, split=False )
+
+    Works out how InnoDB will run each ALTER TABLE in a plan, for a given version of MySQL
+
+    Every part of an ALTER TABLE (adding a column, dropping a key, etc...) is classified with
+    the ALGORITHM that MySQL can use for it, the weakest LOCK that allows, and whether it
+    rebuilds the table:
+
+    =========  ==============================================================================
+    algorithm  meaning
+    =========  ==============================================================================
+    INSTANT    Only the data dictionary changes (MySQL 8.0.12 and up)
+    INPLACE    No temporary copy of the table, although the table may still be rebuilt in place
+    COPY       The table is copied row by row, and writes are blocked while that happens
+    =========  ==============================================================================
+
+    The ALTER TABLE as a whole gets the slowest algorithm and the strongest lock of its
+    parts, and those are added to the command (i.e. ALGORITHM=INPLACE, LOCK=NONE) so that
+    MySQL refuses to run it rather than quietly doing something more expensive.
+
+    With split=True, the parts that can run instantly are moved out of an ALTER TABLE that
+    rebuilds the table and into their own ALTER TABLE (which runs first), so they take
+    effect right away instead of waiting on the rebuild.  Dropped columns always stay with
+    the rebuild, since dropping a column can also drop the keys on it.
+
+    The rules follow the InnoDB online DDL tables in the MySQL manual.  Anything they don't
+    cover (i.e. changing the type of a column) is classified as COPY.
+
+    :param mysql_version: The version of the MySQL server the plan will run on, i.e. 5.7 or 8.0.35
+    :param foreign_key_checks: Whether the plan runs with foreign key checks on
+    :param split: Whether to split instant changes out of ALTERs that rebuild the table
+    :type mysql_version: string
+    :type foreign_key_checks: bool
+    :type split: bool
+    """
+
+    algorithms = ['INSTANT', 'INPLACE', 'COPY']
+    locks = ['NONE', 'SHARED', 'EXCLUSIVE']
+
+    # the most bytes a character set uses per character, for working out how VARCHAR lengths are stored
+    bytes_per_character = {'latin1': 1, 'ascii': 1, 'binary': 1, 'utf8': 3, 'utf8mb3': 3, 'utf8mb4': 4}
+
+    def __init__(self, mysql_version='8.0.29', foreign_key_checks=False, split=False):
+
+        if not re.match(r'^\d+(\.\d+){0,2}$', str(mysql_version)):
+            raise ValueError('Invalid MySQL version %s: it should look like 5.7 or 8.0.35' % mysql_version)
+
+        parts = [int(part) for part in str(mysql_version).split('.')]
+        self.mysql_version = tuple(parts + [0] * (3 - len(parts)))
+        self.foreign_key_checks = foreign_key_checks
+        self.split = split
+        self._rebuilt_tables = []
+
+    @property
+    def rebuilt_tables(self):
+        """ Public getter.  Returns the names of the tables that the last processed plan rebuilds
+
+        :returns: The table names, in the order they first come up in the plan
+        :rtype: [string]
+        """
+        return self._rebuilt_tables
+
+    def process(self, operations, db_from):
+        """ Classifies and annotates every ALTER TABLE in a list of operations
+
+        The ALTER TABLE operations get algorithm, lock, and rebuilds set (which adds the
+        ALGORITHM and LOCK clauses to their SQL) and are split up if requested.  Anything
+        else is passed through untouched.
+
+        :param operations: The operations in the plan, in order
+        :param db_from: The database the plan will run on
+        :type operations: [mygrations.formats.mysql.mygrations.operations.*]
+        :type db_from: mygrations.formats.mysql.definitions.database
+        :returns: The operations
+        :rtype: [mygrations.formats.mysql.mygrations.operations.*]
+        """
+        self._rebuilt_tables = []
+        processed = []
+        for operation in operations:
+            if not isinstance(operation, alter_table):
+                processed.append(operation)
+                continue
+
+            from_table = db_from.tables[operation.table_name] if operation.table_name in db_from.tables else None
+            for alter in self._split(operation, from_table) if self.split else [operation]:
+                self.annotate(alter, from_table)
+                if alter.rebuilds and alter.table_name not in self._rebuilt_tables:
+                    self._rebuilt_tables.append(alter.table_name)
+                processed.append(alter)
+
+        return processed
+
+    def annotate(self, alter, from_table=None):
+        """ Sets the algorithm, lock, and rebuilds flag of an ALTER TABLE from its parts
+
+        :param alter: The ALTER TABLE to annotate
+        :param from_table: The table before the ALTER runs
+        :type alter: mygrations.formats.mysql.mygrations.operations.alter_table
+        :type from_table: mygrations.formats.mysql.definitions.table
+        """
+        classifications = self._classify_all(alter, from_table)
+        alter.algorithm = max([algorithm for (algorithm, lock, rebuilds) in classifications], key=self.algorithms.index)
+        alter.rebuilds = any([rebuilds for (algorithm, lock, rebuilds) in classifications])
+
+        # LOCK can't be given along with ALGORITHM=INSTANT
+        if alter.algorithm == 'INSTANT':
+            alter.lock = None
+        else:
+            alter.lock = max([lock for (algorithm, lock, rebuilds) in classifications], key=self.locks.index)
+
+    def rebuilds(self, alter, from_table=None):
+        """ Returns whether an ALTER TABLE rebuilds the table, without annotating it
+
+        :param alter: The ALTER TABLE
+        :param from_table: The table before the ALTER runs
+        :type alter: mygrations.formats.mysql.mygrations.operations.alter_table
+        :type from_table: mygrations.formats.mysql.definitions.table
+        :rtype: bool
+        """
+        return any([rebuilds for (algorithm, lock, rebuilds) in self._classify_all(alter, from_table)])
+
+    def classify(self, operation, from_table=None, appended=()):
+        """ Returns how MySQL will run one part of an ALTER TABLE
+
+        Before MySQL 8.0.29 a column can only be added instantly at the end of the table.
+        Columns are at the end if they have no position, or if their name is in appended
+        (see _appended_columns).
+
+        :param operation: The part of the ALTER TABLE (add_column, remove_key, etc...)
+        :param from_table: The table before the ALTER runs (needed to classify changed columns)
+        :param appended: The names of the new columns which go at the end of the table
+        :type operation: mygrations.formats.mysql.mygrations.operations.*
+        :type from_table: mygrations.formats.mysql.definitions.table
+        :type appended: [string]
+        :returns: The algorithm, the lock, and whether the table is rebuilt
+        :rtype: (string, string, bool)
+        """
+        if isinstance(operation, add_column):
+            if operation.column.auto_increment:
+                return ('INPLACE', 'SHARED', True)
+            at_end = not operation.position or operation.column.name in appended
+            if self.mysql_version >= (8, 0, 29) or (self.mysql_version >= (8, 0, 12) and at_end):
+                return ('INSTANT', 'NONE', False)
+            return ('INPLACE', 'NONE', True)
+
+        if isinstance(operation, remove_column):
+            if self.mysql_version >= (8, 0, 29):
+                return ('INSTANT', 'NONE', False)
+            return ('INPLACE', 'NONE', True)
+
+        if isinstance(operation, change_column):
+            old_column = from_table.columns.get(operation.column.name) if from_table else None
+            return self._classify_column_change(old_column, operation.column)
+
+        if isinstance(operation, (add_key, remove_key, change_key)):
+            return self._classify_key_change(operation)
+
+        if isinstance(operation, (add_constraint, change_constraint)):
+            # MySQL can only check the existing rows against a new foreign key by copying the table
+            if self.foreign_key_checks:
+                return ('COPY', 'SHARED', True)
+            return ('INPLACE', 'NONE', False)
+
+        if isinstance(operation, remove_constraint):
+            return ('INPLACE', 'NONE', False)
+
+        return ('COPY', 'SHARED', True)
+
+    def _classify_all(self, alter, from_table):
+        """ Classifies every part of an ALTER TABLE (see classify)
+
+        :param alter: The ALTER TABLE
+        :param from_table: The table before the ALTER runs
+        :type alter: mygrations.formats.mysql.mygrations.operations.alter_table
+        :type from_table: mygrations.formats.mysql.definitions.table
+        :returns: The algorithm, lock, and rebuild flag of each part, in order
+        :rtype: [(string, string, bool)]
+        """
+        appended = self._appended_columns(alter, from_table)
+        return [self.classify(operation, from_table, appended) for operation in alter]
+
+    def _appended_columns(self, alter, from_table):
+        """ Returns the names of the columns that an ALTER TABLE adds to the end of the table
+
+        The planner always gives new columns a position, so a column is at the end if it comes
+        after the last column of the table, or after another new column at the end.
+
+        :param alter: The ALTER TABLE
+        :param from_table: The table before the ALTER runs
+        :type alter: mygrations.formats.mysql.mygrations.operations.alter_table
+        :type from_table: mygrations.formats.mysql.definitions.table
+        :returns: The column names
+        :rtype: set
+        """
+        appended = set()
+        if not from_table or not from_table.columns:
+            return appended
+
+        last_column = next(reversed(from_table.columns))
+        for operation in alter:
+            if isinstance(operation, add_column) and operation.position == last_column:
+                appended.add(operation.column.name)
+                last_column = operation.column.name
+
+        return appended
+
+    def _classify_key_change(self, operation):
+        """ Returns how MySQL will add, drop, or change an index
+
+        :param operation: The add_key, remove_key, or change_key operation
+        :type operation: mygrations.formats.mysql.mygrations.operations.*
+        :returns: The algorithm, the lock, and whether the table is rebuilt
+        :rtype: (string, string, bool)
+        """
+        if operation.key.index_type == 'PRIMARY':
+            # dropping the primary key without adding a new one can only be done by copying
+            if isinstance(operation, remove_key):
+                return ('COPY', 'SHARED', True)
+            return ('INPLACE', 'NONE', True)
+
+        if operation.key.index_type == 'FULLTEXT':
+            if isinstance(operation, remove_key):
+                return ('INPLACE', 'NONE', False)
+            return ('INPLACE', 'SHARED', True)
+
+        if operation.key.index_type == 'SPATIAL' and not isinstance(operation, remove_key):
+            return ('INPLACE', 'SHARED', False)
+
+        return ('INPLACE', 'NONE', False)
+
+    def _classify_column_change(self, old_column, new_column):
+        """ Returns how MySQL will change a column from one definition to another
+
+        :param old_column: The column before the change (or None if it isn't known)
+        :param new_column: The column after the change
+        :type old_column: mygrations.formats.mysql.definitions.column
+        :type new_column: mygrations.formats.mysql.definitions.column
+        :returns: The algorithm, the lock, and whether the table is rebuilt
+        :rtype: (string, string, bool)
+        """
+        if old_column is None:
+            return ('COPY', 'SHARED', True)
+
+        fields = ['column_type', 'length', 'unsigned', 'null', 'default', 'character_set', 'collate', 'auto_increment']
+        changed = set(field for field in fields if getattr(old_column, field) != getattr(new_column, field))
+        metadata_only = ('INSTANT', 'NONE', False) if self.mysql_version >= (8, 0, 12) else ('INPLACE', 'NONE', False)
+
+        if not changed:
+            return metadata_only
+
+        if changed == {'default'}:
+            return metadata_only
+
+        if changed <= {'null', 'default'}:
+            return ('INPLACE', 'NONE', True)
+
+        if changed == {'length'} and old_column.column_type == 'VARCHAR':
+            return self._classify_varchar_change(old_column, new_column)
+
+        if changed == {'length'} and old_column.column_type in ['ENUM', 'SET']:
+            old_values = list(old_column.length)
+            new_values = list(new_column.length)
+            if new_values[:len(old_values)] == old_values and self._set_size(old_column.column_type, old_values) == \
+                    self._set_size(new_column.column_type, new_values):
+                return metadata_only
+
+        return ('COPY', 'SHARED', True)
+
+    def _classify_varchar_change(self, old_column, new_column):
+        """ Returns how MySQL will change the length of a VARCHAR column
+
+        Making a VARCHAR longer only changes metadata, as long as its values still need the
+        same number of bytes to store their length (one byte up to 255 bytes, two after that).
+
+        :param old_column: The column before the change
+        :param new_column: The column after the change
+        :type old_column: mygrations.formats.mysql.definitions.column
+        :type new_column: mygrations.formats.mysql.definitions.column
+        :returns: The algorithm, the lock, and whether the table is rebuilt
+        :rtype: (string, string, bool)
+        """
+        try:
+            old_length = int(old_column.length)
+            new_length = int(new_column.length)
+        except (TypeError, ValueError):
+            return ('COPY', 'SHARED', True)
+
+        character_set = (new_column.character_set or 'utf8mb4').lower()
+        bytes_per_character = self.bytes_per_character.get(character_set, 4)
+        if new_length >= old_length and (old_length * bytes_per_character < 256) == (
+            new_length * bytes_per_character < 256
+        ):
+            return ('INPLACE', 'NONE', False)
+
+        return ('COPY', 'SHARED', True)
+
+    def _set_size(self, column_type, values):
+        """ Returns the number of bytes used to store a value of an ENUM or SET column
+
+        :param column_type: ENUM or SET
+        :param values: The allowed values of the column
+        :type column_type: string
+        :type values: list
+        :returns: The number of bytes
+        :rtype: int
+        """
+        if column_type == 'ENUM':
+            return 1 if len(values) < 256 else 2
+
+        return (len(values) + 7) // 8
+
+    def _split(self, alter, from_table):
+        """ Splits the instant parts of an ALTER TABLE that rebuilds the table into their own ALTER TABLE
+
+        :param alter: The ALTER TABLE to split
+        :param from_table: The table before the ALTER runs
+        :type alter: mygrations.formats.mysql.mygrations.operations.alter_table
+        :type from_table: mygrations.formats.mysql.definitions.table
+        :returns: One or two ALTER TABLE operations, in the order they should run
+        :rtype: [mygrations.formats.mysql.mygrations.operations.alter_table]
+        """
+        instant = alter_table(alter.table_name)
+        rest = alter_table(alter.table_name)
+        for (operation, (algorithm, lock, rebuilds)) in zip(alter, self._classify_all(alter, from_table)):
+            if algorithm == 'INSTANT' and not isinstance(operation, remove_column):
+                instant.add_operation(operation)
+            else:
+                rest.add_operation(operation)
+
+        # a new column positioned after a column that is only added in the rebuild has to wait for it
+        for operation in list(instant):
+            if isinstance(operation, add_column) and type(operation.position) == str and operation.position in [
+                other.column.name for other in rest if isinstance(other, add_column)
+            ]:
+                instant.remove_operation(operation)
+                rest.add_operation(operation)
+
+        # nothing to gain unless the rest of the ALTER is slower than instant
+        rest_algorithms = [algorithm for (algorithm, lock, rebuilds) in self._classify_all(rest, from_table)]
+        if not instant or all([algorithm == 'INSTANT' for algorithm in rest_algorithms]):
+            return [alter]
+
+        return [instant, rest]
@@ -1,13 +1,33 @@
 class alter_table:
-    """ Generates an SQL command to alter a table """
+    """ Generates an SQL command to alter a table
+
+    The algorithm and lock are normally left alone (so MySQL picks them) but can be set to
+    add ALGORITHM and LOCK clauses to the command: see
+    :class:`mygrations.formats.mysql.mygrations.online_ddl`, which also sets rebuilds.
+    """
 
     def __init__(self, table):
         self._table = table
         self._operations = []
+        self.algorithm = None
+        self.lock = None
+        self.rebuilds = None
 
     def add_operation(self, operation):
         self._operations.append(operation)
 
+    def remove_operation(self, operation):
+        self._operations.remove(operation)
+
+    def apply_to_table(self, table):
+        """ Applies all the operations in the alter to the table
+
+        :param table: The table to alter
+        :param type: mygrations.formats.mysql.definitions.table
+        """
+        for operation in self._operations:
+            operation.apply_to_table(table)
+
     @property
     def table_name(self):
         """ Public getter.  Returns the name of the table.
@@ -25,7 +45,12 @@ class alter_table:
         return True if len(self._operations) else False
 
     def __str__(self):
-        return 'ALTER TABLE `%s` %s;' % (self._table, ', '.join([str(x) for x in self._operations]))
+        parts = [str(x) for x in self._operations]
+        if self.algorithm:
+            parts.append('ALGORITHM=%s' % self.algorithm)
+        if self.lock:
+            parts.append('LOCK=%s' % self.lock)
+        return 'ALTER TABLE `%s` %s;' % (self._table, ', '.join(parts))
 
     def __iter__(self):
         return self._operations.__iter__()
@@ -18,5 +18,15 @@ class row_delete:
 
         return self._table_name
 
+    @property
+    def rows_affected(self):
+        """ Public getter.  Returns the number of rows the command changes
+
+        :returns: The number of rows
+        :rtype: int
+        """
+
+        return 1
+
     def __str__(self):
         return 'DELETE FROM `%s` WHERE id=%s;' % (self._table_name, self.row_id)
@@ -0,0 +1,32 @@
+class row_delete_batch:
+    """ Generates a single SQL command to delete several records """
+
+    def __init__(self, table_name, row_ids):
+        if type(table_name) != str:
+            self._table_name = table_name.name
+        else:
+            self._table_name = table_name
+        self.row_ids = row_ids
+
+    @property
+    def table_name(self):
+        """ Public getter.  Returns the name of the table.
+
+        :returns: The table name
+        :rtype: string
+        """
+
+        return self._table_name
+
+    @property
+    def rows_affected(self):
+        """ Public getter.  Returns the number of rows the command changes
+
+        :returns: The number of rows
+        :rtype: int
+        """
+
+        return len(self.row_ids)
+
+    def __str__(self):
+        return 'DELETE FROM `%s` WHERE id IN (%s);' % (self._table_name, ', '.join([str(val) for val in self.row_ids]))
@@ -18,10 +18,34 @@ class row_insert:
 
         return self._table_name
 
-    def __str__(self):
-        cols = ', '.join(['`%s`' % val for val in self.data.keys()])
-        vals = ', '.join([
+    @property
+    def rows_affected(self):
+        """ Public getter.  Returns the number of rows the command changes
+
+        :returns: The number of rows
+        :rtype: int
+        """
+
+        return 1
+
+    def column_list(self):
+        """ Returns the list of columns for the insert
+
+        :returns: The column list, i.e. (`id`, `name`)
+        :rtype: string
+        """
+        return '(%s)' % ', '.join(['`%s`' % val for val in self.data.keys()])
+
+    def value_list(self):
+        """ Returns the list of values for the insert
+
+        :returns: The value list, i.e. ('1', 'bob')
+        :rtype: string
+        """
+        return '(%s)' % ', '.join([
             "'%s'" % str(val).replace('\\', '\\\\').replace("'", "\\'") if val is not None else 'NULL'
             for val in self.data.values()
         ])
-        return 'INSERT INTO `%s` (%s) VALUES (%s);' % (self._table_name, cols, vals)
+
+    def __str__(self):
+        return 'INSERT INTO `%s` %s VALUES %s;' % (self._table_name, self.column_list(), self.value_list())
@@ -0,0 +1,38 @@
+from .row_insert import row_insert
+class row_insert_batch:
+    """ Generates a single SQL command to insert several records
+
+    All the rows must have the same columns (in the same order)
+    """
+
+    def __init__(self, table_name, rows):
+        if type(table_name) != str:
+            self._table_name = table_name.name
+        else:
+            self._table_name = table_name
+        self.rows = rows
+
+    @property
+    def table_name(self):
+        """ Public getter.  Returns the name of the table.
+
+        :returns: The table name
+        :rtype: string
+        """
+
+        return self._table_name
+
+    @property
+    def rows_affected(self):
+        """ Public getter.  Returns the number of rows the command changes
+
+        :returns: The number of rows
+        :rtype: int
+        """
+
+        return len(self.rows)
+
+    def __str__(self):
+        inserts = [row_insert(self._table_name, data) for data in self.rows]
+        values = ', '.join([insert.value_list() for insert in inserts])
+        return 'INSERT INTO `%s` %s VALUES %s;' % (self._table_name, inserts[0].column_list(), values)
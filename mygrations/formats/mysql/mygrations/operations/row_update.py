@@ -21,9 +21,29 @@ class row_update:
 
         return self._table_name
 
+    @property
+    def rows_affected(self):
+        """ Public getter.  Returns the number of rows the command changes
+
+        :returns: The number of rows
+        :rtype: int
+        """
+
+        return 1
+
+    def quote(self, val):
+        """ Returns a value from the row, quoted and escaped (the same way as row_insert) for the update
+
+        :param val: The value
+        :type val: mixed
+        :returns: The quoted value (or NULL)
+        :rtype: string
+        """
+        if val is None:
+            return 'NULL'
+
+        return "'%s'" % str(val).replace('\\', '\\\\').replace("'", "\\'")
+
     def __str__(self):
-        updates = ', '.join([
-            "`%s`='%s'" % (key, str(val).replace('\\', '\\\\')) if val is not None else ('`%s`=NULL' % key)
-            for (key, val) in self.data.items() if key != 'id'
-        ])
+        updates = ', '.join(['`%s`=%s' % (key, self.quote(val)) for (key, val) in self.data.items() if key != 'id'])
         return 'UPDATE `%s` SET %s WHERE id=%s;' % (self._table_name, updates, self.data['id'])
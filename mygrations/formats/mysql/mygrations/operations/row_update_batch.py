@@ -0,0 +1,52 @@
+from .row_update import row_update
+class row_update_batch:
+    """ Generates a single SQL command to update several records
+
+    All the rows must have the same columns (in the same order).  Each column
+    is set with a CASE on the id of the record:
+
+    UPDATE `table` SET `name`=CASE id WHEN 1 THEN 'bob' WHEN 2 THEN 'jane' END WHERE id IN (1, 2);
+    """
+
+    def __init__(self, table_name, rows):
+        for data in rows:
+            if 'id' not in data:
+                raise KeyError('Missing `id` column needed for update')
+
+        if type(table_name) != str:
+            self._table_name = table_name.name
+        else:
+            self._table_name = table_name
+        self.rows = rows
+
+    @property
+    def table_name(self):
+        """ Public getter.  Returns the name of the table.
+
+        :returns: The table name
+        :rtype: string
+        """
+
+        return self._table_name
+
+    @property
+    def rows_affected(self):
+        """ Public getter.  Returns the number of rows the command changes
+
+        :returns: The number of rows
+        :rtype: int
+        """
+
+        return len(self.rows)
+
+    def __str__(self):
+        updates = [row_update(self._table_name, data) for data in self.rows]
+        sets = []
+        for key in self.rows[0].keys():
+            if key == 'id':
+                continue
+            cases = ' '.join(['WHEN %s THEN %s' % (update.data['id'], update.quote(update.data[key])) for update in updates])
+            sets.append('`%s`=CASE id %s END' % (key, cases))
+
+        ids = ', '.join([str(data['id']) for data in self.rows])
+        return 'UPDATE `%s` SET %s WHERE id IN (%s);' % (self._table_name, ', '.join(sets), ids)
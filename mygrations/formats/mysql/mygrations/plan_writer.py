@@ -0,0 +1,232 @@
+import json
+
+from mygrations.formats.mysql.mygrations.operations.create_table import create_table
+from mygrations.formats.mysql.mygrations.operations.remove_table import remove_table
+from mygrations.formats.mysql.mygrations.operations.alter_table import alter_table
+class plan_writer:
+    """ writer = plan_writer( fp, array=False, row_counts=None, fields=None, db_from=None )
+
+    Writes a migration plan as JSON, one record per operation, as the operations come in.
+
+    Each record looks like:
+
+    ==========  ===============================================================================
+    key         value
+    ==========  ===============================================================================
+    id          The position of the operation in the plan, starting from 1
+    table       The name of the table the operation changes (null for SET FOREIGN_KEY_CHECKS)
+    kind        The kind of operation: create_table, alter_table, row_insert_batch, etc...
+    sql         The SQL command for the operation
+    rows        An estimate of the number of rows affected (null if it isn't known)
+    depends_on  The ids of the earlier operations that must finish before this one can run
+    algorithm   The ALGORITHM of an ALTER TABLE, if it has been classified (see online_ddl)
+    lock        The LOCK of an ALTER TABLE, if it has been classified
+    rebuild     Whether an ALTER TABLE rebuilds the table, if it has been classified
+    ==========  ===============================================================================
+
+    An operation depends on the previous operation for the same table, on the previous
+    operations for the tables its table has foreign keys pointing to (i.e. a row inserted
+    into a child table waits on the rows inserted into its parent), and on the previous
+    operations for the tables with foreign keys pointing at its table (i.e. a DROP TABLE waits on
+    the DROP TABLE of a table that references it, and an ALTER TABLE waits on the ALTER
+    TABLE that drops a foreign key pointing at it).  The foreign keys come from db_from
+    (the database the plan runs on) plus any added along the way, and are never forgotten,
+    since an operation that drops a foreign key still has to come first.  An operation
+    without a table (i.e. SET FOREIGN_KEY_CHECKS) is a barrier: it depends on everything
+    before it, and everything after it depends on it.  Anything that can't reach another
+    operation through depends_on can be run in parallel with it.
+
+    By default records are written as NDJSON (one JSON object per line).  Pass array=True
+    to write one JSON array instead.  Either way, nothing but the last operation for each
+    table (and the foreign keys between tables) is remembered, so the memory needed
+    doesn't grow with the size of the plan.
+
+    The number of rows affected by row operations is known exactly.  For structural
+    changes it is the number of rows in the table (since MySQL may have to copy them all),
+    which is only known if row_counts has an entry for the table.
+
+    Any extra fields are added to every record (i.e. the databases that a plan is for).
+
+    :param fp: The file (or any object with a write method) to write the plan to
+    :param array: Whether to write a JSON array instead of NDJSON
+    :param row_counts: The number of rows in each table, by table name
+    :param fields: Extra fields to add to every record
+    :param db_from: The database the plan will run on, for the foreign keys between its tables
+    :type fp: file
+    :type array: bool
+    :type row_counts: dict
+    :type fields: dict
+    :type db_from: mygrations.formats.mysql.definitions.database
+    """
+
+    def __init__(self, fp, array=False, row_counts=None, fields=None, db_from=None):
+
+        self.fp = fp
+        self.array = array
+        self.row_counts = row_counts if row_counts is not None else {}
+        self.fields = fields if fields is not None else {}
+        self._count = 0
+        self._last = {}
+        self._barrier = None
+        self._references = {}
+        self._referenced_by = {}
+
+        if db_from is not None:
+            for table in db_from.tables.values():
+                foreign_tables = [constraint.foreign_table for constraint in table.constraints.values()]
+                self._add_references(table.name, foreign_tables)
+
+    @property
+    def count(self):
+        """ Public getter.  Returns the number of operations written so far
+
+        :returns: The number of operations written
+        :rtype: int
+        """
+        return self._count
+
+    def write(self, operation):
+        """ Writes one operation to the plan
+
+        :param operation: The operation to write
+        :type operation: mygrations.formats.mysql.mygrations.operations.*
+        :returns: The id of the operation in the plan
+        :rtype: int
+        """
+        record = self.record(operation)
+        if self.array:
+            self.fp.write('[\n' if record['id'] == 1 else ',\n')
+            self.fp.write(json.dumps(record))
+        else:
+            self.fp.write('%s\n' % json.dumps(record))
+
+        return record['id']
+
+    def write_all(self, operations):
+        """ Writes operations to the plan (from a list or a generator)
+
+        :param operations: The operations to write
+        :type operations: iterable[mygrations.formats.mysql.mygrations.operations.*]
+        """
+        for operation in operations:
+            self.write(operation)
+
+    def close(self):
+        """ Finishes the plan
+
+        Only needed when writing a JSON array.  The file itself is not closed.
+        """
+        if not self.array:
+            return
+
+        self.fp.write('[]\n' if not self._count else '\n]\n')
+
+    def record(self, operation):
+        """ Returns the record for the next operation in the plan
+
+        :param operation: The operation
+        :type operation: mygrations.formats.mysql.mygrations.operations.*
+        :returns: The record
+        :rtype: dict
+        """
+        self._count += 1
+        table_name = getattr(operation, 'table_name', None)
+        record = {
+            'id': self._count,
+            'table': table_name,
+            'kind': type(operation).__name__,
+            'sql': str(operation),
+            'rows': self._rows_affected(operation),
+            'depends_on': self._dependencies(table_name, operation),
+            'algorithm': getattr(operation, 'algorithm', None),
+            'lock': getattr(operation, 'lock', None),
+            'rebuild': getattr(operation, 'rebuilds', None),
+        }
+        record.update(self.fields)
+
+        if table_name is None:
+            self._barrier = self._count
+            self._last = {}
+        else:
+            self._last[table_name] = self._count
+            self._add_references(table_name, self._foreign_tables(operation))
+
+        return record
+
+    def _dependencies(self, table_name, operation):
+        """ Returns the ids of the earlier operations that an operation has to wait for
+
+        :param table_name: The name of the table the operation changes (or None)
+        :param operation: The operation
+        :type table_name: string|None
+        :type operation: mygrations.formats.mysql.mygrations.operations.*
+        :returns: The ids of the operations, in order
+        :rtype: [int]
+        """
+        if table_name is None:
+            depends_on = set(self._last.values())
+        else:
+            depends_on = set()
+            related_tables = [
+                table_name,
+                *self._foreign_tables(operation),
+                *self._references.get(table_name, ()),
+                *self._referenced_by.get(table_name, ()),
+            ]
+            for related_table in related_tables:
+                if related_table in self._last:
+                    depends_on.add(self._last[related_table])
+
+        if not depends_on and self._barrier is not None:
+            depends_on.add(self._barrier)
+
+        return sorted(depends_on)
+
+    def _add_references(self, table_name, foreign_tables):
+        """ Records that a table has foreign keys pointing to some other tables
+
+        :param table_name: The name of the table with the foreign keys
+        :param foreign_tables: The names of the tables they point to
+        :type table_name: string
+        :type foreign_tables: [string]
+        """
+        for foreign_table in foreign_tables:
+            if foreign_table != table_name:
+                self._references.setdefault(table_name, set()).add(foreign_table)
+                self._referenced_by.setdefault(foreign_table, set()).add(table_name)
+
+    def _foreign_tables(self, operation):
+        """ Returns the names of the tables that the foreign keys added or dropped by an operation point to
+
+        :param operation: The operation
+        :type operation: mygrations.formats.mysql.mygrations.operations.*
+        :returns: The table names
+        :rtype: [string]
+        """
+        if isinstance(operation, create_table):
+            return [constraint.foreign_table for constraint in operation.table.constraints.values()]
+
+        if isinstance(operation, alter_table):
+            return [part.constraint.foreign_table for part in operation if hasattr(part, 'constraint')]
+
+        return []
+
+    def _rows_affected(self, operation):
+        """ Returns an estimate of the number of rows an operation affects
+
+        :param operation: The operation
+        :type operation: mygrations.formats.mysql.mygrations.operations.*
+        :returns: The number of rows, or None if it isn't known
+        :rtype: int|None
+        """
+        # row operations know exactly
+        if hasattr(operation, 'rows_affected'):
+            return operation.rows_affected
+
+        if isinstance(operation, create_table):
+            return 0
+
+        if isinstance(operation, (alter_table, remove_table)):
+            return self.row_counts.get(operation.table_name)
+
+        return None
@@ -0,0 +1,130 @@
+from mygrations.formats.mysql.mygrations.operations.row_insert import row_insert
+from mygrations.formats.mysql.mygrations.operations.row_delete import row_delete
+from mygrations.formats.mysql.mygrations.operations.row_update import row_update
+from mygrations.formats.mysql.mygrations.operations.row_insert_batch import row_insert_batch
+from mygrations.formats.mysql.mygrations.operations.row_delete_batch import row_delete_batch
+from mygrations.formats.mysql.mygrations.operations.row_update_batch import row_update_batch
+class row_batcher:
+    """ batcher = row_batcher( max_rows=1000, max_packet_size=1048576 )
+
+    Combines row operations into fewer, larger SQL commands.
+
+    A row mygration normally has one operation per row, which means one round-trip per
+    row when the plan is applied.  The batcher combines consecutive operations on the
+    same table:
+
+    ==========  ===============================================================
+    operation   combined into
+    ==========  ===============================================================
+    row_insert  One multi-row INSERT, as long as the rows have the same columns
+    row_delete  One DELETE ... WHERE id IN (...)
+    row_update  One UPDATE with a CASE per column, as long as the rows have the same columns
+    ==========  ===============================================================
+
+    Batches are capped by both the number of rows and the size of the SQL command, so
+    that no command is larger than max_packet_size (i.e. the max_allowed_packet of the
+    server).  A single row that is larger than max_packet_size is left on its own.
+    Any other kind of operation is passed through untouched (and ends the current batch).
+
+    :param max_rows: The maximum number of rows in one command
+    :param max_packet_size: The maximum size of one command, in bytes
+    :type max_rows: int
+    :type max_packet_size: int
+    """
+
+    def __init__(self, max_rows=1000, max_packet_size=1048576):
+
+        if max_rows < 1:
+            raise ValueError('max_rows for row batches must be at least 1')
+
+        if max_packet_size < 1:
+            raise ValueError('max_packet_size for row batches must be at least 1')
+
+        self.max_rows = max_rows
+        self.max_packet_size = max_packet_size
+
+    def batch(self, operations):
+        """ Returns a new list of operations with row operations combined into batches
+
+        :param operations: The operations to batch
+        :type operations: [mygrations.formats.mysql.mygrations.operations.*]
+        :returns: The batched operations
+        :rtype: [mygrations.formats.mysql.mygrations.operations.*]
+        """
+        return list(self.stream(operations))
+
+    def stream(self, operations):
+        """ Generates the operations with row operations combined into batches, one at a time
+
+        Only the current batch is held in memory, so operations can come from (and go to)
+        a generator of any size.
+
+        :param operations: The operations to batch
+        :type operations: iterable[mygrations.formats.mysql.mygrations.operations.*]
+        :returns: A generator of batched operations
+        :rtype: generator[mygrations.formats.mysql.mygrations.operations.*]
+        """
+        group = []
+        group_key = None
+        group_size = 0
+        for operation in operations:
+            key = self._group_key(operation)
+
+            # every row in a batch costs (at most) as much as its own command
+            size = len(str(operation).encode('utf-8')) if key else 0
+            if group and (
+                key != group_key or len(group) >= self.max_rows or group_size + size > self.max_packet_size
+            ):
+                yield self._combine(group)
+                group = []
+                group_size = 0
+
+            if not key:
+                yield operation
+                continue
+
+            group.append(operation)
+            group_key = key
+            group_size += size
+
+        if group:
+            yield self._combine(group)
+
+    def _group_key(self, operation):
+        """ Returns a key which is the same for operations that can go in the same batch
+
+        :param operation: The operation
+        :type operation: mygrations.formats.mysql.mygrations.operations.*
+        :returns: The key, or None if the operation can't be batched
+        :rtype: tuple|None
+        """
+        if isinstance(operation, row_insert):
+            return ('insert', operation.table_name, tuple(operation.data.keys()))
+
+        if isinstance(operation, row_delete):
+            return ('delete', operation.table_name)
+
+        if isinstance(operation, row_update):
+            return ('update', operation.table_name, tuple(operation.data.keys()))
+
+        return None
+
+    def _combine(self, group):
+        """ Combines a list of compatible row operations into one operation
+
+        :param group: The operations to combine
+        :type group: list
+        :returns: The combined operation (or the operation itself if there is only one)
+        :rtype: mygrations.formats.mysql.mygrations.operations.*
+        """
+        if len(group) == 1:
+            return group[0]
+
+        first = group[0]
+        if isinstance(first, row_insert):
+            return row_insert_batch(first.table_name, [operation.data for operation in group])
+
+        if isinstance(first, row_delete):
+            return row_delete_batch(first.table_name, [operation.row_id for operation in group])
+
+        return row_update_batch(first.table_name, [operation.data for operation in group])
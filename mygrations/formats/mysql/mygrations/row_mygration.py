@@ -11,7 +11,7 @@ class row_mygration:
     tracking_rows
     """
 
-    def __init__(self, db_to, db_from=None):
+    def __init__(self, db_to, db_from=None, batcher=None):
         """ Create a migration plan
 
         The row migrator assumes that both databases have already read rows into the
@@ -29,18 +29,23 @@ class row_mygration:
         >>>         continue
         >>>     live_database.read_rows( table )
 
+        Row operations can optionally be combined into multi-row commands by passing
+        in a batcher.
+
         :param db_to: The target database rows to migrate to
         :param db_from: The current database rows to migrate from
+        :param batcher: An optional batcher to combine row operations with
         :type db_to: mygrations.formats.mysql.definitions.database
         :type db_from: mygrations.formats.mysql.definitions.database
+        :type batcher: mygrations.formats.mysql.mygrations.row_batcher
         """
         self.db_to = db_to
         self.db_from = db_from
+        self.batcher = batcher
 
-        # unlike with the structure migration, we figure out what are operations
-        # are and then make sure those operations won't cause any 1215 errors
-        self._operations = self._process()
-
+        # the operations are only figured out when they are asked for, since a plan
+        # writer can stream them instead (see stream())
+        self._operations = None
         self._errors_1215 = []
 
     @property
@@ -56,6 +61,9 @@ class row_mygration:
         :returns: A list of table row operations
         :rtype: None|[mygrations.formats.mysql.mygrations.operations.operation]
         """
+        if self._operations is None:
+            self._operations = list(self.stream())
+
         return self._operations
 
     @property
@@ -68,35 +76,44 @@ class row_mygration:
         return self._errors_1215
 
     def __len__(self):
-        return len(self._operations)
+        return len(self.operations)
 
     def __bool__(self):
-        return True if len(self._operations) else False
+        return True if len(self.operations) else False
 
     def __str__(self):
-        return "\n".join([str(x) for x in self._operations])
+        return "\n".join([str(x) for x in self.operations])
 
     def __iter__(self):
-        return self._operations.__iter__()
+        return self.operations.__iter__()
+
+    def stream(self):
+        """ Generates the operations needed to bring rows in db_from to match db_to, one at a time
+
+        The operations are the same as the ones in `operations` (batched, if there is a
+        batcher) but they are built as they are needed and never stored, so a plan for
+        millions of rows can be written out without holding it in memory.
+
+        :returns: A generator of table row operations
+        :rtype: generator[mygrations.formats.mysql.mygrations.operations.*]
+        """
+        operations = self._process()
+        if self.batcher is not None:
+            operations = self.batcher.stream(operations)
+
+        return operations
 
     def _process(self):
         """ Figures out the row operations needed to get to self.db_to
 
-        Returns a list of operations that will migrate rows in db_from to db_to
+        Generates the operations that will migrate rows in db_from to db_to
 
         :return: Operations needed to complete the migration
-        :rtype: [mygrations.formats.mysql.mygrations.operations]
+        :rtype: generator[mygrations.formats.mysql.mygrations.operations]
         """
-        operations = []
         tracking_tables = [table.name for table in self.db_to.tables.values() if table.tracking_rows]
         for table_name in tracking_tables:
             from_table = self.db_from.tables[table_name] if (
                 self.db_from and table_name in self.db_from.tables
             ) else None
-            more_operations = self.db_to.tables[table_name].to_rows(from_table)
-            if not more_operations:
-                continue
-
-            operations.extend(more_operations)
-
-        return operations
+            yield from self.db_to.tables[table_name].row_operations(from_table)
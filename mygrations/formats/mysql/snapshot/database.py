@@ -0,0 +1,132 @@
+import io
+import zlib
+import pickle
+import struct
+
+import mygrations
+from mygrations.formats.mysql.definitions.database import database as database_definition
+from mygrations.formats.mysql.definitions.compact import pack_table, unpack_table, pack_rows, unpack_rows
+
+# every snapshot file starts with this, followed by the format version
+magic = b'MYGRSNAP'
+header = struct.Struct('>8sH')
+
+# bump this if the layout of the snapshot ever changes
+format_version = 1
+def save(source, filename):
+    """ Writes a snapshot of a database (structure and any tracked rows) to a file
+
+    The source can be any database definition: one parsed out of *.sql files, one read
+    from a live server, or one loaded from another snapshot.  The file is a short header
+    (a magic string and the format version) followed by a zlib compressed pickle of plain
+    values (see :mod:`mygrations.formats.mysql.definitions.compact`), so loading it doesn't
+    require parsing any SQL or connecting to anything.
+
+    :param source: The database to take a snapshot of
+    :param filename: The file to write the snapshot to
+    :type source: mygrations.formats.mysql.definitions.database
+    :type filename: string
+    """
+    tables = []
+    for table_name in sorted(source.tables):
+        table = source.tables[table_name]
+        tables.append((pack_table(table), pack_rows(table)))
+
+    payload = {'mygrations_version': mygrations.__version__, 'tables': tables}
+    with open(filename, 'wb') as fp:
+        fp.write(header.pack(magic, format_version))
+        fp.write(zlib.compress(pickle.dumps(payload, pickle.HIGHEST_PROTOCOL)))
+class snapshot_unpickler(pickle.Unpickler):
+    """ Unpickler that refuses to build anything but plain values
+
+    Snapshots contain only strings, numbers, tuples, lists, dicts, and the types that
+    MySQLdb returns for row values.  Refusing everything else means that loading a
+    snapshot can't be used to run arbitrary code.
+    """
+
+    allowed = {
+        ('decimal', 'Decimal'),
+        ('datetime', 'date'),
+        ('datetime', 'datetime'),
+        ('datetime', 'time'),
+        ('datetime', 'timedelta'),
+    }
+
+    def find_class(self, module, name):
+
+        if (module, name) not in self.allowed:
+            raise ValueError('Snapshot contains unsupported value of type %s.%s' % (module, name))
+
+        return super().find_class(module, name)
+class database(database_definition):
+    def __init__(self, filename):
+        """ Loads a database definition out of a snapshot file written by save()
+
+        Tables that were tracking rows when the snapshot was taken come back with their rows.
+
+        :param filename: The snapshot file to load
+        :type filename: string
+        """
+        super().__init__()
+        self.filename = filename
+
+        with open(filename, 'rb') as fp:
+            contents = fp.read()
+
+        if len(contents) < header.size:
+            raise ValueError('File %s is not a mygrations snapshot' % filename)
+
+        (file_magic, file_version) = header.unpack_from(contents)
+        if file_magic != magic:
+            raise ValueError('File %s is not a mygrations snapshot' % filename)
+        if file_version != format_version:
+            raise ValueError(
+                'Snapshot %s has format version %d but this version of mygrations reads version %d' %
+                (filename, file_version, format_version)
+            )
+
+        try:
+            payload = snapshot_unpickler(io.BytesIO(zlib.decompress(contents[header.size:]))).load()
+        except (zlib.error, pickle.UnpicklingError, EOFError) as e:
+            raise ValueError('Snapshot %s is corrupt: %s' % (filename, e))
+
+        self.mygrations_version = payload['mygrations_version']
+        for (packed_table, packed_rows) in payload['tables']:
+            table = unpack_table(packed_table)
+            unpack_rows(table, packed_rows)
+            self._tables[table.name] = table
+
+    def read_rows(self, table, batch_size=1000):
+        """ Checks that the snapshot has rows for a table
+
+        The rows themselves were loaded along with the snapshot, but only for the tables
+        that were tracking rows when the snapshot was taken.  This has the same signature as
+        :meth:`mygrations.formats.mysql.db_reader.database.read_rows` so that a snapshot
+        can stand in for the live database.
+
+        :param table: The table to read rows for
+        :param batch_size: Ignored
+        :type table: string|mygrations.formats.mysql.definitions.table
+        :type batch_size: int
+        """
+        if type(table) != str:
+            table = table.name
+
+        if not table in self.tables:
+            raise ValueError("Cannot read rows for table %s because that table is not found in the snapshot" % table)
+
+        if not self.tables[table].tracking_rows:
+            raise ValueError(
+                "Snapshot %s does not have the rows for table %s: take a new snapshot" % (self.filename, table)
+            )
+
+    def read_many_rows(self, tables, batch_size=1000):
+        """ Checks that the snapshot has rows for several tables (see read_rows)
+
+        :param tables: The tables to read rows for
+        :param batch_size: Ignored
+        :type tables: [string|mygrations.formats.mysql.definitions.table]
+        :type batch_size: int
+        """
+        for table in tables:
+            self.read_rows(table, batch_size)
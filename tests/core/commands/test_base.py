@@ -0,0 +1,62 @@
+import unittest
+
+from mygrations.core.commands.base import base
+from mygrations.formats.mysql.file_reader.database import database as database_reader
+from mygrations.formats.mysql.mygrations.mygration import mygration
+class test_base(unittest.TestCase):
+
+    accounts = "CREATE TABLE `accounts` (`id` INT(10) UNSIGNED NOT NULL AUTO_INCREMENT, PRIMARY KEY (`id`));"
+    users = """CREATE TABLE `users` (`id` INT(10) UNSIGNED NOT NULL AUTO_INCREMENT,
+        `account_id` INT(10) UNSIGNED NOT NULL,
+        PRIMARY KEY (`id`),
+        KEY `account_id` (`account_id`),
+        CONSTRAINT `users_account` FOREIGN KEY (`account_id`) REFERENCES `accounts` (`id`)
+        );"""
+
+    def _command(self, config=None):
+
+        options = {
+            'env': 'DB_HOST=localhost\nDB_USER=user\nDB_PASSWORD=pass\nDB_NAME=app',
+            'config': '\n'.join([
+                'hostname_key=DB_HOST',
+                'username_key=DB_USER',
+                'password_key=DB_PASSWORD',
+                'database_key=DB_NAME',
+                'files_directory=.',
+            ] + (config or [])),
+        }
+
+        return base(options)
+
+    def _operations(self):
+
+        # the foreign key is dropped in one ALTER TABLE, and the new column is added in another
+        users_to = self.users.replace('CONSTRAINT `users_account` FOREIGN KEY', '`age` INT(10) NOT NULL,\nKEY `x`')
+        users_to = users_to.replace('REFERENCES `accounts` (`id`)', '')
+        db_from = database_reader([self.accounts, self.users])
+        db_to = database_reader([self.accounts, users_to])
+
+        return (mygration(db_to, db_from, False).operations, db_from)
+
+    def test_coalesce_alters_is_off_by_default(self):
+
+        command = self._command()
+        (operations, db_from) = self._operations()
+        (coalesced, coalescer) = command.coalesce(operations, db_from)
+
+        self.assertFalse(command.coalesce_alters)
+        self.assertIsNone(coalescer)
+        self.assertEquals([str(operation) for operation in operations], [str(operation) for operation in coalesced])
+
+    def test_coalesce_alters(self):
+
+        command = self._command(['coalesce_alters=true'])
+        (operations, db_from) = self._operations()
+        (coalesced, coalescer) = command.coalesce(operations, db_from)
+
+        self.assertTrue(command.coalesce_alters)
+        self.assertEquals(2, len(operations))
+        self.assertEquals(1, len(coalesced))
+        self.assertEquals(1, coalescer.merged)
+
+        self.assertFalse(self._command(['coalesce_alters=false']).coalesce_alters)
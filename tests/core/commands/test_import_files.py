@@ -0,0 +1,74 @@
+import io
+import os
+import tempfile
+import unittest
+
+from contextlib import redirect_stdout
+from mygrations.core.commands.import_files import import_files
+from mygrations.drivers.mysqldb.mysqldb import mysqldb
+from tests.mocks.db.mysql.db_structure import db_structure
+class mock_import_files(import_files):
+    """ Imports into a mock connection instead of connecting to a database """
+
+    connection = None
+
+    def connect(self, credentials):
+        return mysqldb(self.connection)
+class test_import_files(unittest.TestCase):
+
+    accounts = """CREATE TABLE `accounts` (`id` INT(10) UNSIGNED NOT NULL AUTO_INCREMENT,
+        `name` VARCHAR(255) NOT NULL DEFAULT '',
+        PRIMARY KEY (`id`)
+        ) ENGINE=InnoDB;"""
+
+    def _import(self, extra_options=None):
+
+        with tempfile.TemporaryDirectory() as files_directory:
+            with open(os.path.join(files_directory, 'accounts.sql'), 'w') as fp:
+                fp.write(self.accounts.replace('255', '100'))
+                fp.write("\nINSERT INTO `accounts` (`id`, `name`) VALUES (1, 'bob');")
+
+            options = {
+                'env': 'DB_HOST=localhost\nDB_USER=user\nDB_PASSWORD=pass\nDB_NAME=app',
+                'config': '\n'.join([
+                    'hostname_key=DB_HOST',
+                    'username_key=DB_USER',
+                    'password_key=DB_PASSWORD',
+                    'database_key=DB_NAME',
+                    'files_directory=%s' % files_directory,
+                ]),
+                'force': False
+            }
+            options.update(extra_options or {})
+
+            command = mock_import_files(options)
+            command.connection = db_structure({'accounts': self.accounts}, {'accounts': []})
+            stdout = io.StringIO()
+            with redirect_stdout(stdout):
+                command.execute()
+
+        return (command.connection.statements, stdout.getvalue().splitlines())
+
+    def test_rows_run_with_checks_off(self):
+
+        (statements, lines) = self._import()
+
+        # one pair of SET FOREIGN_KEY_CHECKS around everything, rows included
+        self.assertEquals('SET FOREIGN_KEY_CHECKS=0;', statements[0])
+        self.assertTrue(statements[1].startswith('ALTER TABLE `accounts`'))
+        self.assertTrue(statements[2].startswith('INSERT INTO `accounts`'))
+        self.assertEquals(['COMMIT', 'SET FOREIGN_KEY_CHECKS=1;'], statements[3:])
+
+        # and how long each one took
+        self.assertEquals(4, len(lines))
+        self.assertTrue(lines[0].endswith('s  SET FOREIGN_KEY_CHECKS=0;'))
+        self.assertTrue(lines[2].endswith("s  INSERT INTO `accounts` (`id`, `name`) VALUES ('1', 'bob');"))
+
+    def test_fk_checks(self):
+
+        (statements, lines) = self._import({'fk_checks': True})
+
+        self.assertEquals(3, len(statements))
+        self.assertTrue(statements[0].startswith('ALTER TABLE `accounts`'))
+        self.assertTrue(statements[1].startswith('INSERT INTO `accounts`'))
+        self.assertEquals('COMMIT', statements[2])
@@ -0,0 +1,92 @@
+import io
+import os
+import tempfile
+import unittest
+
+from contextlib import redirect_stdout, redirect_stderr
+from mygrations.core.commands.plan import plan
+from mygrations.drivers.mysqldb.mysqldb import mysqldb
+from tests.mocks.db.mysql.db_structure import db_structure
+class mock_plan(plan):
+    """ Plans against a mock connection instead of connecting to a database """
+
+    connection = None
+
+    def connect(self, credentials):
+        return mysqldb(self.connection)
+class test_plan(unittest.TestCase):
+
+    accounts = """CREATE TABLE `accounts` (`id` INT(10) UNSIGNED NOT NULL AUTO_INCREMENT,
+        `name` VARCHAR(255) NOT NULL DEFAULT '',
+        PRIMARY KEY (`id`)
+        ) ENGINE=InnoDB;"""
+
+    def _plan(self, extra_options=None, fail_on=None):
+
+        with tempfile.TemporaryDirectory() as files_directory:
+            with open(os.path.join(files_directory, 'accounts.sql'), 'w') as fp:
+                fp.write(self.accounts.replace('255', '100'))
+                fp.write("\nINSERT INTO `accounts` (`id`, `name`) VALUES (1, 'bob');")
+
+            options = {
+                'env': 'DB_HOST=localhost\nDB_USER=user\nDB_PASSWORD=pass\nDB_NAME=app',
+                'config': '\n'.join([
+                    'hostname_key=DB_HOST',
+                    'username_key=DB_USER',
+                    'password_key=DB_PASSWORD',
+                    'database_key=DB_NAME',
+                    'files_directory=%s' % files_directory,
+                ]),
+                'force': False
+            }
+            options.update(extra_options or {})
+
+            command = mock_plan(options)
+            command.connection = db_structure({'accounts': self.accounts}, {'accounts': []},
+                                              [('accounts', 1000, 1048576, 0)])
+            command.connection.fail_on = fail_on
+
+            (stdout, stderr) = (io.StringIO(), io.StringIO())
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                result = command.execute()
+
+        return (result, stdout.getvalue().splitlines(), stderr.getvalue())
+
+    def test_no_statistics_by_default(self):
+
+        # the statistics query would fail, so the plan can only be written if it isn't run
+        (result, lines, stderr) = self._plan(fail_on='information_schema.TABLES')
+
+        self.assertTrue(result)
+        self.assertEquals('SET FOREIGN_KEY_CHECKS=0;', lines[0])
+        self.assertTrue(lines[1].startswith('ALTER TABLE `accounts`'))
+        self.assertTrue(lines[2].startswith('INSERT INTO `accounts`'))
+        self.assertEquals(['SET FOREIGN_KEY_CHECKS=1;'], lines[3:])
+
+    def test_cost_summary_follows_the_plan(self):
+
+        (result, lines, stderr) = self._plan({'cost': True})
+
+        self.assertTrue(result)
+        self.assertEquals('SET FOREIGN_KEY_CHECKS=1;', lines[3])
+        self.assertTrue(lines[4].startswith('-- Estimated cost: '))
+        alter = "ALTER TABLE `accounts` CHANGE `name` `name` VARCHAR(100) NOT NULL DEFAULT '';"
+        self.assertTrue(lines[5].endswith(alter))
+        self.assertTrue(lines[6].endswith('Row changes to `accounts`'))
+        self.assertEquals(7, len(lines))
+
+    def test_max_cost(self):
+
+        (result, lines, stderr) = self._plan({'max_cost': 0.001})
+
+        # nothing is written, and the summary explains why
+        self.assertFalse(result)
+        self.assertEquals([], lines)
+        self.assertTrue(stderr.startswith('Refusing to write a plan estimated to take'))
+        self.assertTrue('-- Estimated cost: ' in stderr)
+
+        (result, lines, stderr) = self._plan({'max_cost': 600})
+
+        self.assertTrue(result)
+        self.assertEquals(4, len(lines))
+        self.assertEquals('', stderr)
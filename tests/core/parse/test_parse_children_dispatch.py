@@ -0,0 +1,73 @@
+import unittest
+
+from mygrations.core.parse.rule_children import rule_children
+from mygrations.core.parse.parser import parser
+class dispatch_bob(parser):
+
+    dispatch_keys = ('bob', )
+    rules = [{'type': 'literal', 'value': 'bob'}, {'type': 'regexp', 'name': 'number', 'value': r'\d+'}]
+class dispatch_bob_long(parser):
+
+    dispatch_keys = ('bob', )
+    rules = [{'type': 'literal', 'value': 'bob'}, {'type': 'regexp', 'name': 'number', 'value': r'\d+ \d+'}]
+class dispatch_anything(parser):
+
+    rules = [{'type': 'regexp', 'name': 'word', 'value': r'\w+'}]
+class dispatch_counter(parser):
+
+    dispatch_keys = ('greg', )
+    created = 0
+    rules = [{'type': 'literal', 'value': 'greg'}]
+
+    def __init__(self, rules=[]):
+
+        super().__init__(rules)
+        dispatch_counter.created += 1
+def first_word(string):
+
+    return string.split(' ')[0].lower()
+class test_parse_children_dispatch(unittest.TestCase):
+    def get_rule(self, classes):
+
+        return rule_children(False, {'name': 'test', 'classes': classes, 'dispatch': first_word}, {})
+
+    def test_candidates_keep_order(self):
+
+        rule = self.get_rule([dispatch_anything, dispatch_bob, dispatch_counter, dispatch_bob_long])
+
+        self.assertEquals([dispatch_anything, dispatch_bob, dispatch_bob_long], rule.candidates['bob'])
+        self.assertEquals([dispatch_anything, dispatch_counter], rule.candidates['greg'])
+
+    def test_largest_match_wins_among_candidates(self):
+
+        rule = self.get_rule([dispatch_bob, dispatch_bob_long])
+
+        self.assertTrue(rule.parse('bob 12 34'))
+        self.assertEquals(1, len(rule.result))
+        self.assertTrue(rule.result[0].__class__ == dispatch_bob_long)
+        self.assertEquals('', rule.leftovers)
+
+    def test_only_candidates_are_tried(self):
+
+        rule = self.get_rule([dispatch_bob, dispatch_counter])
+        dispatch_counter.created = 0
+
+        self.assertTrue(rule.parse('bob 12 bob 34'))
+        self.assertEquals(0, dispatch_counter.created)
+
+    def test_falls_back_to_all_classes(self):
+
+        # nobody has keys for 'sup', and dispatch_bob can't match a lone 'bob'
+        rule = self.get_rule([dispatch_bob, dispatch_anything])
+
+        self.assertTrue(rule.parse('sup bob'))
+        self.assertEquals(2, len(rule.result))
+        self.assertTrue(rule.result[0].__class__ == dispatch_anything)
+        self.assertTrue(rule.result[1].__class__ == dispatch_anything)
+
+    def test_no_child_limit(self):
+
+        rule = self.get_rule([dispatch_counter])
+
+        self.assertTrue(rule.parse(' '.join(['greg'] * 1500)))
+        self.assertEquals(1500, len(rule.result))
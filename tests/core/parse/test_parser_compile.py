@@ -0,0 +1,56 @@
+import unittest
+
+from mygrations.core.parse.parser import parser
+class compile_parent(parser):
+
+    rules = [{'type': 'literal', 'value': 'bob'}, {'type': 'regexp', 'name': 'number', 'value': r'\d+'}]
+class compile_child(compile_parent):
+
+    rules = [{'type': 'regexp', 'name': 'word', 'value': r'\w+'}]
+class test_parser_compile(unittest.TestCase):
+    def test_program_shared_by_class(self):
+
+        first = compile_parent()
+        second = compile_parent()
+
+        self.assertTrue(first._program is second._program)
+        self.assertEquals(2, len(first._program))
+
+    def test_subclass_gets_own_program(self):
+
+        parent = compile_parent()
+        child = compile_child()
+
+        self.assertFalse(parent._program is child._program)
+        self.assertEquals(1, len(child._program))
+
+    def test_regexp_is_precompiled(self):
+
+        (rule_parser, optional, required_after) = compile_parent()._program[1]
+
+        self.assertEquals(r'\d+', rule_parser.regexp)
+        self.assertTrue(rule_parser.pattern.match('123'))
+
+    def test_shared_rules_keep_no_state(self):
+
+        first = compile_parent()
+        second = compile_parent()
+
+        self.assertEquals('', first.parse('bob\n  12'))
+        self.assertEquals('', second.parse('bob 34'))
+        self.assertEquals('12', first['number'])
+        self.assertEquals('34', second['number'])
+
+    def test_explicit_rules_are_not_cached(self):
+
+        custom = compile_parent([{'type': 'literal', 'value': 'greg'}])
+        regular = compile_parent()
+
+        self.assertEquals(1, len(custom._program))
+        self.assertEquals(2, len(regular._program))
+        self.assertTrue(custom.parse('greg') == '' and custom.matched)
+
+    def test_missing_type(self):
+
+        with self.assertRaises(ValueError):
+            compile_parent([{'value': 'greg'}])
@@ -0,0 +1,116 @@
+import threading
+import unittest
+
+from mygrations.drivers.mysqldb.mysqldb_pool import mysqldb_pool
+from mygrations.formats.mysql.db_reader.database import database as database_reader
+from tests.mocks.db.mysql.db_structure import db_structure
+from tests.mocks.db.mysql.information_schema import information_schema
+class waiting_db_structure(db_structure):
+    """ A mock connection whose queries (other than SHOW TABLES) wait until every connection is running one """
+
+    def __init__(self, tables, table_rows, barrier):
+
+        super().__init__(tables, table_rows)
+        self.barrier = barrier
+
+    def execute(self, query):
+
+        if query != 'SHOW TABLES':
+            self.barrier.wait()
+
+        super().execute(query)
+class test_mysqldb_pool(unittest.TestCase):
+    def _get_tables(self):
+
+        columns = "`id` int(10) unsigned NOT NULL AUTO_INCREMENT, `name` VARCHAR(255) NOT NULL DEFAULT ''"
+        return {
+            name: 'CREATE TABLE `%s` (%s, PRIMARY KEY (`id`)) ENGINE=InnoDB;' % (name, columns)
+            for name in ['accounts', 'logs', 'users']
+        }
+
+    def _connect(self, tables, rows, size):
+
+        # a query only gets through once `size` connections are running a query at the same time,
+        # so nothing finishes unless the pool really is running them concurrently
+        barrier = threading.Barrier(size, timeout=5)
+        connections = []
+
+        def connect():
+            connections.append(waiting_db_structure(tables, rows, barrier))
+            return connections[-1]
+
+        return (mysqldb_pool(connect, size), connections)
+
+    def test_tables(self):
+
+        (driver, connections) = self._connect(self._get_tables(), {}, 3)
+
+        self.assertEquals(3, len(connections))
+        self.assertEquals(['accounts', 'logs', 'users'], list(driver.tables().keys()))
+
+    def test_read_many_rows(self):
+
+        rows = {
+            'accounts': [{'id': 1, 'name': 'bob'}, {'id': 2, 'name': 'jane'}],
+            'logs': [{'id': 5, 'name': 'started'}],
+            'users': [{'id': 3, 'name': 'sue'}],
+        }
+        (driver, connections) = self._connect(self._get_tables(), rows, 3)
+        database = database_reader(driver)
+        database.read_many_rows(['users', database.tables['accounts'], 'logs'])
+
+        self.assertEquals({1: {'id': 1, 'name': 'bob'}, 2: {'id': 2, 'name': 'jane'}}, database.tables['accounts'].rows)
+        self.assertEquals({5: {'id': 5, 'name': 'started'}}, database.tables['logs'].rows)
+        self.assertEquals({3: {'id': 3, 'name': 'sue'}}, database.tables['users'].rows)
+
+        # and every connection went back in the pool
+        self.assertEquals(3, driver._pool.qsize())
+
+    def test_unread_rows_are_closed(self):
+
+        rows = {'accounts': [{'id': 1, 'name': 'bob'}, {'id': 2, 'name': 'jane'}]}
+        (driver, connections) = self._connect(self._get_tables(), rows, 1)
+
+        # a connection is lent out until the rows are closed, even if they are never read
+        (column_names, accounts) = driver.rows('accounts')
+        self.assertEquals(('id', 'name'), column_names)
+        self.assertEquals(0, driver._pool.qsize())
+        accounts.close()
+        self.assertEquals(1, driver._pool.qsize())
+        self.assertEquals([], list(accounts))
+
+        # or until they run out, after which closing them again is harmless
+        (column_names, accounts) = driver.rows('accounts')
+        self.assertEquals(2, len(list(accounts)))
+        self.assertEquals(1, driver._pool.qsize())
+        accounts.close()
+        self.assertEquals(1, driver._pool.qsize())
+
+    def test_information_schema(self):
+
+        queries = []
+
+        def connect():
+            connection = information_schema([('accounts', 'InnoDB', None, None, None)], [], [], [])
+            queries.append(connection.queries)
+            return connection
+
+        driver = mysqldb_pool(connect, 4)
+        results = driver.information_schema()
+
+        self.assertEquals(['tables', 'columns', 'indexes', 'constraints'], list(results.keys()))
+        self.assertEquals([('accounts', 'InnoDB', None, None, None)], results['tables'])
+        self.assertEquals(4, len([query for connection_queries in queries for query in connection_queries]))
+
+    def test_writes_use_the_first_connection(self):
+
+        (driver, connections) = self._connect(self._get_tables(), {}, 1)
+        driver.execute('SET FOREIGN_KEY_CHECKS=0')
+        driver.commit()
+
+        self.assertEquals(['SET FOREIGN_KEY_CHECKS=0', 'COMMIT'], connections[0].statements)
+
+    def test_invalid_size(self):
+
+        with self.assertRaises(ValueError):
+            mysqldb_pool(lambda: None, 0)
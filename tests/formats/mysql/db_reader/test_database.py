@@ -3,6 +3,10 @@ import unittest
 from mygrations.formats.mysql.db_reader.database import database as database_reader
 from mygrations.drivers.mysqldb.mysqldb import mysqldb
 from tests.mocks.db.mysql.db_structure import db_structure
+from tests.mocks.db.mysql.information_schema import information_schema
+from mygrations.formats.mysql.mygrations.operations.row_insert import row_insert
+from mygrations.formats.mysql.mygrations.operations.remove_table import remove_table
+from mygrations.formats.mysql.mygrations.operations.disable_checks import disable_checks
 class test_database(unittest.TestCase):
     def _get_tables(self):
 
@@ -68,3 +72,89 @@ class test_database(unittest.TestCase):
         self.assertEquals(2, rows[2]['id'])
         self.assertEquals('sup', rows[2]['message'])
         self.assertEquals('forever', rows[2]['traceback'])
+
+    def test_read_rows_in_batches(self):
+
+        rows = {'logs': tuple({'id': i, 'message': 'hey', 'traceback': 'never'} for i in range(1, 11))}
+        mock_db = db_structure(self._get_tables(), rows)
+        database = database_reader(mysqldb(mock_db))
+
+        # the rows come back as a stream, so this should work for any batch size
+        database.read_rows('logs', batch_size=3)
+
+        self.assertEquals(list(range(1, 11)), [row_id for row_id in database.tables['logs'].rows])
+        self.assertEquals('never', database.tables['logs'].rows[10]['traceback'])
+        self.assertFalse(mock_db.executed)
+
+    def test_apply_operations(self):
+
+        mock_db = db_structure(self._get_tables(), {})
+        database = database_reader(mysqldb(mock_db))
+
+        operations = [disable_checks()]
+        operations.extend([row_insert('logs', {'id': i, 'message': 'hey'}) for i in range(1, 6)])
+        operations.append(remove_table('more_logs'))
+        operations.append(row_insert('logs', {'id': 6, 'message': 'hey'}))
+        timings = database.apply_operations(operations, transaction_size=2)
+
+        self.assertEquals(len(operations), len(timings))
+        self.assertTrue(timings[1][0] is operations[1])
+        self.assertTrue(all([seconds >= 0 for (op, seconds) in timings]))
+
+        # rows are committed in groups of two, and always before structure changes
+        statements = ['COMMIT' if statement == 'COMMIT' else statement[:6] for statement in mock_db.statements]
+        self.assertEquals([
+            'SET FO', 'INSERT', 'INSERT', 'COMMIT', 'INSERT', 'INSERT', 'COMMIT', 'INSERT', 'COMMIT', 'DROP T',
+            'INSERT', 'COMMIT'
+        ], statements)
+
+    def test_apply_operations_rolls_back(self):
+
+        mock_db = db_structure(self._get_tables(), {})
+        mock_db.fail_on = "'3'"
+        database = database_reader(mysqldb(mock_db))
+
+        with self.assertRaises(ValueError):
+            database.apply_operations([row_insert('logs', {'id': i}) for i in range(1, 6)], transaction_size=10)
+
+        self.assertEquals(0, mock_db.commits)
+        self.assertEquals(1, mock_db.rollbacks)
+
+    def test_information_schema_loader(self):
+
+        mock_db = information_schema([('logs', 'InnoDB', 'utf8_general_ci', 'utf8', 'Yes')], [
+            ('logs', 'id', None, 'NO', 'int(10) unsigned', None, None, None, 'auto_increment'),
+            ('logs', 'message', None, 'NO', 'text', 'utf8', 'utf8_general_ci', 'Yes', ''),
+        ], [('logs', 'PRIMARY', 0, 'id')], [])
+        database = database_reader(mysqldb(mock_db), loader='information_schema')
+
+        # everything should come back in four queries, no matter how many tables there are
+        self.assertEquals(4, len(mock_db.queries))
+        self.assertEquals(['logs'], [name for name in database.tables])
+        self.assertEquals(['id', 'message'], [name for name in database.tables['logs'].columns])
+        self.assertEquals(['id'], database.tables['logs'].primary.columns)
+
+    def test_read_statistics(self):
+
+        statistics = [('logs', 1500, 1048576, 16384), ('more_logs', None, None, None)]
+        database = database_reader(mysqldb(db_structure(self._get_tables(), {}, statistics)))
+
+        self.assertEquals(None, database.statistics)
+        database.read_statistics()
+        self.assertEquals({
+            'logs': {
+                'rows': 1500,
+                'data_length': 1048576,
+                'index_length': 16384
+            },
+            'more_logs': {
+                'rows': 0,
+                'data_length': 0,
+                'index_length': 0
+            }
+        }, database.statistics)
+
+    def test_unknown_loader(self):
+
+        with self.assertRaises(ValueError):
+            database_reader(mysqldb(db_structure(self._get_tables(), {})), loader='nope')
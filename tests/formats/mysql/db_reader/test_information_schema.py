@@ -0,0 +1,120 @@
+import unittest
+
+from mygrations.formats.mysql.db_reader.information_schema import information_schema
+from mygrations.formats.mysql.file_reader.create_parser import create_parser
+class test_information_schema(unittest.TestCase):
+    def _get_structure(self):
+
+        tables = [
+            ('accounts', 'InnoDB', 'utf8_general_ci', 'utf8', 'Yes'),
+            ('tasks', 'InnoDB', 'utf8_unicode_ci', 'utf8', ''),
+        ]
+        columns = [
+            ('accounts', 'id', None, 'NO', 'int(10) unsigned', None, None, None, 'auto_increment'),
+            ('accounts', 'name', '', 'NO', 'varchar(255)', 'utf8', 'utf8_general_ci', 'Yes', ''),
+            ('accounts', 'balance', '0.00', 'NO', 'decimal(20,2)', None, None, None, ''),
+            ('tasks', 'id', None, 'NO', 'int(10) unsigned', None, None, None, 'auto_increment'),
+            ('tasks', 'account_id', None, 'NO', 'int(10) unsigned', None, None, None, ''),
+            ('tasks', 'status', 'open', 'NO', "enum('open','closed')", 'utf8', 'utf8_unicode_ci', '', ''),
+            ('tasks', 'title', None, 'YES', 'varchar(255)', 'latin1', 'latin1_swedish_ci', 'Yes', ''),
+            ('tasks', 'notes', None, 'YES', 'text', 'utf8', 'utf8_unicode_ci', '', ''),
+            ('a_view', 'id', None, 'NO', 'int(10) unsigned', None, None, None, ''),
+        ]
+        indexes = [
+            ('accounts', 'PRIMARY', 0, 'id'),
+            ('tasks', 'account_status', 1, 'account_id'),
+            ('tasks', 'account_status', 1, 'status'),
+            ('tasks', 'PRIMARY', 0, 'id'),
+            ('tasks', 'title', 0, 'title'),
+        ]
+        constraints = [('tasks', 'tasks_account_id_fk', 'account_id', 'accounts', 'id', 'NO ACTION', 'CASCADE')]
+
+        return information_schema(tables, columns, indexes, constraints)
+
+    def _parse(self, create_table):
+
+        parser = create_parser()
+        parser.parse(create_table)
+        return parser
+
+    def test_tables(self):
+
+        structure = self._get_structure()
+
+        self.assertEquals(['accounts', 'tasks'], [name for name in structure.tables])
+        self.assertEquals([], structure.errors)
+        self.assertEquals([], structure.warnings)
+
+    def test_matches_show_create_table(self):
+
+        structure = self._get_structure()
+
+        accounts = self._parse(
+            """CREATE TABLE `accounts` (
+                `id` int(10) unsigned NOT NULL AUTO_INCREMENT,
+                `name` varchar(255) NOT NULL DEFAULT '',
+                `balance` decimal(20,2) NOT NULL DEFAULT '0.00',
+                PRIMARY KEY (`id`)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8;"""
+        )
+        tasks = self._parse(
+            """CREATE TABLE `tasks` (
+                `id` int(10) unsigned NOT NULL AUTO_INCREMENT,
+                `account_id` int(10) unsigned NOT NULL,
+                `status` enum('open','closed') NOT NULL DEFAULT 'open' COLLATE utf8_unicode_ci,
+                `title` varchar(255) CHARACTER SET latin1 DEFAULT NULL,
+                `notes` text COLLATE utf8_unicode_ci,
+                PRIMARY KEY (`id`),
+                UNIQUE KEY `title` (`title`),
+                KEY `account_status` (`account_id`,`status`),
+                CONSTRAINT `tasks_account_id_fk` FOREIGN KEY (`account_id`) REFERENCES `accounts` (`id`) ON DELETE CASCADE ON UPDATE NO ACTION
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8 COLLATE=utf8_unicode_ci;"""
+        )
+
+        for parsed in [accounts, tasks]:
+            built = structure.tables[parsed.name]
+            self.assertEquals(False, bool(parsed.to(built)))
+            self.assertEquals(False, bool(built.to(parsed)))
+            self.assertEquals(str(parsed), str(built))
+
+            for (name, column) in parsed.columns.items():
+                for attr in ['length', 'null', 'column_type', 'default', 'unsigned', 'character_set', 'collate']:
+                    self.assertEquals(getattr(column, attr), getattr(built.columns[name], attr))
+
+    def test_keys(self):
+
+        tasks = self._get_structure().tables['tasks']
+
+        self.assertEquals(['', 'title', 'account_status'], [name for name in tasks.indexes])
+        self.assertEquals(['account_id', 'status'], tasks.indexes['account_status'].columns)
+        self.assertEquals('UNIQUE', tasks.indexes['title'].index_type)
+        self.assertEquals(['id'], tasks.primary.columns)
+
+        constraint = tasks.constraints['tasks_account_id_fk']
+        self.assertEquals('account_id', constraint.column)
+        self.assertEquals('accounts', constraint.foreign_table)
+        self.assertEquals('CASCADE', constraint.on_delete)
+        self.assertEquals('NO ACTION', constraint.on_update)
+
+    def test_mariadb_defaults(self):
+
+        structure = information_schema([('a', 'InnoDB', 'utf8_general_ci', 'utf8', 'Yes')], [
+            ('a', 'name', "'it''s'", 'NO', 'varchar(255)', 'utf8', 'utf8_general_ci', 'Yes', ''),
+            ('a', 'other', 'NULL', 'YES', 'varchar(255)', 'utf8', 'utf8_general_ci', 'Yes', ''),
+        ], [], [])
+
+        self.assertEquals("it's", structure.tables['a'].columns['name'].default)
+        self.assertEquals(None, structure.tables['a'].columns['other'].default)
+
+    def test_multi_column_foreign_key(self):
+
+        structure = information_schema([('a', 'InnoDB', 'utf8_general_ci', 'utf8', 'Yes')], [
+            ('a', 'b_id', None, 'NO', 'int(10)', None, None, None, ''),
+            ('a', 'c_id', None, 'NO', 'int(10)', None, None, None, ''),
+        ], [], [
+            ('a', 'a_fk', 'b_id', 'b', 'id', 'RESTRICT', 'RESTRICT'),
+            ('a', 'a_fk', 'c_id', 'b', 'other_id', 'RESTRICT', 'RESTRICT'),
+        ])
+
+        self.assertEquals('b_id', structure.tables['a'].constraints['a_fk'].column)
+        self.assertEquals(1, len(structure.warnings))
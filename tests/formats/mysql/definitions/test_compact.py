@@ -0,0 +1,40 @@
+import pickle
+import unittest
+
+from mygrations.formats.mysql.file_reader.create_parser import create_parser
+from mygrations.formats.mysql.definitions.compact import pack_table, unpack_table
+class test_compact(unittest.TestCase):
+    def _get_table(self):
+
+        table = create_parser()
+        table.parse(
+            """CREATE TABLE `tasks` (
+                `id` int(10) unsigned NOT NULL AUTO_INCREMENT,
+                `account_id` int(10) unsigned NOT NULL,
+                `status` enum('open','closed') NOT NULL DEFAULT 'open',
+                `price` decimal(20,2) NOT NULL DEFAULT 0,
+                `name` varchar(255) CHARACTER SET latin1 NOT NULL DEFAULT '',
+                `notes` text,
+                PRIMARY KEY (`id`),
+                UNIQUE KEY `name` (`name`),
+                KEY `account_status` (`account_id`,`status`),
+                CONSTRAINT `tasks_account_id_fk` FOREIGN KEY (`account_id`) REFERENCES `accounts` (`id`) ON DELETE CASCADE
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8;"""
+        )
+        return table
+
+    def test_round_trip(self):
+
+        table = self._get_table()
+        unpacked = unpack_table(pack_table(table))
+
+        self.assertEquals(str(table), str(unpacked))
+        self.assertEquals(table.fingerprint, unpacked.fingerprint)
+        self.assertEquals([], table.to(unpacked))
+        self.assertEquals(['id'], unpacked.primary.columns)
+
+    def test_packed_is_smaller(self):
+
+        table = self._get_table()
+
+        self.assertTrue(len(pickle.dumps(pack_table(table))) < len(pickle.dumps(table)))
@@ -0,0 +1,91 @@
+import unittest
+
+from mygrations.formats.mysql.file_reader.database import database as database_reader
+from mygrations.formats.mysql.file_reader.create_parser import create_parser
+from mygrations.formats.mysql.definitions.column import column
+from mygrations.formats.mysql.mygrations.operations.alter_table import alter_table
+from mygrations.formats.mysql.mygrations.operations.change_column import change_column
+from mygrations.formats.mysql.mygrations.operations.remove_key import remove_key
+class counting_database(database_reader):
+    """ Counts how many constraints get checked for 1215 errors """
+
+    checked = 0
+
+    def find_1215_errors(self, table, constraint):
+        self.checked += 1
+        return super().find_1215_errors(table, constraint)
+class test_database_1215_incremental(unittest.TestCase):
+    def _get_db(self):
+
+        strings = [
+            """CREATE TABLE `accounts` (
+                `id` int(10) unsigned NOT NULL AUTO_INCREMENT,
+                PRIMARY KEY (`id`)
+            );""", """CREATE TABLE `tasks` (
+                `id` int(10) unsigned NOT NULL AUTO_INCREMENT,
+                `account_id` int(10) unsigned NOT NULL,
+                PRIMARY KEY (`id`),
+                KEY `account_id` (`account_id`),
+                CONSTRAINT `tasks_account_id_fk` FOREIGN KEY (`account_id`) REFERENCES `accounts` (`id`)
+            );""", """CREATE TABLE `notes` (
+                `id` int(10) unsigned NOT NULL AUTO_INCREMENT,
+                `task_id` int(10) unsigned NOT NULL,
+                PRIMARY KEY (`id`),
+                KEY `task_id` (`task_id`),
+                CONSTRAINT `notes_task_id_fk` FOREIGN KEY (`task_id`) REFERENCES `tasks` (`id`)
+            );"""
+        ]
+        return counting_database(strings)
+
+    def _full_check(self, db):
+
+        errors = []
+        for table in db.tables.values():
+            for constraint in table.constraints.values():
+                error = db.find_1215_errors(table, constraint)
+                if error:
+                    errors.append(error)
+
+        return errors
+
+    def test_remove_and_add_table(self):
+
+        db = self._get_db()
+        self.assertEquals([], db.errors_1215)
+
+        accounts = db.tables['accounts']
+        db.checked = 0
+        db.remove_table(accounts)
+
+        # only the constraint referencing accounts gets checked again
+        self.assertEquals(1, db.checked)
+        self.assertEquals(1, len(db.errors_1215))
+        self.assertTrue('table `accounts` does not exist' in db.errors_1215[0])
+
+        db.add_table(accounts)
+        self.assertEquals([], db.errors_1215)
+
+    def test_apply_operation(self):
+
+        db = self._get_db()
+        self.assertEquals([], db.errors_1215)
+
+        # changing the referenced column only re-checks the constraint that points at it
+        db.checked = 0
+        operation = alter_table('accounts')
+        operation.add_operation(change_column(column('id', '10', False, 'INT', None, False, None, None, True)))
+        db.apply_operation('accounts', operation)
+
+        self.assertEquals(1, db.checked)
+        self.assertEquals(1, len(db.errors_1215))
+        self.assertTrue('unsigned mistmatch' in db.errors_1215[0])
+        self.assertEquals(self._full_check(db), db.errors_1215)
+
+        # dropping the index on tasks.account_id changes the error for tasks, but doesn't touch notes
+        db.checked = 0
+        db.apply_operation('tasks', remove_key(db.tables['tasks'].indexes['account_id']))
+
+        self.assertEquals(1, db.checked)
+        self.assertEquals(1, len(db.errors_1215))
+        self.assertTrue('missing index' in db.errors_1215[0])
+        self.assertEquals(self._full_check(db), db.errors_1215)
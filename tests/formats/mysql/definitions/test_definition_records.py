@@ -0,0 +1,80 @@
+import pickle
+import unittest
+
+from mygrations.formats.mysql.file_reader.create_parser import create_parser
+from mygrations.formats.mysql.file_reader.parsers.type_character import type_character
+from mygrations.formats.mysql.definitions.column import column
+from mygrations.formats.mysql.definitions.index import index
+from mygrations.formats.mysql.definitions.constraint import constraint
+from mygrations.formats.mysql.definitions.option import option
+class test_definition_records(unittest.TestCase):
+    def _parse(self, name):
+
+        table = create_parser()
+        table.parse(
+            """CREATE TABLE `%s` (
+                `id` int(10) unsigned NOT NULL AUTO_INCREMENT,
+                `account_id` int(10) unsigned NOT NULL,
+                `name` varchar(255) CHARACTER SET latin1 NOT NULL DEFAULT '',
+                PRIMARY KEY (`id`),
+                KEY `account_id` (`account_id`),
+                CONSTRAINT `%s_account_id_fk` FOREIGN KEY (`account_id`) REFERENCES `accounts` (`id`) ON DELETE CASCADE
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8;""" % (name, name)
+        )
+        return table
+
+    def test_parsed_tables_hold_records(self):
+
+        table = self._parse('tasks')
+
+        self.assertEquals([column] * 3, [type(definition) for definition in table.columns.values()])
+        self.assertEquals([index] * 2, [type(definition) for definition in table.indexes.values()])
+        self.assertEquals([constraint], [type(definition) for definition in table.constraints.values()])
+        self.assertEquals([option] * 2, [type(definition) for definition in table.options])
+        self.assertTrue(table.primary is table.indexes[''])
+
+        for definition in list(table.columns.values()) + list(table.indexes.values()) + table.options:
+            self.assertFalse(hasattr(definition, '__dict__'))
+
+    def test_strings_are_interned(self):
+
+        tasks = self._parse('tasks')
+        notes = self._parse('notes')
+
+        self.assertTrue(tasks.columns['name']._column_type is notes.columns['name']._column_type)
+        self.assertTrue(tasks.columns['name']._character_set is notes.columns['name']._character_set)
+        self.assertTrue(
+            tasks.constraints['tasks_account_id_fk'].on_delete is notes.constraints['notes_account_id_fk'].on_delete
+        )
+
+    def test_records_match_parsers(self):
+
+        parser = type_character()
+        parser.parse("`name` varchar(255) NOT NULL DEFAULT ''")
+        record = parser.as_record()
+
+        self.assertEquals(None, parser.unsigned)
+        self.assertEquals(str(parser), str(record))
+        self.assertEquals(parser.fingerprint, record.fingerprint)
+        self.assertTrue(record.as_record() is record)
+
+    def test_pickle(self):
+
+        table = self._parse('tasks')
+        restored = pickle.loads(pickle.dumps(table))
+
+        self.assertEquals(str(table), str(restored))
+        self.assertEquals(table.fingerprint, restored.fingerprint)
+
+    def test_sql_is_cached(self):
+
+        table = self._parse('tasks')
+        name = table.columns['name']
+
+        self.assertTrue(str(name) is str(name))
+        self.assertEquals("`name` VARCHAR(255) NOT NULL DEFAULT '' CHARACTER SET 'LATIN1'", str(name))
+
+        # changing a column replaces the record, so the new column gets its own SQL
+        table.change_column(column('name', '100', False, 'VARCHAR', ''))
+        self.assertEquals("`name` VARCHAR(100) NOT NULL DEFAULT ''", str(table.columns['name']))
+        self.assertEquals("`name` VARCHAR(255) NOT NULL DEFAULT '' CHARACTER SET 'LATIN1'", str(name))
@@ -0,0 +1,45 @@
+import unittest
+
+from collections import OrderedDict
+from mygrations.formats.mysql.definitions.row_store import row_store
+class test_row_store(unittest.TestCase):
+    def test_rows_are_tuples(self):
+
+        rows = row_store()
+        for row_id in range(1, 4):
+            rows.add(row_id, ('id', 'name'), (row_id, 'row %d' % row_id))
+
+        # one list of columns for every row, and nothing but the values per row
+        self.assertEquals([('id', 'name')], rows._layouts)
+        self.assertEquals({}, rows._row_layouts)
+        self.assertEquals((2, 'row 2'), rows._values[2])
+
+        self.assertEquals(3, len(rows))
+        self.assertEquals([1, 2, 3], list(rows))
+        self.assertEquals(OrderedDict([('id', 2), ('name', 'row 2')]), rows[2])
+
+    def test_mixed_columns(self):
+
+        rows = row_store({1: {'id': 1, 'name': 'bob'}})
+        rows[2] = OrderedDict([('id', 2), ('age', 5)])
+
+        self.assertEquals({1: {'id': 1, 'name': 'bob'}, 2: {'id': 2, 'age': 5}}, rows)
+        self.assertEquals(['id', 'age'], list(rows[2].keys()))
+
+        # replacing a row with the first layout forgets the other one
+        rows[2] = {'id': 2, 'name': 'sue'}
+        self.assertEquals({}, rows._row_layouts)
+
+        del rows[1]
+        self.assertFalse(1 in rows)
+        self.assertEquals({2: {'id': 2, 'name': 'sue'}}, rows)
+
+    def test_copy(self):
+
+        rows = row_store({1: {'id': 1}})
+        duplicate = rows.copy()
+        duplicate[2] = {'id': 2, 'name': 'bob'}
+
+        self.assertEquals([1], list(rows))
+        self.assertEquals([1, 2], list(duplicate))
+        self.assertEquals([('id', )], rows._layouts)
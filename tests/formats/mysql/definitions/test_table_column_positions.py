@@ -0,0 +1,74 @@
+import random
+import unittest
+
+from mygrations.formats.mysql.definitions.table import table
+from mygrations.formats.mysql.definitions.column import column
+class test_table_column_positions(unittest.TestCase):
+    def _get_table(self, names):
+
+        new_table = table('test')
+        for name in names:
+            new_table.add_column(column(name))
+        return new_table
+
+    def test_column_before(self):
+
+        new_table = self._get_table(['a', 'b', 'c'])
+
+        self.assertEquals(True, new_table.column_before('a'))
+        self.assertEquals('a', new_table.column_before('b'))
+        self.assertEquals('b', new_table.column_before('c'))
+        with self.assertRaises(ValueError):
+            new_table.column_before('d')
+
+    def test_add_after(self):
+
+        new_table = self._get_table(['a', 'b', 'c'])
+        new_table.add_column(column('x'), 'a')
+        new_table.add_column(column('y'), 'x')
+        new_table.add_column(column('z'), True)
+
+        self.assertEquals('y', new_table.column_before('b'))
+        self.assertEquals(['z', 'a', 'x', 'y', 'b', 'c'], list(new_table.columns))
+        self.assertEquals(True, new_table.column_before('z'))
+
+        with self.assertRaises(ValueError):
+            new_table.add_column(column('w'), 'missing')
+
+    def test_matches_list_model(self):
+
+        generator = random.Random(42)
+        names = ['c%d' % i for i in range(20)]
+        new_table = self._get_table(names)
+        model = list(names)
+
+        for i in range(500):
+            action = generator.choice(['after', 'first', 'end', 'remove', 'change'])
+            if action == 'remove' and len(model) > 1:
+                name = generator.choice(model)
+                new_table.remove_column(name)
+                model.remove(name)
+            elif action == 'change':
+                name = generator.choice(model)
+                new_table.change_column(column(name, '100'))
+            else:
+                name = 'n%d' % i
+                if action == 'after':
+                    position = generator.choice(model)
+                    new_table.add_column(column(name), position)
+                    model.insert(model.index(position) + 1, name)
+                elif action == 'first':
+                    new_table.add_column(column(name), True)
+                    model.insert(0, name)
+                else:
+                    new_table.add_column(column(name))
+                    model.append(name)
+
+            probe = generator.choice(model)
+            expected = True if model.index(probe) == 0 else model[model.index(probe) - 1]
+            self.assertEquals(expected, new_table.column_before(probe))
+
+            if i % 25 == 0:
+                self.assertEquals(model, list(new_table.columns))
+
+        self.assertEquals(model, list(new_table.columns))
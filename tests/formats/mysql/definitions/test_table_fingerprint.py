@@ -0,0 +1,67 @@
+import unittest
+
+from mygrations.formats.mysql.file_reader.create_parser import create_parser
+from mygrations.formats.mysql.file_reader.database import database as database_reader
+from mygrations.formats.mysql.definitions.column import column
+from mygrations.formats.mysql.mygrations.mygration import mygration
+class test_table_fingerprint(unittest.TestCase):
+    def _parse(self, create_table):
+
+        table = create_parser()
+        table.parse(create_table)
+        return table
+
+    def test_same_structure(self):
+
+        table1 = self._parse(
+            "CREATE TABLE `a` (`id` int(10) unsigned NOT NULL, `price` decimal(20,2) NOT NULL DEFAULT '0.00', PRIMARY KEY (`id`)) ENGINE=InnoDB;"
+        )
+        table2 = self._parse(
+            "CREATE TABLE `a` (`id` int(10) unsigned NOT NULL, `price` decimal(20,2) NOT NULL DEFAULT '0', PRIMARY KEY (`id`)) ENGINE=InnoDB;"
+        )
+
+        self.assertEquals(table1.fingerprint, table2.fingerprint)
+        self.assertEquals([], table1.to(table2))
+
+    def test_different_structure(self):
+
+        base = "CREATE TABLE `a` (`id` int(10) unsigned NOT NULL, `name` varchar(255) NOT NULL DEFAULT '', PRIMARY KEY (`id`)) ENGINE=InnoDB;"
+        fingerprint = self._parse(base).fingerprint
+
+        self.assertNotEqual(fingerprint, self._parse(base.replace('varchar(255)', 'varchar(100)')).fingerprint)
+        self.assertNotEqual(fingerprint, self._parse(base.replace('PRIMARY KEY (`id`)', 'KEY `id` (`id`)')).fingerprint)
+        self.assertNotEqual(fingerprint, self._parse(base.replace('InnoDB', 'MyISAM')).fingerprint)
+
+    def test_changes_reset_fingerprint(self):
+
+        table = self._parse("CREATE TABLE `a` (`id` int(10) unsigned NOT NULL, PRIMARY KEY (`id`));")
+        before = table.fingerprint
+        table.add_column(column('name', '255', True, 'VARCHAR'))
+        after = table.fingerprint
+
+        self.assertNotEqual(before, after)
+        table.remove_column('name')
+        self.assertEquals(before, table.fingerprint)
+
+    def test_mygration_skips_unchanged_tables(self):
+
+        tables = [
+            "CREATE TABLE `a` (`id` int(10) unsigned NOT NULL, PRIMARY KEY (`id`));",
+            "CREATE TABLE `b` (`id` int(10) unsigned NOT NULL, PRIMARY KEY (`id`));",
+        ]
+        db_from = database_reader(tables)
+        db_to = database_reader([tables[0], tables[1].replace('PRIMARY KEY', '`name` TEXT, PRIMARY KEY')])
+
+        compared = []
+        original_to = db_from.tables['a'].to
+
+        def counting_to(*args, **kwargs):
+            compared.append('a')
+            return original_to(*args, **kwargs)
+
+        db_from.tables['a'].to = counting_to
+        ops = mygration(db_to, db_from, False).operations
+
+        self.assertEquals([], compared)
+        self.assertEquals(1, len(ops))
+        self.assertTrue(str(ops[0]).startswith('ALTER TABLE `b` ADD `name` TEXT'))
@@ -0,0 +1,64 @@
+import unittest
+
+from mygrations.formats.mysql.file_reader.create_parser import create_parser
+from mygrations.formats.mysql.definitions.table_overlay import table_overlay
+from mygrations.formats.mysql.definitions.column import column
+from mygrations.formats.mysql.definitions.index import index
+class test_table_overlay(unittest.TestCase):
+    def _get_table(self):
+
+        table = create_parser()
+        table.parse(
+            """CREATE TABLE `tasks` (
+                `id` int(10) unsigned NOT NULL AUTO_INCREMENT,
+                `account_id` int(10) unsigned NOT NULL,
+                `name` varchar(255) NOT NULL DEFAULT '',
+                PRIMARY KEY (`id`),
+                KEY `account_id` (`account_id`),
+                CONSTRAINT `tasks_account_id_fk` FOREIGN KEY (`account_id`) REFERENCES `accounts` (`id`)
+            );"""
+        )
+        return table
+
+    def test_shares_until_changed(self):
+
+        source = self._get_table()
+        overlay = table_overlay(source)
+
+        self.assertTrue(overlay.columns is source.columns)
+        self.assertTrue(overlay.indexes is source.indexes)
+        self.assertTrue(overlay.constraints is source.constraints)
+        self.assertEquals(set(), overlay.owned)
+        self.assertEquals(str(source), str(overlay))
+
+    def test_changes_do_not_leak(self):
+
+        source = self._get_table()
+        original = str(source)
+        overlay = table_overlay(source)
+
+        overlay.remove_constraint('tasks_account_id_fk')
+        overlay.add_column(column('notes', '', True, 'TEXT'), 'name')
+        overlay.change_key(index('account_id', ['account_id', 'name'], 'INDEX'))
+
+        self.assertEquals(original, str(source))
+        self.assertEquals(['tasks_account_id_fk'], list(source.constraints))
+        self.assertEquals([], list(overlay.constraints))
+        self.assertEquals(['id', 'account_id', 'name', 'notes'], list(overlay.columns))
+        self.assertEquals(['id', 'account_id', 'name'], list(source.columns))
+        self.assertEquals(['account_id'], source.indexes['account_id'].columns)
+        self.assertEquals({'columns', 'indexes', 'constraints'}, overlay.owned)
+
+        # definitions that weren't replaced are still shared
+        self.assertTrue(overlay.columns['name'] is source.columns['name'])
+
+    def test_primary_key(self):
+
+        source = self._get_table()
+        overlay = table_overlay(source)
+        overlay.remove_key(source.primary)
+
+        self.assertEquals('', overlay.primary)
+        self.assertEquals(['id'], source.primary.columns)
+        self.assertTrue(source.column_is_indexed('id'))
+        self.assertFalse(overlay.column_is_indexed('id'))
@@ -0,0 +1,45 @@
+import unittest
+
+from mygrations.formats.mysql.file_reader.create_parser import create_parser
+class test_table_raw_rows(unittest.TestCase):
+    def _get_default_table(self):
+        table = create_parser()
+        table.parse(
+            """CREATE TABLE `tasks` (
+            `id` int(10) unsigned NOT NULL AUTO_INCREMENT,
+            `task` varchar(255) DEFAULT NULL,
+            `subject` varchar(255) NOT NULL DEFAULT 'none',
+            PRIMARY KEY (id)
+        );
+        """
+        )
+
+        return table
+
+    def test_add_raw_rows(self):
+
+        table = self._get_default_table()
+        rows = iter([(1, 'hey', 'sup'), (2, 'bye', 'later')])
+        errors = table.add_raw_rows(('id', 'task', 'subject'), rows)
+
+        self.assertEquals([], errors)
+        self.assertTrue(table.tracking_rows)
+        self.assertEquals([1, 2], [row_id for row_id in table.rows])
+        self.assertEquals({'id': 2, 'task': 'bye', 'subject': 'later'}, dict(table.rows[2]))
+        self.assertEquals(['id', 'task', 'subject'], [column for column in table.rows[1]])
+        self.assertEquals(3, table.auto_increment)
+
+    def test_missing_columns_get_defaults(self):
+
+        table = self._get_default_table()
+        table.add_raw_rows(('task', 'id'), [('hey', 5)])
+
+        self.assertEquals({'id': 5, 'task': 'hey', 'subject': 'none'}, dict(table.rows[5]))
+
+    def test_duplicates(self):
+
+        table = self._get_default_table()
+        errors = table.add_raw_rows(('id', 'task', 'subject'), [(1, 'hey', 'sup'), (1, 'bye', 'later')])
+
+        self.assertEquals(1, len(errors))
+        self.assertEquals('hey', table.rows[1]['task'])
@@ -0,0 +1,57 @@
+import unittest
+
+from mygrations.formats.mysql.file_reader.create_parser import create_parser
+class test_table_to_rows(unittest.TestCase):
+    def _get_table(self, rows):
+        table = create_parser()
+        table.parse(
+            """CREATE TABLE `tasks` (
+            `id` int(10) unsigned NOT NULL AUTO_INCREMENT,
+            `task` varchar(255) DEFAULT NULL,
+            `subject` varchar(255) NOT NULL DEFAULT '',
+            PRIMARY KEY (id)
+        );
+        """
+        )
+        table.add_raw_rows(('id', 'task', 'subject'), rows)
+
+        return table
+
+    def test_inserts_deletes_and_updates(self):
+
+        to_table = self._get_table([(5, 'a', 'b'), (1, 'c', 'd'), (3, 'e', 'f'), (7, 'g', 'h')])
+        from_table = self._get_table([(2, 'x', 'y'), (1, 'c', 'd'), (3, 'e', 'changed'), (8, 'i', 'j')])
+
+        operations = [str(operation) for operation in to_table.to_rows(from_table)]
+
+        self.assertEquals([
+            "INSERT INTO `tasks` (`id`, `task`, `subject`) VALUES ('5', 'a', 'b');",
+            "INSERT INTO `tasks` (`id`, `task`, `subject`) VALUES ('7', 'g', 'h');",
+            "DELETE FROM `tasks` WHERE id=2;",
+            "DELETE FROM `tasks` WHERE id=8;",
+            "UPDATE `tasks` SET `task`='e', `subject`='f' WHERE id=3;",
+        ], operations)
+
+    def test_loose_types_are_not_updates(self):
+
+        # rows from files are strings while rows from the database are not
+        to_table = self._get_table([(1, '10', 'hey'), (2, '20', None)])
+        from_table = self._get_table([(1, 10, 'hey'), (2, 20, None)])
+
+        self.assertEquals([], to_table.to_rows(from_table))
+
+    def test_extra_columns_are_ignored(self):
+
+        to_table = self._get_table([(1, 'a', 'b')])
+        from_table = self._get_table([(1, 'a', 'b')])
+        from_table.rows[1]['extra'] = 'something'
+
+        self.assertEquals([], to_table.to_rows(from_table))
+
+    def test_no_from_table(self):
+
+        to_table = self._get_table([(2, 'a', 'b'), (1, 'c', 'd')])
+
+        operations = to_table.to_rows()
+        self.assertEquals(2, len(operations))
+        self.assertEquals(1, operations[0].data['id'])
@@ -0,0 +1,56 @@
+import unittest
+
+from mygrations.formats.mysql.file_reader.parsers.definition_key import definition_key
+from mygrations.formats.mysql.file_reader.create_parser import create_parser
+class recording_parser(create_parser):
+    """ Records which parser matched each definition, before they are swapped out for records """
+
+    def process(self):
+
+        self.parsed_classes = [definition.__class__.__name__ for definition in self._values['definitions']]
+        super().process()
+class test_definition_key(unittest.TestCase):
+    def test_keywords(self):
+
+        self.assertEquals('primary', definition_key('PRIMARY KEY (`id`),'))
+        self.assertEquals('key', definition_key('KEY `name` (`name`)'))
+        self.assertEquals('index', definition_key('index name (name)'))
+        self.assertEquals('unique', definition_key('UNIQUE KEY `name` (`name`)'))
+        self.assertEquals('constraint', definition_key('CONSTRAINT `fk` FOREIGN KEY (`a`) REFERENCES `b` (`id`)'))
+
+    def test_columns(self):
+
+        self.assertEquals('length', definition_key('`id` INT(10) UNSIGNED NOT NULL,'))
+        self.assertEquals('length', definition_key('name varchar ( 255 ) NOT NULL'))
+        self.assertEquals('decimals', definition_key('`price` DECIMAL(20, 4) NOT NULL DEFAULT 0'))
+        self.assertEquals('values', definition_key("`status` ENUM('a','b') NOT NULL"))
+        self.assertEquals('plain', definition_key('`created` DATETIME NOT NULL,'))
+        self.assertEquals('plain', definition_key('`primary_id` INT'))
+
+    def test_unrecognized(self):
+
+        self.assertEquals(None, definition_key('(oops'))
+        self.assertEquals(None, definition_key('`id`'))
+
+    def test_same_parsers_win(self):
+
+        parser = recording_parser()
+        parser.parse(
+            """CREATE TABLE `test` (
+                `id` int(10) unsigned NOT NULL AUTO_INCREMENT,
+                `name` varchar(255) NOT NULL DEFAULT '',
+                `price` decimal(20,4) NOT NULL DEFAULT 0,
+                `status` enum('a','b') NOT NULL DEFAULT 'a',
+                `notes` text,
+                `created` datetime NOT NULL,
+                PRIMARY KEY (`id`),
+                KEY `name` (`name`),
+                UNIQUE KEY `status` (`status`)
+            ) ENGINE=InnoDB;"""
+        )
+
+        self.assertTrue(parser.matched)
+        self.assertEquals([
+            'type_numeric', 'type_character', 'type_decimal', 'type_enum', 'type_text', 'type_text', 'index_primary',
+            'index_key', 'index_unique'
+        ], parser.parsed_classes)
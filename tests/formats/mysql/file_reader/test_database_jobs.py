@@ -0,0 +1,71 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+from mygrations.formats.mysql.file_reader.database import database as database_reader
+class test_database_jobs(unittest.TestCase):
+    def _write_files(self, directory, files):
+
+        for (filename, contents) in files.items():
+            with open(os.path.join(directory, filename), 'w') as fp:
+                fp.write(contents)
+
+    def _get_files(self):
+
+        files = {}
+        for i in range(6):
+            files['table_%d.sql' % i] = """
+                CREATE TABLE `table_%d` (
+                    `id` int(10) unsigned NOT NULL AUTO_INCREMENT,
+                    `name` varchar(255) NOT NULL DEFAULT '',
+                    PRIMARY KEY (`id`)
+                ) ENGINE=InnoDB DEFAULT CHARSET=utf8;
+
+                INSERT INTO table_%d (id,name) VALUES (1,'one'),(2,'two');
+            """ % (i, i)
+        return files
+
+    def test_parallel_matches_serial(self):
+
+        with tempfile.TemporaryDirectory() as directory:
+            self._write_files(directory, self._get_files())
+
+            serial = database_reader(directory)
+            parallel = database_reader(directory, jobs=3)
+
+        self.assertEquals(sorted(serial.tables.keys()), sorted(parallel.tables.keys()))
+        self.assertEquals(6, len(parallel.tables))
+        for (table_name, table) in serial.tables.items():
+            self.assertEquals(str(table), str(parallel.tables[table_name]))
+            self.assertEquals(table.rows, parallel.tables[table_name].rows)
+        self.assertEquals(serial.errors, parallel.errors)
+        self.assertEquals(serial.warnings, parallel.warnings)
+
+    def test_duplicates_and_errors_in_filename_order(self):
+
+        files = {
+            'a.sql': 'CREATE TABLE `dupe` (`id` int(10) unsigned NOT NULL AUTO_INCREMENT, PRIMARY KEY (`id`));',
+            'b.sql': 'CREATE TABLE `dupe` (`name` varchar(255) NOT NULL DEFAULT \'\', PRIMARY KEY (`name`));',
+            'c.sql': 'CREATE TABLE `bad` (`id` int(10) unsigned NOT NULL AUTO_INCREMENT, PRIMARY KEY (`id`));',
+            'd.sql': 'DROP TABLE `bad`;',
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            self._write_files(directory, files)
+
+            database = database_reader(directory, jobs=2)
+
+        self.assertEquals(2, len(database.errors))
+        self.assertEquals('Found two definitions for table dupe', database.errors[0])
+        self.assertTrue(database.errors[1].startswith('Unrecognized MySQL command: DROP TABLE `bad`; in file'))
+
+        # the last file wins, just like when parsing serially
+        self.assertTrue('name' in database.tables['dupe'].columns)
+
+    def test_parsed_tables_pickle(self):
+
+        database = database_reader(self._get_files()['table_0.sql'])
+        table = pickle.loads(pickle.dumps(database.tables['table_0']))
+
+        self.assertEquals(str(database.tables['table_0']), str(table))
+        self.assertFalse(table._program is None)
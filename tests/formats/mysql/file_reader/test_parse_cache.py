@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+
+from mygrations.formats.mysql.file_reader.parse_cache import parse_cache
+from mygrations.formats.mysql.file_reader.database import database as database_reader, parse_sql
+class test_parse_cache(unittest.TestCase):
+    def setUp(self):
+
+        self.temp = tempfile.TemporaryDirectory()
+        self.sql_directory = os.path.join(self.temp.name, 'sql')
+        self.cache_directory = os.path.join(self.temp.name, 'cache')
+        os.makedirs(self.sql_directory)
+        self.filename = os.path.join(self.sql_directory, 'logs.sql')
+        self._write(
+            """CREATE TABLE `logs` (
+                `id` int(10) unsigned NOT NULL AUTO_INCREMENT,
+                `message` TEXT NOT NULL,
+                PRIMARY KEY (`id`)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8;
+            INSERT INTO logs (id,message) VALUES (1,'hey');"""
+        )
+
+    def tearDown(self):
+
+        self.temp.cleanup()
+
+    def _write(self, contents):
+
+        with open(self.filename, 'w') as fp:
+            fp.write(contents)
+
+    def test_miss_then_hit(self):
+
+        cache = parse_cache(self.cache_directory)
+
+        first = parse_sql(self.filename, cache)
+        second = parse_sql(self.filename, cache)
+
+        self.assertEquals(1, cache.misses)
+        self.assertEquals(1, cache.hits)
+        self.assertFalse(first is second)
+        self.assertEquals(str(first.tables['logs']), str(second.tables['logs']))
+        self.assertEquals(first.rows['logs'][0].raw_rows, second.rows['logs'][0].raw_rows)
+
+    def test_changed_contents_invalidate(self):
+
+        cache = parse_cache(self.cache_directory)
+        parse_sql(self.filename, cache)
+
+        self._write('CREATE TABLE `logs` (`id` int(10) unsigned NOT NULL AUTO_INCREMENT, PRIMARY KEY (`id`));')
+        reader = parse_sql(self.filename, cache)
+
+        self.assertEquals(2, cache.misses)
+        self.assertEquals(0, cache.hits)
+        self.assertEquals(1, len(reader.tables['logs'].columns))
+
+    def test_version_change_invalidates(self):
+
+        parse_sql(self.filename, parse_cache(self.cache_directory, version='1.0'))
+
+        cache = parse_cache(self.cache_directory, version='2.0')
+        parse_sql(self.filename, cache)
+
+        self.assertEquals(1, cache.misses)
+        self.assertEquals(0, cache.hits)
+
+    def test_corrupt_entry_is_a_miss(self):
+
+        cache = parse_cache(self.cache_directory)
+        parse_sql(self.filename, cache)
+        for cache_file in os.listdir(self.cache_directory):
+            with open(os.path.join(self.cache_directory, cache_file), 'wb') as fp:
+                fp.write(b'garbage')
+
+        reader = parse_sql(self.filename, cache)
+
+        self.assertEquals(2, cache.misses)
+        self.assertTrue('logs' in reader.tables)
+
+    def test_database_uses_cache(self):
+
+        first = database_reader(self.sql_directory, cache_directory=self.cache_directory)
+        second = database_reader(self.sql_directory, cache_directory=self.cache_directory)
+
+        self.assertEquals(1, second._cache.hits)
+        self.assertEquals(str(first.tables['logs']), str(second.tables['logs']))
+        self.assertEquals('hey', second.tables['logs'].rows[1]['message'])
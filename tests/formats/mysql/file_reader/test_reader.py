@@ -39,3 +39,21 @@ class test_reader(unittest.TestCase):
         self.assertTrue('logs' in parser.rows)
         self.assertTrue('test' in parser.rows)
         self.assertEquals(['id', 'message', 'traceback'], parser.rows['logs'][0].columns)
+
+    def test_missing_semicolon(self):
+
+        parser = reader()
+        returned = parser.parse(
+            """
+            CREATE TABLE `logs` (`id` int(10) unsigned NOT NULL AUTO_INCREMENT, PRIMARY KEY (`id`))
+            INSERT INTO logs (`id`) VALUES (1)
+            CREATE TABLE `tasks` (`id` int(10) unsigned NOT NULL AUTO_INCREMENT, PRIMARY KEY (`id`));
+        """
+        )
+
+        # the statements without semicolons don't swallow the ones after them
+        self.assertTrue(parser.matched)
+        self.assertEquals('', returned)
+        self.assertEquals(['logs', 'tasks'], sorted(parser.tables.keys()))
+        self.assertEquals(['logs'], list(parser.rows.keys()))
+        self.assertEquals(['Missing ending semicolon for table logs'], parser.errors)
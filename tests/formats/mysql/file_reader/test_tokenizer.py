@@ -0,0 +1,71 @@
+import unittest
+
+from mygrations.formats.mysql.file_reader.tokenizer import tokenizer
+from mygrations.formats.mysql.file_reader.reader import reader
+class test_tokenizer(unittest.TestCase):
+    def _tokens(self, data):
+
+        return [(token_type, data[start:end]) for (token_type, start, end) in tokenizer(data)]
+
+    def test_comments_and_statements(self):
+
+        tokens = self._tokens(
+            """
+            /* block */
+            -- dashes
+               # hash
+            CREATE TABLE a (id int(10));
+            INSERT INTO a (id) VALUES (1);
+        """
+        )
+
+        self.assertEquals([
+            ('comment', '/* block */'),
+            ('comment', '-- dashes'),
+            ('comment', '# hash'),
+            ('statement', 'CREATE TABLE a (id int(10));'),
+            ('statement', 'INSERT INTO a (id) VALUES (1);'),
+        ], tokens)
+
+    def test_semicolons_in_quotes(self):
+
+        tokens = self._tokens("INSERT INTO a (`b;c`) VALUES ('x;y', \"z;\", 'it\\'s;');INSERT INTO b (id) VALUES (2);")
+
+        self.assertEquals([
+            ('statement', "INSERT INTO a (`b;c`) VALUES ('x;y', \"z;\", 'it\\'s;');"),
+            ('statement', 'INSERT INTO b (id) VALUES (2);'),
+        ], tokens)
+
+    def test_missing_semicolon_runs_to_end(self):
+
+        tokens = self._tokens('INSERT INTO a (id) VALUES (1)   ')
+
+        self.assertEquals([('statement', 'INSERT INTO a (id) VALUES (1)   ')], tokens)
+
+    def test_unclosed_block_comment(self):
+
+        parser = reader()
+        returned = parser.parse('/* never closed\nINSERT INTO a (id) VALUES (1);')
+
+        self.assertFalse(parser.matched)
+        self.assertEquals('/* never closed\nINSERT INTO a (id) VALUES (1);', returned)
+        self.assertEquals(['Could not find closing comment indicator, */'], parser.errors)
+
+    def test_no_statement_limit(self):
+
+        parser = reader()
+        returned = parser.parse("-- a comment\n" * 10001 + "INSERT INTO a (id) VALUES (1);")
+
+        self.assertTrue(parser.matched)
+        self.assertEquals('', returned)
+        self.assertEquals(1, len(parser.rows['a']))
+
+    def test_unrecognized_leftovers(self):
+
+        parser = reader()
+        returned = parser.parse("INSERT INTO a (id) VALUES (1) garbage; INSERT INTO b (id) VALUES (2);")
+
+        self.assertFalse(parser.matched)
+        self.assertEquals('garbage; INSERT INTO b (id) VALUES (2);', returned)
+        self.assertEquals(1, len(parser.errors))
+        self.assertTrue('Unrecognized MySQL command: garbage;' in parser.errors[0])
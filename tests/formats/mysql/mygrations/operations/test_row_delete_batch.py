@@ -0,0 +1,8 @@
+import unittest
+from mygrations.formats.mysql.mygrations.operations.row_delete_batch import row_delete_batch
+class test_row_delete_batch(unittest.TestCase):
+    def test_simple(self):
+        op = row_delete_batch('a_table', [5, 6, 7])
+
+        self.assertEquals("DELETE FROM `a_table` WHERE id IN (5, 6, 7);", str(op))
+        self.assertEquals('a_table', op.table_name)
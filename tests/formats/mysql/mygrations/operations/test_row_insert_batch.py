@@ -0,0 +1,12 @@
+import unittest
+from mygrations.formats.mysql.mygrations.operations.row_insert_batch import row_insert_batch
+from collections import OrderedDict
+class test_row_insert_batch(unittest.TestCase):
+    def test_simple(self):
+        op = row_insert_batch(
+            'a_table', [OrderedDict([('id', 5), ('name', 'bob')]),
+                        OrderedDict([('id', 6), ('name', "it's")])]
+        )
+
+        self.assertEquals("INSERT INTO `a_table` (`id`, `name`) VALUES ('5', 'bob'), ('6', 'it\\'s');", str(op))
+        self.assertEquals('a_table', op.table_name)
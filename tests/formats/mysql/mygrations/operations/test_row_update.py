@@ -8,6 +8,11 @@ class test_row_update(unittest.TestCase):
         self.assertEquals("UPDATE `a_table` SET `name`='bob', `age`='2' WHERE id=5;", str(op))
         self.assertEquals('a_table', op.table_name)
 
+    def test_quotes(self):
+        op = row_update('a_table', OrderedDict([('id', 5), ('name', "bob's"), ('path', 'c:\\')]))
+
+        self.assertEquals("UPDATE `a_table` SET `name`='bob\\'s', `path`='c:\\\\' WHERE id=5;", str(op))
+
     def test_id_required(self):
         with self.assertRaises(KeyError):
             op = row_update('a_table', OrderedDict([('name', 'bob'), ('age', 2)]))
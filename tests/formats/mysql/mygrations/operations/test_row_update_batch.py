@@ -0,0 +1,31 @@
+import unittest
+from mygrations.formats.mysql.mygrations.operations.row_update_batch import row_update_batch
+from collections import OrderedDict
+class test_row_update_batch(unittest.TestCase):
+    def test_simple(self):
+        op = row_update_batch(
+            'a_table',
+            [OrderedDict([('id', 5), ('name', 'bob'), ('age', 2)]),
+             OrderedDict([('id', 6), ('name', 'jane'), ('age', None)])]
+        )
+
+        self.assertEquals(
+            "UPDATE `a_table` SET `name`=CASE id WHEN 5 THEN 'bob' WHEN 6 THEN 'jane' END, " +
+            "`age`=CASE id WHEN 5 THEN '2' WHEN 6 THEN NULL END WHERE id IN (5, 6);", str(op)
+        )
+        self.assertEquals('a_table', op.table_name)
+
+    def test_quotes(self):
+        op = row_update_batch(
+            'a_table', [OrderedDict([('id', 5), ('name', "bob's")]),
+                        OrderedDict([('id', 6), ('name', "'); DROP TABLE a_table; --")])]
+        )
+
+        self.assertEquals(
+            "UPDATE `a_table` SET `name`=CASE id WHEN 5 THEN 'bob\\'s' " +
+            "WHEN 6 THEN '\\'); DROP TABLE a_table; --' END WHERE id IN (5, 6);", str(op)
+        )
+
+    def test_id_required(self):
+        with self.assertRaises(KeyError):
+            op = row_update_batch('a_table', [OrderedDict([('name', 'bob'), ('age', 2)])])
@@ -0,0 +1,100 @@
+import unittest
+
+from mygrations.formats.mysql.file_reader.database import database as database_reader
+from mygrations.formats.mysql.mygrations.mygration import mygration
+from mygrations.formats.mysql.mygrations.online_ddl import online_ddl
+from mygrations.formats.mysql.mygrations.alter_coalescer import alter_coalescer
+class test_alter_coalescer(unittest.TestCase):
+
+    accounts = "CREATE TABLE `accounts` (`id` INT(10) UNSIGNED NOT NULL AUTO_INCREMENT, PRIMARY KEY (`id`));"
+    teams = "CREATE TABLE `teams` (`id` INT(10) UNSIGNED NOT NULL AUTO_INCREMENT, PRIMARY KEY (`id`));"
+    users = """CREATE TABLE `users` (`id` INT(10) UNSIGNED NOT NULL AUTO_INCREMENT,
+        `account_id` INT(10) UNSIGNED NOT NULL,
+        `age` INT(10) NOT NULL,
+        PRIMARY KEY (`id`),
+        KEY `account_id` (`account_id`),
+        CONSTRAINT `users_account` FOREIGN KEY (`account_id`) REFERENCES `accounts` (`id`) ON DELETE CASCADE
+        );"""
+
+    def _users_to(self, users_account):
+        """ Returns the users table with a bigger age, a new team_id foreign key, and the given users_account FK """
+        return """CREATE TABLE `users` (`id` INT(10) UNSIGNED NOT NULL AUTO_INCREMENT,
+            `account_id` INT(10) UNSIGNED NOT NULL,
+            `team_id` INT(10) UNSIGNED NOT NULL,
+            `age` BIGINT(20) NOT NULL,
+            PRIMARY KEY (`id`),
+            KEY `account_id` (`account_id`),
+            KEY `team_id` (`team_id`),
+            CONSTRAINT `users_team` FOREIGN KEY (`team_id`) REFERENCES `teams` (`id`)%s
+            );""" % users_account
+
+    def _coalesce(self, users_to, order_by_fks):
+
+        db_from = database_reader([self.accounts, self.users])
+        db_to = database_reader([self.accounts, self.teams, users_to])
+        operations = mygration(db_to, db_from, False, order_by_fks=order_by_fks).operations
+        coalescer = alter_coalescer(online_ddl('8.0.35', foreign_key_checks=order_by_fks))
+
+        return (coalescer, operations, coalescer.process(operations, db_from))
+
+    def test_merges_dropped_foreign_keys(self):
+
+        (coalescer, operations, coalesced) = self._coalesce(self._users_to(''), False)
+
+        self.assertEquals(3, len(operations))
+        self.assertEquals(2, len(coalesced))
+        self.assertTrue(str(coalesced[1]).startswith('ALTER TABLE `users` DROP FOREIGN KEY `users_account`, ADD'))
+        self.assertEquals(1, coalescer.merged)
+
+        # dropping a foreign key doesn't rebuild the table, so that didn't save a rebuild
+        self.assertEquals(0, coalescer.rebuilds_saved)
+
+    def test_merges_around_new_tables(self):
+
+        # with foreign key checks on, the new foreign key waits until the teams table exists,
+        # so the change to users is pushed down to join it
+        (coalescer, operations, coalesced) = self._coalesce(self._users_to(''), True)
+
+        self.assertEquals(
+            ['alter_table', 'alter_table', 'create_table', 'alter_table'],
+            [type(operation).__name__ for operation in operations]
+        )
+        self.assertEquals(['create_table', 'alter_table'], [type(operation).__name__ for operation in coalesced])
+        self.assertTrue(str(coalesced[1]).endswith('REFERENCES `teams` (`id`) ON DELETE RESTRICT ON UPDATE RESTRICT;'))
+        self.assertEquals(2, coalescer.merged)
+        self.assertEquals(1, coalescer.rebuilds_saved)
+
+    def test_keeps_changed_foreign_keys_apart(self):
+
+        users_account = ",\nCONSTRAINT `users_account` FOREIGN KEY (`account_id`) REFERENCES `accounts` (`id`)"
+        (coalescer, operations, coalesced) = self._coalesce(self._users_to(users_account), True)
+
+        # the foreign key is dropped and added back, which can't happen in one ALTER TABLE,
+        # but everything else still ends up together
+        self.assertEquals(4, len(operations))
+        self.assertEquals(3, len(coalesced))
+        self.assertEquals('ALTER TABLE `users` DROP FOREIGN KEY `users_account`;', str(coalesced[0]))
+        self.assertEquals('create_table', type(coalesced[1]).__name__)
+        self.assertTrue(str(coalesced[2]).startswith('ALTER TABLE `users` ADD `team_id`'))
+        self.assertTrue('ADD CONSTRAINT `users_account`' in str(coalesced[2]))
+        self.assertEquals(1, coalescer.merged)
+        self.assertEquals(1, coalescer.rebuilds_saved)
+
+        # and the original operations are untouched
+        self.assertEquals('ALTER TABLE `users` DROP FOREIGN KEY `users_account`;', str(operations[0]))
+
+    def test_dependencies_stay_in_order(self):
+
+        # a new table with a foreign key to users needs the change to users before it's created
+        users_to = self._users_to('').replace('KEY `team_id`', 'UNIQUE KEY `age` (`age`), KEY `team_id`')
+        logs = """CREATE TABLE `logs` (`id` INT(10) UNSIGNED NOT NULL AUTO_INCREMENT, `age` BIGINT(20) NOT NULL,
+            PRIMARY KEY (`id`), KEY `age` (`age`),
+            CONSTRAINT `logs_age` FOREIGN KEY (`age`) REFERENCES `users` (`age`));"""
+        db_from = database_reader([self.accounts, self.users])
+        db_to = database_reader([self.accounts, self.teams, users_to, logs])
+        operations = mygration(db_to, db_from, False, order_by_fks=True).operations
+        coalesced = alter_coalescer().process(operations, db_from)
+
+        names = [type(operation).__name__ for operation in coalesced]
+        self.assertEquals(['alter_table', 'create_table', 'create_table', 'alter_table'], names)
+        self.assertTrue('DROP FOREIGN KEY `users_account`, ADD `team_id`' in str(coalesced[0]))
@@ -0,0 +1,82 @@
+import unittest
+
+from mygrations.formats.mysql.file_reader.database import database as database_reader
+from mygrations.formats.mysql.mygrations.mygration import mygration
+from mygrations.formats.mysql.mygrations.online_ddl import online_ddl
+from mygrations.formats.mysql.mygrations.cost_estimator import cost_estimator
+from mygrations.formats.mysql.mygrations.operations.create_table import create_table
+from mygrations.formats.mysql.mygrations.operations.row_insert import row_insert
+from mygrations.formats.mysql.mygrations.operations.row_delete_batch import row_delete_batch
+class test_cost_estimator(unittest.TestCase):
+
+    users = """CREATE TABLE `users` (`id` INT(10) UNSIGNED NOT NULL AUTO_INCREMENT,
+        `name` VARCHAR(50) NOT NULL DEFAULT '',
+        `age` INT(10) UNSIGNED NOT NULL,
+        PRIMARY KEY (`id`)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;"""
+
+    # 10000 rows of 100 bytes each, with 2MB of indexes
+    statistics = {'users': {'rows': 10000, 'data_length': 1000000, 'index_length': 2000000}}
+
+    def _alter(self, users_to, mysql_version=None):
+
+        db_from = database_reader([self.users])
+        operations = mygration(database_reader([users_to]), db_from, False).operations
+        if mysql_version:
+            operations = online_ddl(mysql_version).process(operations, db_from)
+
+        return operations[0]
+
+    def _estimator(self):
+
+        return cost_estimator(self.statistics, copy_rate=1000000, inplace_rate=2000000, row_rate=100, statement_time=0)
+
+    def test_rebuilds(self):
+
+        users_to = self.users.replace("`age` INT(10)", "`age` BIGINT(20)")
+
+        # classified as a copy, or not classified at all, the whole table is copied
+        self.assertEquals((3000000, 3.0), self._estimator().estimate(self._alter(users_to, '8.0.35')))
+        self.assertEquals((3000000, 3.0), self._estimator().estimate(self._alter(users_to)))
+
+        # while rebuilding in place goes at the in-place rate
+        users_to = self.users.replace("`age` INT(10) UNSIGNED NOT NULL,", "`age` INT(10) UNSIGNED NOT NULL, `x` INT,")
+        self.assertEquals((3000000, 1.5), self._estimator().estimate(self._alter(users_to, '5.7')))
+
+    def test_instant_and_inplace(self):
+
+        users_to = self.users.replace("`age` INT(10) UNSIGNED NOT NULL,", "`age` INT(10) UNSIGNED NOT NULL, `x` INT,")
+        self.assertEquals((0, 0), self._estimator().estimate(self._alter(users_to, '8.0.35')))
+
+        # adding a key means reading through the table, but nothing gets rebuilt
+        users_to = self.users.replace("PRIMARY KEY (`id`)", "PRIMARY KEY (`id`), KEY `age` (`age`)")
+        self.assertEquals((1000000, 0.5), self._estimator().estimate(self._alter(users_to, '8.0.35')))
+
+    def test_rows(self):
+
+        estimator = self._estimator()
+        self.assertEquals((100, 0.01), estimator.estimate(row_insert('users', {'id': 1, 'name': 'bob', 'age': 20})))
+        self.assertEquals((5000, 0.5), estimator.estimate(row_delete_batch('users', list(range(50)))))
+
+        # tables without statistics count as empty
+        self.assertEquals((0, 0.5), estimator.estimate(row_delete_batch('accounts', list(range(50)))))
+
+    def test_summary(self):
+
+        estimator = self._estimator()
+        users_to = self.users.replace("`age` INT(10)", "`age` BIGINT(20)")
+        alter = self._alter(users_to, '8.0.35')
+
+        estimator.add(create_table(database_reader([self.users.replace('users', 'accounts')]).tables['accounts']))
+        estimator.add_all([row_insert('users', {'id': 1}), alter, row_delete_batch('users', [2, 3])])
+
+        self.assertEquals(3000300, estimator.total_bytes)
+        self.assertEquals(3.03, round(estimator.total_seconds, 5))
+        self.assertEquals([str(alter), 'Row changes to `users`'], [cost[0] for cost in estimator.summary[:2]])
+        self.assertEquals((300, 0.03), estimator.summary[1][1:])
+        self.assertEquals(3, len(estimator.summary))
+
+    def test_invalid_rates(self):
+
+        with self.assertRaises(ValueError):
+            cost_estimator({}, row_rate=0)
@@ -0,0 +1,141 @@
+import re
+import copy
+import time
+import unittest
+
+from mygrations.formats.mysql.file_reader.database import database as database_reader
+from mygrations.formats.mysql.mygrations.mygration import mygration
+class test_fk_ordered(unittest.TestCase):
+    def _table(self, name, references=None):
+
+        columns = ['`id` INT(10) UNSIGNED NOT NULL AUTO_INCREMENT']
+        keys = ['PRIMARY KEY (`id`)']
+        for (i, foreign_table) in enumerate(references or []):
+            columns.append('`%s_id` INT(10) UNSIGNED NOT NULL' % foreign_table)
+            keys.append('KEY `%s_%s_id` (`%s_id`)' % (name, foreign_table, foreign_table))
+            keys.append(
+                'CONSTRAINT `%s_%s_fk` FOREIGN KEY (`%s_id`) REFERENCES `%s` (`id`)' %
+                (name, foreign_table, foreign_table, foreign_table)
+            )
+
+        return 'CREATE TABLE `%s` (%s) ENGINE=InnoDB DEFAULT CHARSET=utf8;' % (name, ', '.join(columns + keys))
+
+    def _positions(self, ops, prefix):
+
+        return {
+            re.match(r'^\w+ TABLE `?(\w+)', str(op)).groups()[0]: i
+            for (i, op) in enumerate(ops) if str(op).startswith(prefix)
+        }
+
+    def test_creates_in_dependency_order(self):
+
+        db = database_reader([
+            self._table('tasks', ['accounts', 'users']),
+            self._table('users', ['accounts']),
+            self._table('accounts'),
+        ])
+        ops = mygration(db, order_by_fks=True).operations
+
+        self.assertEquals(['accounts', 'users', 'tasks'], [str(op).split('`')[1] for op in ops])
+        for op in ops:
+            self.assertFalse('FOREIGN_KEY_CHECKS' in str(op))
+
+    def test_cycle_is_deferred(self):
+
+        db = database_reader([
+            self._table('a', ['b']),
+            self._table('b', ['a']),
+            self._table('c', ['a']),
+        ])
+        ops = mygration(db, order_by_fks=True).operations
+        creates = self._positions(ops, 'CREATE TABLE')
+        alters = self._positions(ops, 'ALTER TABLE')
+
+        self.assertEquals(['a', 'b', 'c'], sorted(creates))
+        self.assertTrue(creates['a'] < creates['c'])
+        self.assertEquals(['a', 'b'], sorted(alters))
+        self.assertTrue(max(creates.values()) < min(alters.values()))
+        self.assertFalse('FOREIGN KEY' in str(ops[creates['a']]))
+        self.assertTrue('ADD CONSTRAINT `a_b_fk`' in str(ops[alters['a']]))
+        self.assertTrue('ADD CONSTRAINT `b_a_fk`' in str(ops[alters['b']]))
+
+        # every foreign key should be valid at every step
+        applied = database_reader([])
+        for op in ops:
+            if str(op).startswith('CREATE TABLE'):
+                applied.add_table(copy.deepcopy(op.table))
+            else:
+                applied.apply_operation(op.table_name, op)
+            self.assertEquals([], applied.errors_1215)
+        self.assertEquals(['a', 'b', 'c'], sorted(applied.tables))
+        self.assertEquals(['a_b_fk'], list(applied.tables['a'].constraints))
+
+    def test_drops_referencing_tables_first(self):
+
+        db_from = database_reader([
+            self._table('accounts'),
+            self._table('users', ['accounts']),
+            self._table('tasks', ['users']),
+            self._table('x', ['y']),
+            self._table('y', ['x']),
+        ])
+        db_to = database_reader([self._table('accounts')])
+        ops = mygration(db_to, db_from, order_by_fks=True).operations
+        drops = self._positions(ops, 'DROP TABLE')
+        alters = self._positions(ops, 'ALTER TABLE')
+
+        # the foreign keys of every removed table (cycles included) go before any table is dropped
+        self.assertTrue(drops['tasks'] < drops['users'])
+        self.assertEquals(['tasks', 'users', 'x', 'y'], sorted(alters))
+        self.assertTrue(max(alters.values()) < min(drops.values()))
+
+    def test_alter_referenced_column_while_dropping_referencing_table(self):
+
+        # users.id changes type while tasks (which references it) is dropped: with checks on,
+        # the foreign key from tasks has to be gone before users is altered
+        users = self._table('users')
+        db_from = database_reader([users, self._table('tasks', ['users'])])
+        db_to = database_reader([users.replace('`id` INT(10) UNSIGNED', '`id` BIGINT(20) UNSIGNED')])
+        ops = [str(op) for op in mygration(db_to, db_from, order_by_fks=True).operations]
+
+        self.assertEquals(3, len(ops))
+        self.assertEquals('ALTER TABLE `tasks` DROP FOREIGN KEY `tasks_users_fk`;', ops[0])
+        self.assertTrue(ops[1].startswith('ALTER TABLE `users` CHANGE `id` `id` BIGINT(20) UNSIGNED'))
+        self.assertEquals('DROP TABLE tasks;', ops[2])
+
+    def test_alter_referenced_column_with_unchanged_foreign_key(self):
+
+        # users.id and tasks.users_id both get bigger, but the foreign key between them stays the same:
+        # it still has to be dropped while the columns change, and then added back
+        (users, tasks) = (self._table('users'), self._table('tasks', ['users']))
+        db_from = database_reader([users, tasks])
+        db_to = database_reader([table.replace('INT(10)', 'BIGINT(20)') for table in [users, tasks]])
+        ops = [str(op) for op in mygration(db_to, db_from, order_by_fks=True).operations]
+
+        self.assertEquals(4, len(ops))
+        self.assertEquals('ALTER TABLE `tasks` DROP FOREIGN KEY `tasks_users_fk`;', ops[0])
+        self.assertEquals(
+            ['ALTER TABLE `tasks` CHANGE', 'ALTER TABLE `users` CHANGE'], sorted([op[:26] for op in ops[1:3]])
+        )
+        self.assertTrue(ops[3].startswith('ALTER TABLE `tasks` ADD CONSTRAINT `tasks_users_fk` FOREIGN KEY'))
+
+    def test_default_mode_disables_checks(self):
+
+        db = database_reader([self._table('accounts')])
+
+        self.assertTrue('FOREIGN_KEY_CHECKS' in str(mygration(db).operations[0]))
+
+    def test_long_chain(self):
+
+        count = 3000
+        tables = [self._table('t%d' % i, ['t%d' % (i + 1)] if i + 1 < count else []) for i in range(count)]
+        db = database_reader(tables)
+
+        start = time.time()
+        ops = mygration(db, order_by_fks=True).operations
+        elapsed = time.time() - start
+
+        self.assertEquals(count, len(ops))
+        self.assertEquals('t%d' % (count - 1), str(ops[0]).split('`')[1])
+        self.assertEquals('t0', str(ops[-1]).split('`')[1])
+        self.assertTrue(elapsed < 10)
@@ -0,0 +1,76 @@
+import threading
+import unittest
+
+from collections import OrderedDict
+from mygrations.formats.mysql.file_reader.database import database as database_reader
+from mygrations.formats.mysql.mygrations.fleet_mygration import fleet_mygration
+class test_fleet_mygration(unittest.TestCase):
+
+    accounts = 'CREATE TABLE `accounts` (`id` INT(10) UNSIGNED NOT NULL, PRIMARY KEY (`id`));'
+    accounts_with_name = "CREATE TABLE `accounts` (`id` INT(10) UNSIGNED NOT NULL, `name` VARCHAR(255) NOT NULL DEFAULT '', PRIMARY KEY (`id`));"
+    statuses = "CREATE TABLE `statuses` (`id` INT(10) UNSIGNED NOT NULL, `name` VARCHAR(255) NOT NULL DEFAULT '', PRIMARY KEY (`id`));"
+    new_status = "INSERT INTO `statuses` (`id`, `name`) VALUES (1, 'new');"
+
+    def _load(self, strings):
+
+        self.loads += 1
+        if strings is None:
+            raise ValueError('Connection refused')
+
+        return database_reader(strings)
+
+    def setUp(self):
+
+        self.loads = 0
+
+    def test_groups_by_schema(self):
+
+        db_to = database_reader([self.accounts_with_name, self.statuses, self.new_status])
+        targets = OrderedDict([
+            ('shard-1', [self.accounts, self.statuses, self.new_status]),
+            ('shard-2', [self.accounts_with_name, self.statuses, self.new_status]),
+            ('shard-3', [self.accounts, self.statuses, self.new_status]),
+            ('shard-4', [self.accounts, self.statuses, "INSERT INTO `statuses` (`id`, `name`) VALUES (1, 'old');"]),
+            ('shard-5', None),
+        ])
+        fleet = fleet_mygration(db_to, targets, self._load, workers=2)
+
+        self.assertEquals(5, self.loads)
+        groups = fleet.groups
+        self.assertEquals([['shard-1', 'shard-3'], ['shard-2'], ['shard-4']], [names for (names, ops) in groups])
+
+        # the same list is shared by every database in the group
+        self.assertIs(fleet.plan('shard-1'), fleet.plan('shard-3'))
+        self.assertEquals(
+            ["ALTER TABLE `accounts` ADD `name` VARCHAR(255) NOT NULL DEFAULT '' AFTER `id`;"],
+            [str(op) for op in fleet.plan('shard-1')]
+        )
+        self.assertEquals([], fleet.plan('shard-2'))
+        self.assertEquals(2, len(fleet.plan('shard-4')))
+
+        self.assertEquals({'shard-5': 'Connection refused'}, dict(fleet.errors))
+        with self.assertRaises(ValueError):
+            fleet.plan('shard-5')
+
+        # and so is the database the plan was built from
+        self.assertIs(fleet.database('shard-1'), fleet.database('shard-3'))
+        self.assertEquals(['accounts', 'statuses'], sorted(fleet.database('shard-2').tables.keys()))
+        self.assertTrue('name' in fleet.database('shard-2').tables['accounts'].columns)
+        with self.assertRaises(ValueError):
+            fleet.database('shard-5')
+
+    def test_loads_concurrently(self):
+
+        # every load waits for the others, so this only finishes if they all run at once
+        barrier = threading.Barrier(3, timeout=5)
+
+        def load(strings):
+            barrier.wait()
+            return database_reader(strings)
+
+        db_to = database_reader([self.accounts])
+        targets = OrderedDict([('shard-%d' % i, [self.accounts]) for i in range(3)])
+        fleet = fleet_mygration(db_to, targets, load, workers=3)
+
+        self.assertEquals([(['shard-0', 'shard-1', 'shard-2'], [])], fleet.groups)
+        self.assertEquals({}, dict(fleet.errors))
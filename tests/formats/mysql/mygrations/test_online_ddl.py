@@ -0,0 +1,105 @@
+import unittest
+
+from mygrations.formats.mysql.file_reader.database import database as database_reader
+from mygrations.formats.mysql.mygrations.mygration import mygration
+from mygrations.formats.mysql.mygrations.online_ddl import online_ddl
+class test_online_ddl(unittest.TestCase):
+
+    users = """CREATE TABLE `users` (`id` INT(10) UNSIGNED NOT NULL AUTO_INCREMENT,
+        `name` VARCHAR(50) NOT NULL DEFAULT '',
+        `status` ENUM('new','active') NOT NULL DEFAULT 'new',
+        `age` INT(10) UNSIGNED NOT NULL,
+        PRIMARY KEY (`id`),
+        KEY `name` (`name`)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;"""
+
+    def _plan(self, users_to, mysql_version, split=False):
+
+        db_from = database_reader([self.users])
+        db_to = database_reader([users_to])
+        ddl = online_ddl(mysql_version, split=split)
+        operations = ddl.process(mygration(db_to, db_from, False).operations, db_from)
+
+        return (ddl, operations)
+
+    def test_instant_changes(self):
+
+        users_to = self.users.replace("DEFAULT 'new'", "DEFAULT 'active'").replace(
+            "`age` INT(10) UNSIGNED NOT NULL,", "`age` INT(10) UNSIGNED NOT NULL, `email` VARCHAR(255) DEFAULT NULL,"
+        )
+        (ddl, operations) = self._plan(users_to, '8.0.20')
+
+        self.assertEquals(1, len(operations))
+        self.assertTrue(str(operations[0]).endswith(', ALGORITHM=INSTANT;'))
+        self.assertFalse(operations[0].rebuilds)
+        self.assertEquals([], ddl.rebuilt_tables)
+
+        # before 8.0.12 there is no INSTANT, and adding a column rebuilds the table
+        (ddl, operations) = self._plan(users_to, '5.7')
+        self.assertTrue(str(operations[0]).endswith(', ALGORITHM=INPLACE, LOCK=NONE;'))
+        self.assertEquals(['users'], ddl.rebuilt_tables)
+
+    def test_column_positions(self):
+
+        # adding a column in the middle of the table is only instant from 8.0.29
+        users_to = self.users.replace("`age` INT", "`email` VARCHAR(255) DEFAULT NULL, `age` INT")
+
+        (ddl, operations) = self._plan(users_to, '8.0.20')
+        self.assertEquals('INPLACE', operations[0].algorithm)
+        self.assertTrue(operations[0].rebuilds)
+
+        (ddl, operations) = self._plan(users_to, '8.0.29')
+        self.assertEquals('INSTANT', operations[0].algorithm)
+
+    def test_column_changes(self):
+
+        ddl = online_ddl('8.0.35')
+        db_from = database_reader([self.users])
+        changes = {
+            "VARCHAR(60) NOT NULL DEFAULT ''": ('INPLACE', 'NONE', False),
+            "VARCHAR(100) NOT NULL DEFAULT ''": ('COPY', 'SHARED', True),
+            "VARCHAR(40) NOT NULL DEFAULT ''": ('COPY', 'SHARED', True),
+            "VARCHAR(50) DEFAULT NULL": ('INPLACE', 'NONE', True),
+            "TEXT NOT NULL": ('COPY', 'SHARED', True),
+        }
+        for (definition, expected) in changes.items():
+            db_to = database_reader([self.users.replace("VARCHAR(50) NOT NULL DEFAULT ''", definition)])
+            operations = mygration(db_to, db_from, False).operations
+            self.assertEquals(expected, ddl.classify(list(operations[0])[0], db_from.tables['users']), definition)
+
+        # adding values to the end of an ENUM is instant, anywhere else means a copy
+        for (values, expected) in [("'new','active','banned'", 'INSTANT'), ("'banned','new','active'", 'COPY')]:
+            db_to = database_reader([self.users.replace("'new','active'", values)])
+            operations = mygration(db_to, db_from, False).operations
+            self.assertEquals(expected, ddl.classify(list(operations[0])[0], db_from.tables['users'])[0])
+
+    def test_keys(self):
+
+        users_to = self.users.replace("KEY `name` (`name`)", "KEY `age` (`age`)")
+        (ddl, operations) = self._plan(users_to, '8.0.35')
+
+        self.assertTrue(str(operations[0]).endswith(', ALGORITHM=INPLACE, LOCK=NONE;'))
+        self.assertEquals([], ddl.rebuilt_tables)
+
+    def test_split(self):
+
+        users_to = self.users.replace("`age` INT(10)", "`age` BIGINT(20)")
+        users_to = users_to.replace("PRIMARY KEY", "`email` VARCHAR(255) DEFAULT NULL, PRIMARY KEY")
+        (ddl, operations) = self._plan(users_to, '8.0.35', split=True)
+
+        self.assertEquals(
+            "ALTER TABLE `users` ADD `email` VARCHAR(255) AFTER `age`, ALGORITHM=INSTANT;", str(operations[0])
+        )
+        self.assertTrue(str(operations[1]).startswith('ALTER TABLE `users` CHANGE `age` `age` BIGINT(20)'))
+        self.assertTrue(str(operations[1]).endswith(', ALGORITHM=COPY, LOCK=SHARED;'))
+        self.assertEquals(['users'], ddl.rebuilt_tables)
+
+        # without splitting, the new column waits on the copy
+        (ddl, operations) = self._plan(users_to, '8.0.35')
+        self.assertEquals(1, len(operations))
+        self.assertEquals('COPY', operations[0].algorithm)
+
+    def test_invalid_version(self):
+
+        with self.assertRaises(ValueError):
+            online_ddl('eight')
@@ -0,0 +1,39 @@
+import unittest
+
+from mygrations.formats.mysql.file_reader.database import database as database_reader
+from mygrations.formats.mysql.mygrations.mygration import mygration
+class test_parallel_diff(unittest.TestCase):
+    def _get_databases(self):
+
+        tables_from = []
+        tables_to = []
+        for i in range(12):
+            create = (
+                "CREATE TABLE `table_%d` (`id` int(10) unsigned NOT NULL AUTO_INCREMENT, "
+                "`name` varchar(255) NOT NULL DEFAULT '', PRIMARY KEY (`id`)) ENGINE=InnoDB;"
+            ) % i
+            tables_from.append(create)
+
+            # every other table gets a new column
+            if i % 2:
+                create = create.replace(', PRIMARY KEY', ', `notes` TEXT, PRIMARY KEY')
+            tables_to.append(create)
+
+        return (database_reader(tables_to), database_reader(tables_from))
+
+    def test_parallel_matches_serial(self):
+
+        (db_to, db_from) = self._get_databases()
+        serial = [str(op) for op in mygration(db_to, db_from, False).operations]
+        parallel = [str(op) for op in mygration(db_to, db_from, False, jobs=3).operations]
+
+        self.assertEquals(6, len(serial))
+        self.assertEquals(serial, parallel)
+
+    def test_parallel_ordered_mode(self):
+
+        (db_to, db_from) = self._get_databases()
+        serial = [str(op) for op in mygration(db_to, db_from, order_by_fks=True).operations]
+        parallel = [str(op) for op in mygration(db_to, db_from, order_by_fks=True, jobs=2).operations]
+
+        self.assertEquals(serial, parallel)
@@ -0,0 +1,123 @@
+import io
+import json
+import unittest
+
+from collections import OrderedDict
+from mygrations.formats.mysql.file_reader.database import database as database_reader
+from mygrations.formats.mysql.mygrations.mygration import mygration
+from mygrations.formats.mysql.mygrations.row_mygration import row_mygration
+from mygrations.formats.mysql.mygrations.row_batcher import row_batcher
+from mygrations.formats.mysql.mygrations.plan_writer import plan_writer
+from mygrations.formats.mysql.mygrations.operations.row_insert import row_insert
+from mygrations.formats.mysql.mygrations.operations.disable_checks import disable_checks
+from mygrations.formats.mysql.mygrations.operations.enable_checks import enable_checks
+class test_plan_writer(unittest.TestCase):
+    def _records(self, fp):
+
+        return [json.loads(line) for line in fp.getvalue().splitlines()]
+
+    def test_writes_one_record_per_line(self):
+
+        db = database_reader([
+            'CREATE TABLE `accounts` (`id` INT(10) UNSIGNED NOT NULL, PRIMARY KEY (`id`));',
+            'CREATE TABLE `users` (`id` INT(10) UNSIGNED NOT NULL, `account_id` INT(10) UNSIGNED NOT NULL, PRIMARY KEY (`id`), KEY `account_id` (`account_id`), CONSTRAINT `users_account_fk` FOREIGN KEY (`account_id`) REFERENCES `accounts` (`id`));',
+            'CREATE TABLE `logs` (`id` INT(10) UNSIGNED NOT NULL, PRIMARY KEY (`id`));',
+            "INSERT INTO `logs` (`id`) VALUES (1), (2), (3);",
+        ])
+        fp = io.StringIO()
+        writer = plan_writer(fp)
+        writer.write_all(mygration(db, order_by_fks=True).operations)
+        writer.write_all(row_mygration(db, batcher=row_batcher(max_rows=2)).stream())
+        writer.close()
+
+        records = self._records(fp)
+        self.assertEquals(5, writer.count)
+        self.assertEquals(['accounts', 'users', 'logs', 'logs', 'logs'], [record['table'] for record in records])
+        self.assertEquals(
+            ['create_table', 'create_table', 'create_table', 'row_insert_batch', 'row_insert'],
+            [record['kind'] for record in records]
+        )
+        self.assertEquals([0, 0, 0, 2, 1], [record['rows'] for record in records])
+        self.assertEquals([[], [1], [], [3], [4]], [record['depends_on'] for record in records])
+        self.assertEquals("INSERT INTO `logs` (`id`) VALUES ('3');", records[4]['sql'])
+
+    def _ordered_records(self, tables_from, tables_to):
+
+        db_from = database_reader(tables_from)
+        fp = io.StringIO()
+        writer = plan_writer(fp, db_from=db_from)
+        writer.write_all(mygration(database_reader(tables_to), db_from, order_by_fks=True).operations)
+
+        return self._records(fp)
+
+    def test_drops_wait_for_referencing_tables(self):
+
+        accounts = 'CREATE TABLE `accounts` (`id` INT(10) UNSIGNED NOT NULL, PRIMARY KEY (`id`));'
+        users = 'CREATE TABLE `users` (`id` INT(10) UNSIGNED NOT NULL, `account_id` INT(10) UNSIGNED NOT NULL, PRIMARY KEY (`id`), KEY `account_id` (`account_id`), CONSTRAINT `users_account_fk` FOREIGN KEY (`account_id`) REFERENCES `accounts` (`id`));'
+        records = self._ordered_records([accounts, users], [])
+
+        self.assertEquals(['alter_table', 'remove_table', 'remove_table'], [record['kind'] for record in records])
+        self.assertEquals(['users', 'users', 'accounts'], [record['table'] for record in records])
+
+        # accounts can't be dropped while users still points at it
+        self.assertEquals([[], [1], [2]], [record['depends_on'] for record in records])
+
+    def test_alters_wait_for_dropped_foreign_keys(self):
+
+        accounts = 'CREATE TABLE `accounts` (`id` INT(10) UNSIGNED NOT NULL, PRIMARY KEY (`id`));'
+        users = 'CREATE TABLE `users` (`id` INT(10) UNSIGNED NOT NULL, `account_id` INT(10) UNSIGNED NOT NULL, PRIMARY KEY (`id`), KEY `account_id` (`account_id`), CONSTRAINT `users_account_fk` FOREIGN KEY (`account_id`) REFERENCES `accounts` (`id`));'
+        records = self._ordered_records(
+            [accounts, users],
+            [accounts.replace('INT(10)', 'BIGINT(20)'), users.split(', CONSTRAINT')[0] + ');']
+        )
+
+        self.assertEquals(['users', 'accounts'], [record['table'] for record in records])
+        self.assertTrue(records[0]['sql'].startswith('ALTER TABLE `users` DROP FOREIGN KEY'))
+
+        # the foreign key pointing at accounts.id has to be gone before accounts.id changes
+        self.assertEquals([[], [1]], [record['depends_on'] for record in records])
+
+    def test_rows_wait_for_referenced_tables(self):
+
+        accounts = 'CREATE TABLE `accounts` (`id` INT(10) UNSIGNED NOT NULL, PRIMARY KEY (`id`));'
+        users = 'CREATE TABLE `users` (`id` INT(10) UNSIGNED NOT NULL, `account_id` INT(10) UNSIGNED NOT NULL, PRIMARY KEY (`id`), KEY `account_id` (`account_id`), CONSTRAINT `users_account_fk` FOREIGN KEY (`account_id`) REFERENCES `accounts` (`id`));'
+        fp = io.StringIO()
+        writer = plan_writer(fp, db_from=database_reader([accounts, users]))
+        writer.write_all([
+            row_insert('accounts', OrderedDict([('id', 1)])),
+            row_insert('users', OrderedDict([('id', 1), ('account_id', 1)])),
+            row_insert('logs', OrderedDict([('id', 1)])),
+        ])
+
+        # the user can't be inserted before the account it points to
+        records = self._records(fp)
+        self.assertEquals([[], [1], []], [record['depends_on'] for record in records])
+
+    def test_checks_are_barriers(self):
+
+        fp = io.StringIO()
+        writer = plan_writer(fp)
+        writer.write_all([
+            disable_checks(),
+            row_insert('a', OrderedDict([('id', 1)])),
+            row_insert('b', OrderedDict([('id', 1)])),
+            row_insert('a', OrderedDict([('id', 2)])),
+            enable_checks(),
+        ])
+
+        records = self._records(fp)
+        self.assertEquals([None, 'a', 'b', 'a', None], [record['table'] for record in records])
+        self.assertEquals([[], [1], [1], [2], [3, 4]], [record['depends_on'] for record in records])
+
+    def test_json_array(self):
+
+        fp = io.StringIO()
+        writer = plan_writer(fp, array=True, row_counts={'a': 10})
+        writer.close()
+        self.assertEquals([], json.loads(fp.getvalue()))
+
+        fp = io.StringIO()
+        writer = plan_writer(fp, array=True)
+        writer.write_all([row_insert('a', OrderedDict([('id', 1)])), row_insert('a', OrderedDict([('id', 2)]))])
+        writer.close()
+        self.assertEquals([1, 2], [record['id'] for record in json.loads(fp.getvalue())])
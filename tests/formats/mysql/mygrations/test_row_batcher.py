@@ -0,0 +1,65 @@
+import unittest
+
+from collections import OrderedDict
+from mygrations.formats.mysql.mygrations.row_batcher import row_batcher
+from mygrations.formats.mysql.mygrations.operations.row_insert import row_insert
+from mygrations.formats.mysql.mygrations.operations.row_delete import row_delete
+from mygrations.formats.mysql.mygrations.operations.row_update import row_update
+from mygrations.formats.mysql.mygrations.operations.disable_checks import disable_checks
+class test_row_batcher(unittest.TestCase):
+    def _inserts(self, table_name, ids):
+
+        return [row_insert(table_name, OrderedDict([('id', row_id), ('name', 'bob')])) for row_id in ids]
+
+    def test_combines_consecutive_operations(self):
+
+        operations = self._inserts('a', [1, 2, 3]) + [row_delete('a', 4), row_delete('a', 5)] + [
+            row_update('a', OrderedDict([('id', 6), ('name', 'sue')])),
+            row_update('a', OrderedDict([('id', 7), ('name', 'jim')])),
+        ] + self._inserts('b', [1])
+
+        batched = [str(operation) for operation in row_batcher().batch(operations)]
+
+        self.assertEquals([
+            "INSERT INTO `a` (`id`, `name`) VALUES ('1', 'bob'), ('2', 'bob'), ('3', 'bob');",
+            "DELETE FROM `a` WHERE id IN (4, 5);",
+            "UPDATE `a` SET `name`=CASE id WHEN 6 THEN 'sue' WHEN 7 THEN 'jim' END WHERE id IN (6, 7);",
+            "INSERT INTO `b` (`id`, `name`) VALUES ('1', 'bob');",
+        ], batched)
+
+    def test_max_rows(self):
+
+        batched = row_batcher(max_rows=2).batch(self._inserts('a', [1, 2, 3, 4, 5]))
+
+        self.assertEquals(3, len(batched))
+        self.assertEquals([1, 2], [row['id'] for row in batched[0].rows])
+        self.assertEquals(5, batched[2].data['id'])
+
+    def test_max_packet_size(self):
+
+        operations = self._inserts('a', [1, 2, 3, 4])
+        size = len(str(operations[0]))
+        batched = row_batcher(max_packet_size=size * 2).batch(operations)
+
+        self.assertEquals(2, len(batched))
+        for operation in batched:
+            self.assertTrue(len(str(operation)) <= size * 2)
+
+    def test_different_columns_are_not_combined(self):
+
+        operations = self._inserts('a', [1]) + [row_insert('a', OrderedDict([('id', 2), ('age', 5)]))]
+
+        self.assertEquals(2, len(row_batcher().batch(operations)))
+
+    def test_other_operations_pass_through(self):
+
+        operations = self._inserts('a', [1, 2]) + [disable_checks()] + self._inserts('a', [3, 4])
+        batched = row_batcher().batch(operations)
+
+        self.assertEquals(3, len(batched))
+        self.assertTrue(isinstance(batched[1], disable_checks))
+
+    def test_invalid_limits(self):
+
+        with self.assertRaises(ValueError):
+            row_batcher(max_rows=0)
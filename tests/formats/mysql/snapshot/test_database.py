@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+
+from mygrations.formats.mysql.file_reader.database import database as database_parser
+from mygrations.formats.mysql.snapshot.database import database as database_snapshot
+from mygrations.formats.mysql.snapshot.database import save
+from mygrations.formats.mysql.mygrations.mygration import mygration
+from mygrations.formats.mysql.mygrations.row_mygration import row_mygration
+class test_database(unittest.TestCase):
+    def _get_db(self):
+
+        return database_parser([
+            """CREATE TABLE `accounts` (
+                `id` int(10) unsigned NOT NULL AUTO_INCREMENT,
+                `name` varchar(255) NOT NULL DEFAULT '',
+                `balance` decimal(20,2) NOT NULL DEFAULT 0,
+                PRIMARY KEY (`id`)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8;""",
+            """CREATE TABLE `statuses` (
+                `id` int(10) unsigned NOT NULL AUTO_INCREMENT,
+                `name` varchar(255) NOT NULL DEFAULT '',
+                `account_id` int(10) unsigned NOT NULL,
+                PRIMARY KEY (`id`),
+                KEY `account_id` (`account_id`),
+                CONSTRAINT `statuses_account_id_fk` FOREIGN KEY (`account_id`) REFERENCES `accounts` (`id`)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8;""",
+            "INSERT INTO statuses (id, name, account_id) VALUES (1, 'open', 1), (2, 'closed', 1);",
+        ])
+
+    def _round_trip(self, db):
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'test.snapshot')
+            save(db, filename)
+            return database_snapshot(filename)
+
+    def test_round_trip(self):
+
+        db = self._get_db()
+        loaded = self._round_trip(db)
+
+        self.assertEquals(['accounts', 'statuses'], sorted(loaded.tables))
+        for (table_name, table) in db.tables.items():
+            self.assertEquals(str(table), str(loaded.tables[table_name]))
+        self.assertEquals([], loaded.errors_1215)
+
+        # nothing to do when migrating between the two (other than turning FK checks off and on)
+        self.assertEquals(2, len(mygration(db, loaded).operations))
+        self.assertEquals([], row_mygration(db, loaded).operations)
+
+    def test_rows(self):
+
+        loaded = self._round_trip(self._get_db())
+        statuses = loaded.tables['statuses']
+
+        self.assertTrue(statuses.tracking_rows)
+        self.assertFalse(loaded.tables['accounts'].tracking_rows)
+        self.assertEquals([1, 2], list(statuses.rows))
+        self.assertEquals('closed', statuses.rows[2]['name'])
+        self.assertEquals(3, statuses.auto_increment)
+
+        loaded.read_rows('statuses')
+        with self.assertRaises(ValueError):
+            loaded.read_rows('accounts')
+
+    def test_not_a_snapshot(self):
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'test.snapshot')
+            with open(filename, 'wb') as fp:
+                fp.write(b'CREATE TABLE nope;')
+
+            with self.assertRaises(ValueError):
+                database_snapshot(filename)
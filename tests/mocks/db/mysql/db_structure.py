@@ -3,14 +3,24 @@ class db_structure:
     """ Mock class used when working with classes which read the database structure/rows
 
     This handles just a few simple queries: SHOW TABLES, SHOW CREATE TABLE,
-    and SELECT * FROM
+    SELECT * FROM, and the table statistics query.  Rows for SELECT * FROM can be given
+    as dicts, in which case they are returned as tuples with cursor.description set from
+    the dictionary keys.  Statistics are given as (table, rows, data length, index length).
+    Anything else is recorded in self.statements (along with commits and rollbacks),
+    and any query containing self.fail_on raises an error
     """
 
-    def __init__(self, tables, table_rows):
+    def __init__(self, tables, table_rows, statistics=None):
 
         self.tables = tables
         self.table_rows = table_rows
+        self.statistics = statistics if statistics is not None else []
         self.executed = False
+        self.description = None
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.fail_on = None
 
     def cursor(self, cursor_type=None):
         """ Mock for the db `cursor` method.  Returns the equivalent of the default cursor
@@ -32,12 +42,20 @@ class db_structure:
         # there are only three queries we are supporting, and that is unlikely
         # to change anytime soon, so I'm going to keep this all in the same class
         normalized = re.sub(r'\s+', ' ', query).lower()
+        if self.fail_on and self.fail_on in query:
+            raise ValueError('Mock failure for query %s' % query)
+
         if normalized == 'show tables':
             self._load_show_tables_result()
         elif normalized[:17] == 'show create table':
             self._load_show_create_result(normalized)
-        else:
+        elif 'from information_schema.tables' in normalized:
+            self.results = self.statistics
+        elif normalized[:6] == 'select':
             self._load_select_all_result(normalized)
+        else:
+            self.statements.append(query)
+            self.results = []
 
         self.executed = True
         self.iterator_index = -1
@@ -85,7 +103,14 @@ class db_structure:
                 (query, table_name)
             )
 
-        self.results = self.table_rows[table_name]
+        # rows can be given as dicts for convenience, but the cursor returns tuples
+        rows = self.table_rows[table_name]
+        if rows and isinstance(rows[0], dict):
+            self.description = tuple((column_name, ) for column_name in rows[0].keys())
+            self.results = [tuple(row.values()) for row in rows]
+        else:
+            self.description = ()
+            self.results = rows
 
     def __iter__(self):
         """ Initializes iteration through the result set
@@ -111,6 +136,21 @@ class db_structure:
 
         return self.results[self.iterator_index]
 
+    def fetchmany(self, size=1):
+        """ Returns the next batch of results from the result set
+
+        :param size: The maximum number of results to return
+        :type size: int
+        :returns: A list of tuples from the result set
+        :rtype: list
+        """
+        if not self.executed:
+            raise ValueError("Cannot fetch query results before executing")
+
+        start = self.iterator_index + 1
+        self.iterator_index = min(len(self.results), start + size) - 1
+        return self.results[start:start + size]
+
     def fetchall(self):
         """ Returns the result set """
 
@@ -124,6 +164,16 @@ class db_structure:
         """
         return len(self.results)
 
+    def commit(self):
+        """ Mock for the db `commit` method.  Records the commit and the statements it covered """
+        self.commits += 1
+        self.statements.append('COMMIT')
+
+    def rollback(self):
+        """ Mock for the db `rollback` method.  Records the rollback """
+        self.rollbacks += 1
+        self.statements.append('ROLLBACK')
+
     def close(self):
 
         self.executed = False
@@ -0,0 +1,55 @@
+import re
+class information_schema:
+    """ Mock class used when reading the database structure out of information_schema
+
+    This only handles the bulk queries run by mygrations.drivers.mysqldb.mysqldb.information_schema,
+    and figures out which result set to return from the information_schema table being selected from.
+    Every executed query is recorded in self.queries
+    """
+
+    def __init__(self, tables, columns, indexes, constraints):
+
+        self.result_sets = {
+            'tables': tables,
+            'columns': columns,
+            'statistics': indexes,
+            'key_column_usage': constraints
+        }
+        self.queries = []
+        self.executed = False
+
+    def cursor(self, cursor_type=None):
+        """ Mock for the db `cursor` method.  Returns the equivalent of the default cursor
+
+        cursor_type is ignored but included for consisitency with API standard
+
+        :returns: self
+        :rtype: self
+        """
+        return self
+
+    def execute(self, query):
+        """ Checks the query to see which information_schema table it selects from and loads up that result set
+
+        raises a ValueError if an unsupported query is found
+        :returns: None
+        """
+        normalized = re.sub(r'\s+', ' ', query).lower().strip()
+        m = re.search(r'from information_schema\.(\w+)', normalized)
+        if not m or m.groups()[0] not in self.result_sets:
+            raise ValueError("Cannot mock cursor.execute for query %s" % query)
+
+        self.queries.append(normalized)
+        self.results = self.result_sets[m.groups()[0]]
+        self.executed = True
+
+    def fetchall(self):
+        """ Returns the result set """
+        if not self.executed:
+            raise ValueError("Cannot fetch query results before executing")
+
+        return self.results
+
+    def close(self):
+
+        self.executed = False